@@ -0,0 +1,92 @@
+"""
+Benchmark the Hard AI: time per move with a cold and a warm transposition
+table, and with the precomputed solution table
+
+Usage:
+    python benchmarks/bench_hard_ai.py [games]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tictactoe.board import Board
+from tictactoe import solver, solution_table
+
+
+def play_game(rng):
+    """
+    Play one Hard-vs-Hard game and return the time spent on each move
+    """
+    board = Board()
+    signe = "X"
+    timings = []
+    while board.winner() is None:
+        start = time.perf_counter()
+        cell = solver.choose_move(board, signe, rng)
+        timings.append(time.perf_counter() - start)
+        board.move(cell, signe)
+        signe = "O" if signe == "X" else "X"
+    return timings
+
+
+def time_table_lookups(table, rng, games):
+    """
+    Play games using only the solution table and return the time per lookup
+    """
+    timings = []
+    for _ in range(games):
+        board = Board()
+        signe = "X"
+        while board.winner() is None:
+            start = time.perf_counter()
+            _, cells = table.lookup(board)
+            cell = rng.choice(cells)
+            timings.append(time.perf_counter() - start)
+            board.move(cell, signe)
+            signe = "O" if signe == "X" else "X"
+    return timings
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = random.Random(0)
+
+    # Cold: empty table, first move on the empty board solves the whole tree
+    solver.clear_table()
+    start = time.perf_counter()
+    solver.choose_move(Board(), "X", rng)
+    cold_first = time.perf_counter() - start
+    print(f"Cold table, opening move: {cold_first * 1000:.2f} ms "
+          f"({solver.table_size()} positions stored)")
+
+    # Cold: average over a full game starting from an empty table
+    solver.clear_table()
+    cold_moves = play_game(rng)
+    print(f"Cold table, per move over one game: "
+          f"{sum(cold_moves) / len(cold_moves) * 1e6:.1f} us")
+
+    # Warm: table already filled, every move is a lookup per legal cell
+    warm_moves = []
+    for _ in range(games):
+        warm_moves.extend(play_game(rng))
+    print(f"Warm table, per move over {games} games: "
+          f"{sum(warm_moves) / len(warm_moves) * 1e6:.1f} us "
+          f"({solver.table_size()} positions stored)")
+
+    # Precomputed table: one mmap'd array read per move
+    start = time.perf_counter()
+    table = solution_table.load()
+    if table is None:
+        print("No solution table found, run 'python -m tictactoe.solution_table'")
+        return
+    print(f"Solution table load: {(time.perf_counter() - start) * 1000:.2f} ms")
+    lookups = time_table_lookups(table, rng, games)
+    print(f"Solution table, per move over {games} games: "
+          f"{sum(lookups) / len(lookups) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,24 @@ import math
 import pygame
 import random
 import os
-import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from tictactoe.board import Board
+from tictactoe.ai import check_winner, get_ai_move, load_solutions, configure_mcts
+from tictactoe.renderer import DirtyRectRenderer
+from tictactoe.compositor import Compositor
+from tictactoe.text_cache import TextCache
+from tictactoe.ripple import ripple_points
+from tictactoe.particles import ParticleSystem, MAX_SIZE as PARTICLE_MAX_SIZE
+from tictactoe.sprites import ImageAtlas, ParticleAtlas
+from tictactoe.charts import ChartColors, PieChart, Slice
+from tictactoe.pacing import FrameScheduler
+from tictactoe.layout import Layout, desktop_scale, enable_dpi_awareness
+from tictactoe.history import GameLog, game_record
+from tictactoe.store import GameStore
+from tictactoe.replay import ReplayArchive, replay_board
+from tictactoe.aggregates import StatsEngine
+from tictactoe.writer import BackgroundWriter
 
 # Initialize pygame
 pygame.init()
@@ -12,12 +28,25 @@ pygame.init()
 pygame.mixer.init()
 
 # Constants and configurations
-WINDOW_SIZE = 600
-CELL_SIZE = WINDOW_SIZE // 3  # Each cell is 200x200
+WINDOW_SIZE = 600  # Size the screens are designed for, scaled to the real window (see tictactoe.layout)
+UI_SCALE = None  # Initial window size = WINDOW_SIZE * UI_SCALE (None: from the desktop resolution, 2.0 on 4K)
+BOARD_SIZE = 3  # Cells per row/column (3 for classic, 9, 15, 19 for bigger variants)
+WIN_LENGTH = 3  # Symbols in a row needed to win (5 for gomoku-style 19x19)
+CELL_SIZE = WINDOW_SIZE // BOARD_SIZE  # Each cell is 200x200 on the classic board
+SYMBOL_SIZE = CELL_SIZE * 3 // 5  # Beer/wine images fill 60% of a cell (120x120 on 3x3)
+WINNER_ICON_SIZE = 60  # Beer/wine icon next to the winner message
 LINE_COLOR = (0, 0, 0)  # Black
 BG_COLOR = (255, 255, 255)  # White
 LINE_WIDTH = 3
 FPS = 60
+REPLAY_STEP_DELAY = 700  # Milliseconds between two moves in the replay viewer
+REPLAY_BOARD_AREA = (80, 72, 440, 440)  # Replayed board (x, y, width, height): caption above, buttons below
+
+# AI search budget on boards bigger than 3x3 (Monte Carlo Tree Search)
+MCTS_TIME_LIMIT = 1.0  # Seconds of search per move
+MCTS_ITERATIONS = None  # Or a fixed number of iterations per move
+MCTS_WORKERS = 0  # Extra processes searching in parallel (0 = search in the game process only)
+AI_POLL_INTERVAL = 15  # Milliseconds between checks of an AI search that outlasts the AI delay
 
 # Colors - Pastel Dream Palette
 # Gradient background colors
@@ -44,25 +73,79 @@ GREEN = PRIMARY_GREEN
 GRAY = LIGHT_GRAY
 DARK_GREEN = ACCENT_GOLD
 
-# Initialize window
-screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
+# Initialize window (resizable, everything is laid out for its current size)
+enable_dpi_awareness()
+ui_scale = UI_SCALE if UI_SCALE is not None else desktop_scale()
+screen = pygame.display.set_mode((round(WINDOW_SIZE * ui_scale), round(WINDOW_SIZE * ui_scale)), pygame.RESIZABLE)
 pygame. display.set_caption("Tic Tac Toe - Belgium vs France")
+layout = Layout((WINDOW_SIZE, WINDOW_SIZE), screen.get_size())  # Design units -> window pixels
 clock = pygame.time.Clock()
+scheduler = FrameScheduler(FPS, clock=clock)  # Full rate while animating, sleeps when idle
+renderer = DirtyRectRenderer(screen)  # Skips idle frames and only pushes the regions that changed
+compositor = Compositor(screen.get_size())  # Static parts of each screen, drawn once and cached
+
+# Font for text (shared Font objects and rendered strings, see text_cache.render)
+FONT_LARGE = 74
+FONT_MEDIUM = 60
+FONT_SMALL = 50
+FONT_SUBTITLE = 40
+FONT_DATE = 35
+FONT_NOTE = 32
+FONT_LEGEND = 28
+text_cache = TextCache()
+
+def render_text(text, size, color):
+    """
+    Render text with a font size given in design units (scaled to the window)
+    """
+    return text_cache.render(text, layout.size(size), color)
+
+# Symbols scaled (or drawn) once at every size the UI uses, see draw_symbols
+symbol_atlas = ImageAtlas()
 
-# Font for text
-font_large = pygame.font.Font(None, 74)
-font_medium = pygame.font.Font(None, 60)
-font_small = pygame.font.Font(None, 50)
+def symbol_sizes():
+    """
+    Pixel sizes the symbols are drawn at: board cells and winner message icon
+    """
+    return (layout.size(SYMBOL_SIZE), layout.size(WINNER_ICON_SIZE))
+
+def build_fallback_symbol(name, size):
+    """
+    Draw the default X or O shape, for a symbol of size x size pixels, on a
+    transparent cell-sized sprite
+    """
+    cell = size * CELL_SIZE // SYMBOL_SIZE
+    width = max(1, round(LINE_WIDTH * size / SYMBOL_SIZE))
+    sprite = pygame.Surface((cell, cell), pygame.SRCALPHA)
+    center = (cell // 2, cell // 2)
+    offset = cell // 3
+    
+    if name == "O":
+        # Draw circle (O)
+        pygame.draw.circle(sprite, RED, center, offset, width)
+    else:
+        # Draw cross (X) - two diagonal lines
+        # Line from top-left to bottom-right
+        pygame.draw.line(sprite, BLUE,
+                         (center[0] - offset, center[1] - offset),
+                         (center[0] + offset, center[1] + offset),
+                         width)
+        # Line from top-right to bottom-left
+        pygame.draw.line(sprite, BLUE,
+                         (center[0] + offset, center[1] - offset),
+                         (center[0] - offset, center[1] + offset),
+                         width)
+    return sprite
 
 # Load images
 try:
     # Load beer image (for X / Human player)
-    beer_img = pygame.image.load(os.path.join("assets", "images", "beer.png"))
-    beer_img = pygame.transform.scale(beer_img, (120, 120))  # Resize to fit cell
+    beer_source = pygame.image.load(os.path.join("assets", "images", "beer.png"))
+    symbol_atlas.add_source("X", beer_source)
     
     # Load wine image (for O / AI player)
-    wine_img = pygame.image.load(os.path.join("assets", "images", "wine.png"))
-    wine_img = pygame.transform.scale(wine_img, (120, 120))  # Resize to fit cell
+    wine_source = pygame.image.load(os.path.join("assets", "images", "wine.png"))
+    symbol_atlas.add_source("O", wine_source)
     
     print("✅ Images loaded successfully!")
     use_images = True
@@ -72,6 +155,13 @@ except Exception as e:
     print("Falling back to default X and O symbols")
     use_images = False
     
+    # Default shapes, drawn once per size
+    symbol_atlas.add_builder("X", lambda size: build_fallback_symbol("X", size))
+    symbol_atlas.add_builder("O", lambda size: build_fallback_symbol("O", size))
+
+# Resize to fit cell, and to the icon of the winner message
+symbol_atlas.prepare(symbol_sizes())
+    
 # Load sounds
 try:
     # load background music
@@ -105,14 +195,41 @@ except Exception as e:
     wine_click_sound = DummySound()
     click_sound = DummySound()
 
+# Load the precomputed solution table (used by the Hard AI)
+try:
+    solutions = load_solutions()
+    if solutions:
+        print("✅ Solution table loaded successfully!")
+    else:
+        print("⚠️ No solution table found, Hard AI will search instead")
+        print("Run 'python -m tictactoe.solution_table' to build it")
+except Exception as e:
+    print(f"⚠️ Error loading solution table: {e}")
+    solutions = None
+
+# Monte Carlo Tree Search player (Hard AI on bigger boards), keeps its tree between turns
+mcts_player = configure_mcts(iterations=MCTS_ITERATIONS, time_limit=MCTS_TIME_LIMIT, workers=MCTS_WORKERS)
+
+# AI moves are searched on their own thread, so frames keep coming during a search
+ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+
+def forget_ai_tree():
+    """
+    Drop the MCTS tree of the previous game, on the AI thread: a search still
+    running there finishes first, so it cannot put the old tree back
+    """
+    ai_executor.submit(mcts_player.reset)
+
 class GameState:
     def __init__(self):
         # Board state
-        self.board = [""] * 9
+        self.board = Board(size=BOARD_SIZE, k=WIN_LENGTH)
         self.current_player = "X"
         self.game_over = False
         self.winner = None
         self.winner_recorded = False  # To ensure we record the winner only once
+        self.moves = []  # Cells in the order they were played (for the game log)
+        self.started_at = None  # Time of the first move
         
         # Game mode
         self.game_mode = None  # Will be "1P" or "2P"
@@ -122,8 +239,9 @@ class GameState:
         self.ai_player = "O"  # AI always plays as O
         self.ai_move_time = 0  # To manage AI move timing
         self.ai_delay = 1200  # milliseconds delay before AI plays
-        self.ai_difficulty = "hard" # Currently only "hard" is implemented but can be "easy", "medium", "hard"
+        self.ai_difficulty = "hard" # Can be "easy", "medium", "hard"
         self.ai_thinking = False  # Whether AI is currently "thinking"
+        self.ai_search = None  # Future of the AI move being searched on the AI thread
         
         # UI state
         self.settings_open = False
@@ -137,11 +255,13 @@ class GameState:
         self.sfx_enabled = True
         
         # Animation state
-        self.fireworks = []  # List of active Firework objects
+        self.fireworks = ParticleSystem(atlas=particle_atlas)  # Particles of all active fireworks
+        self.fireworks.set_view(layout.scale, layout.offset)  # Particles move in design units
         self.button_hover = None  # Currently hovered button
         self.button_scales = {}  # Scale factors for buttons (for hover effect)
         self.ticks = 0.0  # General purpose tick counter, time in seconds, updated each frame
         self.buttons_shimmers = {}  # For shimmer effect on buttons
+        self.button_rects = {}  # Base rect of each animated button on the current screen
         
         # button rects (updated each frame)
         self.restart_button_rect = None
@@ -157,117 +277,95 @@ class GameState:
         self.medium_button = None
         self.hard_button = None
         self.difficulty_back_button_rect = None
+        self.replay_button_rect = None
+        self.replay_older_rect = None
+        self.replay_newer_rect = None
+        self.replay_back_rect = None
+        
+        # Replay viewer
+        self.replay = None  # ReplayView of the game shown
+        
+        # Statistics screen page: "totals" (counters and pie chart) or "details" (StatsEngine views)
+        self.stats_page = "totals"
+        self.stats_panel_rect = None
         
     def reset_game(self):
         """
         Reset the game to initial state (keep same mode)
         """
-        self.board = [""] * 9
+        self.board = Board(size=BOARD_SIZE, k=WIN_LENGTH)
         self.current_player = "X"
         self.game_over = False
         self.winner = None
         self.winner_recorded = False
+        self.moves = []
+        self.started_at = None
+        self.ai_thinking = False
+        self.ai_search = None  # A search still running is for the old board: its move is dropped
+        forget_ai_tree()
         print("Game reset!")
     
     def return_to_menu(self):
         """
         Return to main menu and reset everything
         """
-        self.board = [""] * 9
+        self.board = Board(size=BOARD_SIZE, k=WIN_LENGTH)
         self.current_player = "X"
         self.game_over = False
         self.winner = None
         self.winner_recorded = False
+        self.moves = []
+        self.started_at = None
+        self.ai_thinking = False
+        self.ai_search = None
+        forget_ai_tree()
         self.game_mode = None
         self.game_state = "menu"
         print("Returned to menu")
-
-class Particle:
-    """
-    Particle class for fireworks and animations
-    """
-    def __init__(self, x, y, color, velocity_x, velocity_y):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        self.lifetime = random.randint(45, 90)  # Frames the particle will live
-        self.age = 0 # Current age in frames
-        self.size = random.randint(3, 8)  # Size of the particle
-        
-    def update(self):
-        """
-        Update particle position and age
-        """
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += 0.18 # Gravity effect
-        self.velocity_x *= 0.995 # Air resistance
-        self.age += 1
-        
-    def draw(self, screen):
-        """
-        Draw the particle on the screen
-        """
-        if self.age < self.lifetime:
-            # Fade out as particle ages
-            life_ratio = 1 - (self.age / self.lifetime)
-            size = max(1, int(self.size * life_ratio))
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
     
-    def is_alive(self):
+    def play_move(self, cell, signe):
         """
-        Check if the particle is still alive
+        Place a symbol on the board and remember the move for the game log
         """
-        return self.age < self.lifetime
-    
-class Firework:
+        if not self.moves:
+            self.started_at = datetime.now()
+        self.board.move(cell, signe)
+        self.moves.append(cell)
+
+class ReplayView:
     """
-    Firework system that creates particles explosion
+    Playback of an archived game in the replay viewer, one move every REPLAY_STEP_DELAY
     """
-    def __init__(self, x, y, color):
-        self.particles = []
-        self.create_explosion(x, y, color)
-        
-    def create_explosion(self, x, y, color):
-        """
-        Create explosion particles at (x, y) with given color
+    def __init__(self, record):
+        self.record = record  # Game record from the replay archive (with its "id")
+        self.restart()
+    
+    def restart(self):
         """
-        num_particles = random.randint(30, 60)
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)  # Random angle
-            speed = random.uniform(2, 8)  # Random speed
-            velocity_x = speed * math.cos(angle)
-            velocity_y = speed * math.sin(angle)
-            col = (
-                min(255, max(0, color[0] + random.randint(-20, 20))),
-                min(255, max(0, color[1] + random.randint(-20, 20))),
-                min(255, max(0, color[2] + random.randint(-20, 20))),
-            )
-            self.particles.append(Particle(x, y, col, velocity_x, velocity_y))
-            
-    def update(self):
+        Start the playback again from the empty board
         """
-        Update all particles
+        self.ply = 0
+        self.board = replay_board(self.record["moves"], 0)  # Read by draw_symbols, like GameState.board
+        self.next_step = pygame.time.get_ticks() + REPLAY_STEP_DELAY
+    
+    @property
+    def finished(self):
+        return self.ply >= len(self.record["moves"])
+    
+    def update(self, now):
         """
-        for particle in self.particles:
-            particle.update()
-        # Remove dead particles
-        self.particles = [p for p in self.particles if p.is_alive()]
+        Play the next move once its time has come
         
-    def draw(self, surface):
-        """
-        Draw all particles
-        """
-        for particle in self.particles:
-            particle.draw(surface)
-            
-    def is_finished(self):
+        Returns:
+        - bool: True if a move was played
         """
-        Check if all particles are dead
-        """
-        return len(self.particles) == 0 
+        if self.finished or now < self.next_step:
+            return False
+        self.board.move(self.record["moves"][self.ply], "X" if self.ply % 2 == 0 else "O")
+        self.ply += 1
+        self.next_step = now + REPLAY_STEP_DELAY
+        return True
+
 def play_sound(game, sound):
     """
     Play a sound if sounds are enabled
@@ -278,114 +376,169 @@ def play_sound(game, sound):
     if use_sounds and sound and game.sfx_enabled:
         sound.play()
 
-def draw_gradient_background():
+# Pre-rendered gradient backgrounds, keyed on (window size, top color, bottom color)
+gradient_cache = {}
+
+def build_gradient_surface(size, top_color, bottom_color):
     """
-    Draw a vertical gradient background from GRADIENT_TOP to GRADIENT_BOTTOM
+    Render a vertical gradient once into a new surface
+    
+    Parameters:
+    - size: tuple (width, height) of the surface
+    - top_color, bottom_color: RGB tuples at the top and bottom edges
+    
+    Returns:
+    - pygame.Surface with the gradient
     """
-    for y in range(WINDOW_SIZE):
+    width, height = size
+    surface = pygame.Surface(size)
+    for y in range(height):
         # Calculate the ratio (0.0 to 1.0)
-        ratio = y / WINDOW_SIZE
+        ratio = y / height
         
         # Interpolate between top and bottom colors
-        r = int(GRADIENT_TOP[0] * (1 - ratio) + GRADIENT_BOTTOM[0] * ratio)
-        g = int(GRADIENT_TOP[1] * (1 - ratio) + GRADIENT_BOTTOM[1] * ratio)
-        b = int(GRADIENT_TOP[2] * (1 - ratio) + GRADIENT_BOTTOM[2] * ratio)
+        r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
+        g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
+        b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
         
         # Draw a horizontal line for this y position
-        pygame.draw.line(screen, (r, g, b), (0, y), (WINDOW_SIZE, y))
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+    return surface.convert()
 
-def draw_grid():
+def background_key():
     """
-    Draw the 3x3 grid on the screen with gradient background
+    Inputs of the gradient background (window size and palette), part of the
+    key of every cached layer drawn on top of it
     """
-    draw_gradient_background()
+    return (screen.get_size(), GRADIENT_TOP, GRADIENT_BOTTOM)
+
+def draw_gradient_background(surface=None):
+    """
+    Draw a vertical gradient background from GRADIENT_TOP to GRADIENT_BOTTOM
+    
+    The gradient is rendered once per window size and palette, then blitted
+    in a single call. Resizing the window or changing the gradient colors
+    builds a new one automatically.
+    
+    Parameters:
+    - surface: pygame.Surface to draw on (default: the screen)
+    """
+    if surface is None:
+        surface = screen
+    key = background_key()
+    background = gradient_cache.get(key)
+    if background is None:
+        # Only the current size and palette are worth keeping
+        gradient_cache.clear()
+        background = build_gradient_surface(key[0], GRADIENT_TOP, GRADIENT_BOTTOM)
+        gradient_cache[key] = background
+    surface.blit(background, (0, 0))
+
+def build_grid_layer(surface, board_layout=None):
+    """
+    Draw the gradient background and the grid lines (static layer of the board)
+    
+    Parameters:
+    - surface: pygame.Surface to draw on
+    - board_layout: Layout placing the board (default: the whole window)
+    """
+    board_layout = board_layout or layout
+    draw_gradient_background(surface)
     
     # Draw vertical lines
-    for i in range(1, 3):
-        pygame.draw.line(screen, LINE_COLOR, 
-                        (i * CELL_SIZE, 0), 
-                        (i * CELL_SIZE, WINDOW_SIZE), 
-                        LINE_WIDTH)
+    for i in range(1, BOARD_SIZE):
+        pygame.draw.line(surface, LINE_COLOR, 
+                        board_layout.point(i * CELL_SIZE, 0), 
+                        board_layout.point(i * CELL_SIZE, WINDOW_SIZE), 
+                        board_layout.size(LINE_WIDTH))
     
     # Draw horizontal lines
-    for i in range(1, 3):
-        pygame.draw.line(screen, LINE_COLOR, 
-                        (0, i * CELL_SIZE), 
-                        (WINDOW_SIZE, i * CELL_SIZE), 
-                        LINE_WIDTH)
+    for i in range(1, BOARD_SIZE):
+        pygame.draw.line(surface, LINE_COLOR, 
+                        board_layout.point(0, i * CELL_SIZE), 
+                        board_layout.point(WINDOW_SIZE, i * CELL_SIZE), 
+                        board_layout.size(LINE_WIDTH))
+
+def draw_grid():
+    """
+    Draw the BOARD_SIZE x BOARD_SIZE grid on the screen with gradient background
+    """
+    compositor.draw(screen, "grid", background_key(), build_grid_layer, opaque=True)
 
 def get_cell_from_mouse(pos):
     """
-    Convert mouse position to cell index (0-8)
+    Convert mouse position to cell index (0 to BOARD_SIZE * BOARD_SIZE - 1)
     
     Parameters:
-    - pos: tuple (x, y) mouse position
+    - pos: tuple (x, y) mouse position, in window pixels
     
     Returns:
-    - int: cell index from 0 to 8
+    - int: cell index, numbered row by row (None outside the board)
     
-    Grid layout:
+    Grid layout (3x3):
     0 | 1 | 2
     ---------
     3 | 4 | 5
     ---------
     6 | 7 | 8
     """
-    x, y = pos
-    col = x // CELL_SIZE  # 0, 1, or 2
-    row = y // CELL_SIZE  # 0, 1, or 2
-    cell_index = row * 3 + col
+    x, y = layout.to_design(pos)
+    if not (0 <= x < WINDOW_SIZE and 0 <= y < WINDOW_SIZE):
+        return None  # In the margins around the board
+    # Clamp: the grid can be a few pixels smaller than the window when
+    # WINDOW_SIZE is not a multiple of BOARD_SIZE
+    col = min(int(x // CELL_SIZE), BOARD_SIZE - 1)
+    row = min(int(y // CELL_SIZE), BOARD_SIZE - 1)
+    cell_index = row * BOARD_SIZE + col
     return cell_index
 
-def draw_symbols(game):
+def get_cell_rect(cell_index):
+    """
+    Screen rectangle of a board cell
+    
+    Parameters:
+    - cell_index: int, cell numbered row by row
+    
+    Returns:
+    - pygame.Rect covering the cell
+    """
+    row, col = divmod(cell_index, BOARD_SIZE)
+    return layout.rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+def draw_symbols(game, board_layout=None):
     """
     Draw X and O symbols (or images) on the board based on current board state
     
     Parameters:
     - game: GameState object containing the board state
+    - board_layout: Layout placing the board (default: the whole window)
     """
-    for i in range(9):
-        if game.board[i] != "":
-            # Calculate position
-            row = i // 3
-            col = i % 3
-            center_x = col * CELL_SIZE + CELL_SIZE // 2
-            center_y = row * CELL_SIZE + CELL_SIZE // 2
-            
-            if use_images:
-                # Draw images
-                if game.board[i] == "X":
-                    # Beer image for X
-                    img_rect = beer_img.get_rect(center=(center_x, center_y))
-                    screen.blit(beer_img, img_rect)
-                
-                elif game.board[i] == "O":
-                    # Wine image for O
-                    img_rect = wine_img.get_rect(center=(center_x, center_y))
-                    screen.blit(wine_img, img_rect)
-            
-            else:
-                # Fallback to default shapes if images not loaded
-                if game.board[i] == "O":
-                    # Draw circle (O)
-                    pygame.draw.circle(screen, RED, 
-                    (center_x, center_y), 
-                    CELL_SIZE // 3, 
-                    LINE_WIDTH)
-                
-                elif game.board[i] == "X":
-                    # Draw cross (X) - two diagonal lines
-                    offset = CELL_SIZE // 3
-                    # Line from top-left to bottom-right
-                    pygame.draw.line(screen, BLUE,
-                    (center_x - offset, center_y - offset),
-                    (center_x + offset, center_y + offset),
-                    LINE_WIDTH)
-                    # Line from top-right to bottom-left
-                    pygame.draw.line(screen, BLUE,
-                    (center_x + offset, center_y - offset),
-                    (center_x - offset, center_y + offset),
-                    LINE_WIDTH)
+    board_layout = board_layout or layout
+    sprites = []
+    symbol_size = board_layout.size(SYMBOL_SIZE)
+    for i in game.board.occupied_cells():
+        # Calculate position
+        row, col = divmod(i, BOARD_SIZE)
+        center_x = col * CELL_SIZE + CELL_SIZE // 2
+        center_y = row * CELL_SIZE + CELL_SIZE // 2
+        
+        # Beer image for X, wine image for O (or the default shapes)
+        sprite = symbol_atlas.get(game.board[i], symbol_size)
+        sprites.append((sprite, sprite.get_rect(center=board_layout.point(center_x, center_y))))
+    
+    # All symbols in one call
+    screen.blits(sprites, doreturn=False)
+
+FIREWORK_COLORS = {
+    "X": (ACCENT_GOLD, PRIMARY_GREEN),  # Belgium wins - gold/yellow fireworks
+    "O": (ACCENT_RED, PRIMARY_BLUE),  # France wins - red fireworks
+    "Draw": (DARK_NAVY, LIGHT_GRAY),
+}
+
+# Particle discs of every fireworks color and size, rendered once at load time
+particle_atlas = ParticleAtlas(PARTICLE_MAX_SIZE, scale=layout.scale)
+for winner_colors in FIREWORK_COLORS.values():
+    particle_atlas.add_colors(winner_colors)
 
 def trigger_fireworks(game):
     """
@@ -394,42 +547,47 @@ def trigger_fireworks(game):
     Parameters:
     - game: GameState object containing the winner
     """
-    if game.winner == "X":
-        # Belgium wins - gold/yellow fireworks
-        colors = [ACCENT_GOLD, PRIMARY_GREEN]
-    elif game.winner == "O":
-        # France wins - red fireworks
-        colors = [ACCENT_RED, PRIMARY_BLUE]
-    else:
-        colors = [DARK_NAVY, LIGHT_GRAY]
+    colors = FIREWORK_COLORS.get(game.winner, FIREWORK_COLORS["Draw"])
     
     # Create multiple fireworks at random positions
     for _ in range(5):  # Number of fireworks
         x = random.randint(100, WINDOW_SIZE - 100)
         y = random.randint(100, WINDOW_SIZE - 300)
         color = random.choice(colors)
-        game.fireworks.append(Firework(x, y, color))
+        game.fireworks.explode(x, y, color)
         
 def update_and_draw_fireworks(game, screen):
     """
     Update and draw all active fireworks
     
     Parameters:
-    - game: GameState object containing the fireworks list
+    - game: GameState object containing the fireworks particles
     - screen: pygame display surface
     """
-    for firework in game.fireworks:
-        firework.update()
-        firework.draw(screen)
-    
-    # Remove finished fireworks
-    game.fireworks = [fw for fw in game.fireworks if not fw.is_finished()]
+    # Moves every particle at once and drops the dead ones
+    game.fireworks.update()
+    game.fireworks.draw(screen)
+
+# Transparent surface reused by the glow of hovered buttons, keyed on its size
+glow_surfaces = {}
+
+def get_glow_surface(size):
+    """
+    Return a transparent SRCALPHA surface of the given size, allocated only
+    once per size (users clear what they draw before returning)
+    """
+    surface = glow_surfaces.get(size)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        glow_surfaces[size] = surface
+    return surface
 
 def draw_animated_button(game, rect, color, text, text_color, mouse_pos, button_id):
     """
     Animated button with LIQUID WAVY BORDERS - like water ripples 💧
     """
     is_hovering = rect.collidepoint(mouse_pos) if mouse_pos else False
+    game.button_rects[button_id] = rect  # So the renderer knows where buttons animate
     
     # Initialize scale if not present
     if button_id not in game.button_scales:
@@ -451,313 +609,111 @@ def draw_animated_button(game, rect, color, text, text_color, mouse_pos, button_
     
     if is_hovering:
         # 🌊 LIQUID RIPPLE EFFECT - Draw button as deformed polygon
-        time = game.ticks
-        
-        # Number of points around the perimeter for wavy effect
-        num_points = 40  # More points = smoother waves
-        points = []
-        
         # Create unique ripple pattern for each button
         seed = sum(ord(c) for c in button_id)
         
-        for i in range(num_points):
-            # Angle around the rectangle
-            angle = (i / num_points) * 2 * math.pi
-            
-            # Base position on rectangle perimeter
-            if 0 <= angle < math.pi / 2:  # Top-right quadrant
-                t = angle / (math.pi / 2)
-                base_x = base_rect.left + base_rect.width * t
-                base_y = base_rect.top
-            elif math.pi / 2 <= angle < math.pi:  # Top-left quadrant  
-                t = (angle - math.pi / 2) / (math.pi / 2)
-                base_x = base_rect.right
-                base_y = base_rect.top + base_rect.height * t
-            elif math.pi <= angle < 3 * math.pi / 2:  # Bottom-left quadrant
-                t = (angle - math.pi) / (math.pi / 2)
-                base_x = base_rect.right - base_rect.width * t
-                base_y = base_rect.bottom
-            else:  # Bottom-right quadrant
-                t = (angle - 3 * math.pi / 2) / (math.pi / 2)
-                base_x = base_rect.left
-                base_y = base_rect.bottom - base_rect.height * t
-            
-            # 💧 MULTIPLE RIPPLE WAVES (chaotic like water drop)
-            # Wave 1: Fast chaotic ripple
-            wave1 = math.sin(time * 4.0 + i * 0.5 + seed) * 3
-            
-            # Wave 2: Slower deep wave
-            wave2 = math.sin(time * 2.0 + i * 0.3 - seed * 0.5) * 4
-            
-            # Wave 3: Medium circular wave
-            wave3 = math.cos(time * 3.0 + i * 0.4 + seed * 0.3) * 2.5
-            
-            # Combine waves for chaotic water effect
-            ripple = wave1 + wave2 + wave3
-            
-            # Apply ripple perpendicular to edge (outward/inward)
-            # Calculate normal vector (perpendicular to edge)
-            dx = base_x - base_rect.centerx
-            dy = base_y - base_rect.centery
-            dist = math.sqrt(dx**2 + dy**2) or 1
-            
-            # Normalize and apply ripple
-            ripple_x = base_x + (dx / dist) * ripple
-            ripple_y = base_y + (dy / dist) * ripple
-            
-            points.append((ripple_x, ripple_y))
+        # 💧 MULTIPLE RIPPLE WAVES (chaotic like water drop): each outline
+        # point moves radially, along the line from the button center
+        # through it - see tictactoe.ripple
+        ripple, normals = ripple_points(base_rect.center, base_rect.size, seed, game.ticks,
+                                        amplitude=layout.scale)
+        points = ripple.tolist()
         
         # Draw the wavy button background
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, color, points)
-            
-            # Draw wavy border
-            pygame.draw.polygon(screen, DARK_NAVY, points, 3)
+        pygame.draw.polygon(screen, color, points)
+        
+        # Draw wavy border
+        pygame.draw.polygon(screen, DARK_NAVY, points, layout.size(3))
+        
+        # Glow effect around wavy edges, layers drawn one by one on a reusable surface
+        pulse = (math.sin(game.ticks * 4.0) + 1) / 2
+        glow_intensity = 0.3 + pulse * 0.4
+        
+        glow_margin = layout.size(50)
+        glow_surface = get_glow_surface((base_rect.width + glow_margin, base_rect.height + glow_margin))
+        offset_x = base_rect.centerx - glow_surface.get_width() // 2
+        offset_y = base_rect.centery - glow_surface.get_height() // 2
+        adjusted = ripple - (offset_x, offset_y)
+        
+        for i in range(5):
+            alpha = int(80 * glow_intensity * (1 - i/5))
+            glow_color = (
+                min(255, color[0] + 100),
+                min(255, color[1] + 100),
+                min(255, color[2] + 100),
+                alpha
+            )
             
-            # Glow effect around wavy edges
-            pulse = (math.sin(game.ticks * 4.0) + 1) / 2
-            glow_intensity = 0.3 + pulse * 0.4
+            # Expand points outward for glow layers
+            glow_points = adjusted + normals * (i * 2 * layout.scale)
+            drawn = pygame.draw.polygon(glow_surface, glow_color, glow_points.tolist(), layout.size(2))
             
-            for i in range(5):
-                alpha = int(80 * glow_intensity * (1 - i/5))
-                glow_color = (
-                    min(255, color[0] + 100),
-                    min(255, color[1] + 100),
-                    min(255, color[2] + 100),
-                    alpha
-                )
-                
-                # Expand points outward for glow layers
-                glow_points = []
-                for px, py in points:
-                    dx = px - base_rect.centerx
-                    dy = py - base_rect.centery
-                    dist = math.sqrt(dx**2 + dy**2) or 1
-                    expand = i * 2
-                    glow_x = px + (dx / dist) * expand
-                    glow_y = py + (dy / dist) * expand
-                    glow_points.append((glow_x, glow_y))
-                
-                if len(glow_points) >= 3:
-                    glow_surface = pygame.Surface((base_rect.width + 50, base_rect.height + 50), pygame.SRCALPHA)
-                    offset_x = base_rect.centerx - (base_rect.width + 50) // 2
-                    offset_y = base_rect.centery - (base_rect.height + 50) // 2
-                    
-                    adjusted_points = [(x - offset_x, y - offset_y) for x, y in glow_points]
-                    pygame.draw.polygon(glow_surface, glow_color, adjusted_points, 2)
-                    screen.blit(glow_surface, (offset_x, offset_y))
+            # Blend only the area the layer touched, then clear it for the next one
+            screen.blit(glow_surface, (offset_x + drawn.x, offset_y + drawn.y), drawn)
+            glow_surface.fill((0, 0, 0, 0), drawn)
         
         scaled_rect = base_rect
         
     else:
         # Normal button when not hovering
-        pygame.draw.rect(screen, color, base_rect, border_radius=12)
-        pygame.draw.rect(screen, DARK_NAVY, base_rect, width=3, border_radius=12)
+        pygame.draw.rect(screen, color, base_rect, border_radius=layout.size(12))
+        pygame.draw.rect(screen, DARK_NAVY, base_rect, width=layout.size(3), border_radius=layout.size(12))
         scaled_rect = base_rect
     
     # Draw text
-    text_surface = font_small.render(text, True, text_color)
+    text_surface = render_text(text, FONT_SMALL, text_color)
     text_rect = text_surface.get_rect(center=scaled_rect.center)
     screen.blit(text_surface, text_rect)
     
     return scaled_rect
 
-def check_winner(board):
+def draw_overlay(color, alpha):
     """
-    Check if there is a winner on the board
-    
-    Parameters:
-    - board: list of 9 elements containing "", "X", or "O"
-    
-    Returns:
-    - "X" if X wins
-    - "O" if O wins
-    - "Draw" if board is full and no winner
-    - None if game is still ongoing
-    """
-    # All possible winning combinations
-    winning_combinations = [
-        [0, 1, 2],  # Top row
-        [3, 4, 5],  # Middle row
-        [6, 7, 8],  # Bottom row
-        [0, 3, 6],  # Left column
-        [1, 4, 7],  # Middle column
-        [2, 5, 8],  # Right column
-        [0, 4, 8],  # Diagonal top-left to bottom-right
-        [2, 4, 6]   # Diagonal top-right to bottom-left
-    ]
-    
-    # Check each winning combination
-    for combo in winning_combinations:
-        if (board[combo[0]] == board[combo[1]] == board[combo[2]] 
-            and board[combo[0]] != ""):
-            return board[combo[0]]  # Return "X" or "O"
-    
-    # Check for draw (board full)
-    if "" not in board:
-        return "Draw"
-    
-    # Game still ongoing
-    return None
-
-def ordinateur(board, signe):
-    """
-    AI function that determines where the computer should play
-    
-    Parameters:
-    - board: list of 9 elements containing "", "X", or "O"
-    "" = nobody played here
-    "X" = cross at this position
-    "O" = circle at this position
-    - signe: str, the symbol played by AI ("X" or "O")
-    
-    Returns:
-    - int: position where AI wants to play (0-8)
-    - False: in case of error
-    
-    Strategy:
-    1. Try to win if possible
-    2. Block opponent from winning
-    3. Take center if available
-    4. Take a corner if available
-    5. Take any remaining spot
-    """
-    # Input validation
-    if not isinstance(board, list) or len(board) != 9:
-        print("Error: board must be a list of 9 elements")
-        return False
-    
-    if signe not in ["X", "O"]:
-        print("Error: signe must be 'X' or 'O'")
-        return False
-    
-    # Determine opponent's sign
-    opponent = "O" if signe == "X" else "X"
-    
-    # All possible winning combinations
-    winning_combinations = [
-        [0, 1, 2],  # Top row
-        [3, 4, 5],  # Middle row
-        [6, 7, 8],  # Bottom row
-        [0, 3, 6],  # Left column
-        [1, 4, 7],  # Middle column
-        [2, 5, 8],  # Right column
-        [0, 4, 8],  # Diagonal top-left to bottom-right
-        [2, 4, 6]   # Diagonal top-right to bottom-left
-    ]
-    
-    # Strategy 1: Try to WIN
-    for combo in winning_combinations:
-        positions = [board[combo[0]], board[combo[1]], board[combo[2]]]
-        # If AI has 2 in a row and third is empty, TAKE IT! 
-        if positions.count(signe) == 2 and positions.count("") == 1:
-            for i in combo:
-                if board[i] == "":
-                    print(f"AI: Winning move at position {i}")
-                    return i
-    
-    # Strategy 2: BLOCK opponent from winning
-    for combo in winning_combinations:
-        positions = [board[combo[0]], board[combo[1]], board[combo[2]]]
-        # If opponent has 2 in a row and third is empty, BLOCK IT!
-        if positions.count(opponent) == 2 and positions.count("") == 1:
-            for i in combo:
-                if board[i] == "":
-                    print(f"AI: Blocking opponent at position {i}")
-                    return i
-    
-    # Strategy 3: Take CENTER (position 4) if available
-    if board[4] == "":
-        print("AI: Taking center (position 4)")
-        return 4
-    
-    # Strategy 4: Take a CORNER if available
-    corners = [0, 2, 6, 8]
-    available_corners = [pos for pos in corners if board[pos] == ""]
-    if available_corners:
-        chosen = random.choice(available_corners)
-        print(f"AI: Taking corner at position {chosen}")
-        return chosen
-    
-    # Strategy 5: Take any REMAINING spot
-    available_positions = [i for i in range(9) if board[i] == ""]
-    if available_positions:
-        chosen = random.choice(available_positions)
-        print(f"AI: Taking remaining position {chosen}")
-        return chosen
-    
-    # No available positions (should not happen in normal game)
-    print("Error: No available positions on board")
-    return False
-
-def ordinateur_easy(board):
-    """
-    Simple AI function that chooses a random available position
+    Cover the whole screen with a semi-transparent color (cached layer)
     
     Parameters:
-    - board: list of 9 elements containing "", "X", or "O"
-    
-    Returns:
-    - int: position where AI wants to play (0-8)
-    - False: in case of error
+    - color: RGB tuple of the overlay
+    - alpha: transparency, 0 (invisible) to 255 (opaque)
     """
-    # Input validation
-    if not isinstance(board, list) or len(board) != 9:
-        print("Error: board must be a list of 9 elements")
-        return False
-    
-    # Get list of available positions
-    available_positions = [i for i in range(9) if board[i] == ""]
+    def build(surface):
+        surface.fill(color)
+        surface.set_alpha(alpha)
     
-    if available_positions:
-        chosen = random.choice(available_positions)
-        print(f"AI (easy): Choosing random position {chosen}")
-        return chosen
-    
-    # No available positions (should not happen in normal game)
-    print("Error: No available positions on board")
-    return False
+    compositor.draw(screen, f"overlay.{color}.{alpha}", screen.get_size(), build, opaque=True)
 
-def ordinateur_medium(board, signe):
+def build_winner_layer(surface, winner):
     """
-    Medium difficulty AI that mixes random and strategic moves
-    
-    Parameters:
-    - board: list of 9 elements containing "", "X", or "O"
-    - signe: str, the symbol played by AI ("X" or "O")
-    
-    Returns:
-    - int: position where AI wants to play (0-8)
-    - False: in case of error
+    Draw the winner text (and icon) on a transparent layer
     """
-    # 50% chance to play strategically, 50% random
-    if random.random() < 0.5:
-        return ordinateur(board, signe)
+    text_center = layout.point(WINDOW_SIZE // 2, WINDOW_SIZE // 2 - 80)
+    if winner == "Draw":
+        text = render_text("You have the same brain", FONT_SMALL, BLACK)
+        text_rect = text.get_rect(center=text_center)
+        surface.blit(text, text_rect)
     else:
-        return ordinateur_easy(board)
-    
-def get_ai_move(board, signe, difficulty):
-    """
-    Get AI move based on selected difficulty
-    
-    Parameters:
-    - board: list of 9 elements containing "", "X", or "O"
-    - signe: str, the symbol played by AI ("X" or "O")
-    - difficulty: str, "easy", "medium", or "hard"
-    
-    Returns:
-    - int: position where AI wants to play (0-8)
-    - False: in case of error
-    """
-    if difficulty == "easy":
-        return ordinateur_easy(board)
-    elif difficulty == "medium":
-        return ordinateur_medium(board, signe)
-    elif difficulty == "hard":
-        return ordinateur(board, signe)
-    else:
-        print("Error: Unknown AI difficulty level")
-        return False
+        # Display different message with icons
+        if winner == "X":
+            # Belgium wins - show text + beer image
+            text = render_text("Belgium Wins!", FONT_LARGE, ACCENT_GOLD)
+            text_rect = text.get_rect(center=text_center)
+            surface.blit(text, text_rect)
+            
+            # Show beer image next to text
+            if use_images:
+                beer_display = symbol_atlas.get("X", layout.size(WINNER_ICON_SIZE))
+                beer_rect = beer_display.get_rect(midleft=(text_rect.right + layout.size(15), text_center[1]))
+                surface.blit(beer_display, beer_rect)
+        else:
+            # France wins - show text + wine image
+            text = render_text("France Wins!", FONT_LARGE, ACCENT_RED)
+            text_rect = text.get_rect(center=text_center)
+            surface.blit(text, text_rect)
+            
+            # Show wine image next to text
+            if use_images:
+                wine_display = symbol_atlas.get("O", layout.size(WINNER_ICON_SIZE))
+                wine_rect = wine_display.get_rect(midleft=(text_rect.right + layout.size(15), text_center[1]))
+                surface.blit(wine_display, wine_rect)
 
 def draw_winner_message(game):
     """
@@ -769,51 +725,33 @@ def draw_winner_message(game):
     """
     
     # Semi-transparent overlay
-    overlay = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
-    overlay.set_alpha(200)  # Transparency
-    overlay.fill((255, 255, 255))
-    screen.blit(overlay, (0, 0))
-    
-    # Winner text
-    if game.winner == "Draw":
-        text = font_small.render("You have the same brain", True, BLACK)
-        text_rect = text.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 2 - 80))
-        screen.blit(text, text_rect)
-    else:
-        # Display different message with icons
-        if game.winner == "X":
-            # Belgium wins - show text + beer image
-            text = font_large.render("Belgium Wins!", True, ACCENT_GOLD)
-            text_rect = text.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 2 - 80))
-            screen.blit(text, text_rect)
-            
-            # Show beer image next to text
-            if use_images:
-                beer_display = pygame.transform.scale(beer_img, (60, 60))
-                beer_rect = beer_display.get_rect(midleft=(text_rect.right + 15, WINDOW_SIZE // 2 - 80))
-                screen.blit(beer_display, beer_rect)
-        else:
-            # France wins - show text + wine image
-            text = font_large.render("France Wins!", True, ACCENT_RED)
-            text_rect = text.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 2 - 80))
-            screen.blit(text, text_rect)
-            
-            # Show wine image next to text
-            if use_images:
-                wine_display = pygame.transform.scale(wine_img, (60, 60))
-                wine_rect = wine_display.get_rect(midleft=(text_rect.right + 15, WINDOW_SIZE // 2 - 80))
-                screen.blit(wine_display, wine_rect)
+    draw_overlay((255, 255, 255), 200)
+    
+    # Winner text, rendered once per result
+    compositor.draw(screen, "winner", game.winner,
+                    lambda surface: build_winner_layer(surface, game.winner), trim=True)
     
     mouse_pos = pygame.mouse.get_pos()
     
     # Restart button
-    base_restart = pygame.Rect(150, 300, 300, 70)
+    base_restart = layout.rect(150, 300, 300, 70)
     game.restart_button_rect = draw_animated_button(game, base_restart, PRIMARY_GREEN, "Restart", DARK_NAVY, mouse_pos, "winner.restart")
-    base_menu = pygame.Rect(150, 390, 300, 70)
+    base_menu = layout.rect(150, 390, 300, 70)
     game.menu_button_rect = draw_animated_button(game, base_menu, LIGHT_GRAY, "Menu", DARK_NAVY, mouse_pos, "winner.menu")
     
     return game.restart_button_rect, game.menu_button_rect
 
+def build_menu_layer(surface):
+    """
+    Draw the static part of the main menu: background and title
+    """
+    draw_gradient_background(surface)
+    
+    # Title
+    title = render_text("TIC TAC TOE", FONT_LARGE, BLACK)
+    title_rect = title.get_rect(center=layout.point(WINDOW_SIZE // 2, 80))
+    surface.blit(title, title_rect)
+
 def draw_menu(game):
     """
     Draw the main menu with 1 Player and 2 Players animated buttons
@@ -822,29 +760,40 @@ def draw_menu(game):
     - one_player_button: pygame.Rect for 1 player button
     - two_players_button: pygame.Rect for 2 players button
     """
-    draw_gradient_background()
-    
-    # Title
-    title = font_large.render("TIC TAC TOE", True, BLACK)
-    title_rect = title.get_rect(center=(WINDOW_SIZE // 2, 80))
-    screen.blit(title, title_rect)
+    compositor.draw(screen, "menu", background_key(), build_menu_layer, opaque=True)
     
     mouse_pos = pygame.mouse.get_pos()
     
     # Stats button (small)
-    base_stats = pygame.Rect(200, 160, 200, 60)
+    base_stats = layout.rect(200, 160, 200, 60)
     game.stats_button = draw_animated_button(game, base_stats, LIGHT_GRAY, "Stats", DARK_NAVY, mouse_pos, "menu.stats")
     
     # 1 Player button
-    base_one = pygame.Rect(150, 250, 300, 80)
+    base_one = layout.rect(150, 250, 300, 80)
     game.one_player_button = draw_animated_button(game, base_one, PRIMARY_GREEN, "1 Player", DARK_NAVY, mouse_pos, "menu.one")
     
     # 2 Players button
-    base_two = pygame.Rect(150, 360, 300, 80)
+    base_two = layout.rect(150, 360, 300, 80)
     game.two_players_button = draw_animated_button(game, base_two, PRIMARY_BLUE, "2 Players", WHITE, mouse_pos, "menu.two")
     
     return game.one_player_button, game.two_players_button, game.stats_button
 
+def build_difficulty_layer(surface):
+    """
+    Draw the static part of the difficulty menu: background, title and subtitle
+    """
+    draw_gradient_background(surface)
+    
+    # Title
+    title = render_text("Choose Difficulty", FONT_LARGE, DARK_NAVY)
+    title_rect = title.get_rect(center=layout.point(WINDOW_SIZE // 2, 80))
+    surface.blit(title, title_rect)
+    
+    # Subtitle
+    subtitle = render_text("How challenging should the AI be?", FONT_SUBTITLE, DARK_NAVY)
+    subtitle_rect = subtitle.get_rect(center=layout.point(WINDOW_SIZE // 2, 130))
+    surface.blit(subtitle, subtitle_rect)
+
 def draw_difficulty_menu(game):
     """
     Draw the AI difficulty selection menu
@@ -853,63 +802,104 @@ def draw_difficulty_menu(game):
     - easy_button: pygame.Rect for easy difficulty animated button
     - medium_button: pygame.Rect for medium difficulty animated button
     - hard_button: pygame.Rect for hard difficulty animated button
-    """
-    draw_gradient_background()
     
-    # Title
-    title = font_large.render("Choose Difficulty", True, DARK_NAVY)
-    title_rect = title.get_rect(center=(WINDOW_SIZE // 2, 80))
-    screen.blit(title, title_rect)
-    
-    # Subtitle
-    subtitle_font = pygame.font.Font(None, 40)
-    subtitle = subtitle_font.render("How challenging should the AI be?", True, DARK_NAVY)
-    subtitle_rect = subtitle.get_rect(center=(WINDOW_SIZE // 2, 130))
-    screen.blit(subtitle, subtitle_rect)
+    The back button rect is stored in game.difficulty_back_button_rect.
+    """
+    compositor.draw(screen, "difficulty", background_key(), build_difficulty_layer, opaque=True)
     
     mouse_pos = pygame.mouse.get_pos()
     
     # Easy
-    base_easy = pygame.Rect(150, 200, 300, 70)
+    base_easy = layout.rect(150, 200, 300, 70)
     game.easy_button = draw_animated_button(game, base_easy, PRIMARY_GREEN, "Easy", DARK_NAVY, mouse_pos, "diff.easy")
     # Medium
-    base_med = pygame.Rect(150, 290, 300, 70)
+    base_med = layout.rect(150, 290, 300, 70)
     game.medium_button = draw_animated_button(game, base_med, PRIMARY_BLUE, "Medium", WHITE, mouse_pos, "diff.medium")
     # Hard
-    base_hard = pygame.Rect(150, 380, 300, 70)
+    base_hard = layout.rect(150, 380, 300, 70)
     game.hard_button = draw_animated_button(game, base_hard, ACCENT_RED, "Hard", WHITE, mouse_pos, "diff.hard")
+    # Back to the main menu
+    base_back = layout.rect(225, 490, 150, 60)
+    game.difficulty_back_button_rect = draw_animated_button(game, base_back, LIGHT_GRAY, "Back", DARK_NAVY, mouse_pos, "diff.back")
     
     return game.easy_button, game.medium_button, game.hard_button
     
-def draw_settings_button():
+def build_settings_button_layer(surface):
     """
-    Draw the settings gear button in top-right corner
-    
-    Returns:
-    - settings_button_rect: pygame.Rect for the settings button
+    Draw the settings icon centered on the layer
     """
-    settings_button_rect = pygame.Rect(WINDOW_SIZE - 60, 10, 50, 50)
+    center = surface.get_rect().center
     
     # Draw gear icon background
-    pygame.draw.circle(screen, LIGHT_GRAY, settings_button_rect.center, 25)
-    pygame.draw.circle(screen, DARK_NAVY, settings_button_rect.center, 25, 2) # Border
-    
-    # Draw gear symbol manually (3 lines forming a settings icon)
-    center = settings_button_rect.center
+    pygame.draw.circle(surface, LIGHT_GRAY, center, layout.size(25))
+    pygame.draw.circle(surface, DARK_NAVY, center, layout.size(25), layout.size(2)) # Border
     
     # Draw three horizontal lines (hamburger menu style for settings)
-    line_length = 20
-    line_spacing = 7
+    line_length = layout.size(20)
+    line_spacing = layout.size(7)
     
     for i in range(3):
         y_offset = (i - 1) * line_spacing
-        pygame.draw.line(screen, DARK_NAVY, 
+        pygame.draw.line(surface, DARK_NAVY, 
                         (center[0] - line_length//2, center[1] + y_offset),
                         (center[0] + line_length//2, center[1] + y_offset), 
-                        3)
+                        layout.size(3))
+
+def draw_settings_button():
+    """
+    Draw the settings gear button in top-right corner
+    
+    Returns:
+    - settings_button_rect: pygame.Rect for the settings button
+    """
+    settings_button_rect = layout.rect(WINDOW_SIZE - 60, 10, 50, 50)
+    
+    # The icon is drawn once on a transparent layer a bit larger than the button
+    icon_area = settings_button_rect.inflate(layout.size(4), layout.size(4))
+    compositor.draw(screen, "settings_button", None, build_settings_button_layer,
+                    pos=icon_area.topleft, size=icon_area.size)
     
     return settings_button_rect
 
+SETTINGS_PANEL_RECT = (100, 80, 400, 440)  # Design units, like every position below
+SETTINGS_CLOSE_RECT = (200, 450, 200, 50)
+
+def build_settings_panel_layer(surface):
+    """
+    Draw the static part of the settings panel, in panel coordinates
+    """
+    origin = layout.rect(*SETTINGS_PANEL_RECT).topleft
+    
+    def local(x, y):
+        x, y = layout.point(x, y)
+        return x - origin[0], y - origin[1]
+    
+    # Panel
+    panel_rect = surface.get_rect()
+    pygame.draw.rect(surface, WHITE, panel_rect)
+    pygame.draw.rect(surface, BLACK, panel_rect, layout.size(3))
+    
+    # Title
+    title = render_text("Settings", FONT_MEDIUM, BLACK)
+    title_rect = title.get_rect(center=local(WINDOW_SIZE // 2, 120))
+    surface.blit(title, title_rect)
+    
+    # Music label
+    music_label = render_text("Music Volume", FONT_SMALL, BLACK)
+    surface.blit(music_label, local(130, 180))
+    
+    # SFX label
+    sfx_label = render_text("SFX Volume", FONT_SMALL, BLACK)
+    surface.blit(sfx_label, local(130, 310))
+    
+    # Close button
+    close_button_rect = layout.rect(*SETTINGS_CLOSE_RECT).move(-origin[0], -origin[1])
+    pygame.draw.rect(surface, BLUE, close_button_rect, border_radius=layout.size(12))
+    pygame.draw.rect(surface, BLACK, close_button_rect, layout.size(2), border_radius=layout.size(12))
+    close_text = render_text("Close", FONT_SMALL, WHITE)
+    close_text_rect = close_text.get_rect(center=close_button_rect.center)
+    surface.blit(close_text, close_text_rect)
+
 def draw_settings_menu(game):
     """
     Draw the settings overlay with volume controls
@@ -918,100 +908,78 @@ def draw_settings_menu(game):
     - Dictionary with all interactive elements' rects
     """
     # Semi-transparent overlay
-    overlay = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
-    overlay.set_alpha(230)
-    overlay.fill((50, 50, 50))
-    screen.blit(overlay, (0, 0))
-    
-    # Settings panel
-    panel_rect = pygame.Rect(100, 80, 400, 440)
-    pygame.draw.rect(screen, WHITE, panel_rect)
-    pygame.draw.rect(screen, BLACK, panel_rect, 3)
+    draw_overlay((50, 50, 50), 230)
     
-    # Title
-    title = font_medium.render("Settings", True, BLACK)
-    title_rect = title.get_rect(center=(WINDOW_SIZE // 2, 120))
-    screen.blit(title, title_rect)
-    
-    # Music label
-    music_label = font_small.render("Music Volume", True, BLACK)
-    screen.blit(music_label, (130, 180))
+    # Settings panel, with its title, labels and close button
+    panel_rect = layout.rect(*SETTINGS_PANEL_RECT)
+    compositor.draw(screen, "settings_panel", None, build_settings_panel_layer,
+                    pos=panel_rect.topleft, size=panel_rect.size, opaque=True)
     
     # Music volume slider
     slider_y = 220
-    slider_rect = pygame. Rect(130, slider_y, 340, 10)
+    slider_rect = layout.rect(130, slider_y, 340, 10)
     
     # Draw slider track (background)
     pygame.draw.rect(screen, (180, 180, 180), slider_rect)
-    pygame.draw.rect(screen, BLACK, slider_rect, 1)  # Border
+    pygame.draw.rect(screen, BLACK, slider_rect, layout.size(1))  # Border
     
     # Draw filled portion of slider
     filled_width = int(game.music_volume * 340)
     if filled_width > 0:
-        filled_rect = pygame.Rect(130, slider_y, filled_width, 10)
+        filled_rect = layout.rect(130, slider_y, filled_width, 10)
         pygame.draw.rect(screen, GREEN if game.music_enabled else RED, filled_rect)
     
     # Music slider handle
     handle_x = 130 + int(game.music_volume * 340)
-    music_handle_rect = pygame.Rect(handle_x - 12, slider_y - 12, 24, 34)
+    music_handle_rect = layout.rect(handle_x - 12, slider_y - 12, 24, 34)
     pygame.draw.rect(screen, GREEN if game.music_enabled else RED, music_handle_rect)
-    pygame.draw.rect(screen, BLACK, music_handle_rect, 2) # Border
+    pygame.draw.rect(screen, BLACK, music_handle_rect, layout.size(2)) # Border
     
     # Music volume percentage
-    volume_text = font_small.render(f"{int(game.music_volume * 100)}%", True, BLACK)
-    screen.blit(volume_text, (500 - volume_text.get_width(), 180))
+    volume_text = render_text(f"{int(game.music_volume * 100)}%", FONT_SMALL, BLACK)
+    screen.blit(volume_text, (layout.x(500) - volume_text.get_width(), layout.y(180)))
     
     # Music toggle button
-    music_toggle_rect = pygame.Rect(130, 250, 150, 40)
-    pygame.draw.rect(screen, GREEN if game.music_enabled else RED, music_toggle_rect, border_radius=8)
-    pygame.draw.rect(screen, BLACK, music_toggle_rect, 2, border_radius=8)
-    toggle_text = font_small.render("ON" if game.music_enabled else "OFF", True, BLACK)
+    music_toggle_rect = layout.rect(130, 250, 150, 40)
+    pygame.draw.rect(screen, GREEN if game.music_enabled else RED, music_toggle_rect, border_radius=layout.size(8))
+    pygame.draw.rect(screen, BLACK, music_toggle_rect, layout.size(2), border_radius=layout.size(8))
+    toggle_text = render_text("ON" if game.music_enabled else "OFF", FONT_SMALL, BLACK)
     toggle_text_rect = toggle_text.get_rect(center=music_toggle_rect.center)
     screen.blit(toggle_text, toggle_text_rect)
     
-    # SFX label
-    sfx_label = font_small.render("SFX Volume", True, BLACK)
-    screen.blit(sfx_label, (130, 310))
-    
     # SFX volume slider
     sfx_slider_y = 350
-    sfx_slider_rect = pygame.Rect(130, sfx_slider_y, 340, 10)
+    sfx_slider_rect = layout.rect(130, sfx_slider_y, 340, 10)
     
     # Draw slider track (background)
     pygame.draw.rect(screen, (180, 180, 180), sfx_slider_rect)
-    pygame.draw.rect(screen, BLACK, sfx_slider_rect, 1)  # Border
+    pygame.draw.rect(screen, BLACK, sfx_slider_rect, layout.size(1))  # Border
     
     # Draw filled portion of slider
     sfx_filled_width = int(game.sfx_volume * 340)
     if sfx_filled_width > 0:
-        sfx_filled_rect = pygame.Rect(130, sfx_slider_y, sfx_filled_width, 10)
+        sfx_filled_rect = layout.rect(130, sfx_slider_y, sfx_filled_width, 10)
         pygame.draw.rect(screen, GREEN if game.sfx_enabled else RED, sfx_filled_rect)
     
     # SFX slider handle
     sfx_handle_x = 130 + int(game.sfx_volume * 340)
-    sfx_handle_rect = pygame. Rect(sfx_handle_x - 12, sfx_slider_y - 12, 24, 34)
+    sfx_handle_rect = layout.rect(sfx_handle_x - 12, sfx_slider_y - 12, 24, 34)
     pygame.draw.rect(screen, GREEN if game.sfx_enabled else RED, sfx_handle_rect)
-    pygame.draw.rect(screen, BLACK, sfx_handle_rect, 2) # Border
+    pygame.draw.rect(screen, BLACK, sfx_handle_rect, layout.size(2)) # Border
     
     # SFX volume percentage
-    sfx_volume_text = font_small.render(f"{int(game.sfx_volume * 100)}%", True, BLACK)
-    screen.blit(sfx_volume_text, (500 - sfx_volume_text.get_width(), 310))
+    sfx_volume_text = render_text(f"{int(game.sfx_volume * 100)}%", FONT_SMALL, BLACK)
+    screen.blit(sfx_volume_text, (layout.x(500) - sfx_volume_text.get_width(), layout.y(310)))
     
     # SFX toggle button
-    sfx_toggle_rect = pygame.Rect(130, 380, 150, 40)
-    pygame.draw.rect(screen, GREEN if game.sfx_enabled else RED, sfx_toggle_rect, border_radius=8)
-    pygame.draw.rect(screen, BLACK, sfx_toggle_rect, 2, border_radius=8)
-    sfx_toggle_text = font_small.render("ON" if game.sfx_enabled else "OFF", True, BLACK)
+    sfx_toggle_rect = layout.rect(130, 380, 150, 40)
+    pygame.draw.rect(screen, GREEN if game.sfx_enabled else RED, sfx_toggle_rect, border_radius=layout.size(8))
+    pygame.draw.rect(screen, BLACK, sfx_toggle_rect, layout.size(2), border_radius=layout.size(8))
+    sfx_toggle_text = render_text("ON" if game.sfx_enabled else "OFF", FONT_SMALL, BLACK)
     sfx_toggle_text_rect = sfx_toggle_text.get_rect(center=sfx_toggle_rect.center)
     screen. blit(sfx_toggle_text, sfx_toggle_text_rect)
     
-    # Close button
-    close_button_rect = pygame.Rect(200, 450, 200, 50)
-    pygame.draw.rect(screen, BLUE, close_button_rect, border_radius=12)
-    pygame.draw.rect(screen, BLACK, close_button_rect, 2, border_radius=12)
-    close_text = font_small.render("Close", True, WHITE)
-    close_text_rect = close_text.get_rect(center=close_button_rect.center)
-    screen.blit(close_text, close_text_rect)
+    close_button_rect = layout.rect(*SETTINGS_CLOSE_RECT)
     
     return {
         'music_slider': slider_rect,
@@ -1044,286 +1012,492 @@ def update_volumes(game):
         if click_sound:
             click_sound.set_volume(actual_sfx_volume)
 
+# Every finished game is appended to games.jsonl, stats.json holds a snapshot of the counters.
+# With "sqlite", games and moves go to games.db instead (tictactoe/store.py, indexed queries,
+# games.jsonl is imported the first time).
+# Either way the writes are done by a background thread, the game never waits on the disk.
+HISTORY_BACKEND = "jsonl"  # "jsonl" or "sqlite"
+stats_writer = BackgroundWriter()
+# Win rates, streaks, openings and daily results, updated with each recorded game
+# and saved with the counters (see tictactoe/aggregates.py)
+stats_engine = StatsEngine()
+if HISTORY_BACKEND == "sqlite":
+    game_log = GameStore(writer=stats_writer, engine=stats_engine)
+else:
+    game_log = GameLog(writer=stats_writer, engine=stats_engine)
+
+# Every 3x3 game is also packed into replays.bin (a few bytes per game, see
+# tictactoe/replay.py), for the replay viewer and bulk analysis with NumPy.
+try:
+    replay_archive = ReplayArchive(writer=stats_writer)
+except (OSError, ValueError) as e:
+    print(f"⚠️ Error opening replay archive: {e}")
+    replay_archive = None
+
 def load_stats():
     """
-    Load game statistics from JSON file
+    Load game statistics: the stats.json snapshot plus the games logged after it
+    (or the counters of games.db with the sqlite backend)
     
     Returns:
     - dict: Statistics dictionary with game history
     """
-    default_stats = {
-        'belgium_wins': 0,      # X wins
-        'france_wins': 0,       # O wins
-        'draws': 0,
-        'total_games': 0,
-        'last_played': None
-    }
-    
-    stats_file = 'stats.json'
-    
     try:
-        if os.path.exists(stats_file):
-            with open(stats_file, 'r') as f:
-                stats = json.load(f)
-                print("✅ Stats loaded successfully!")
-                print(f"🔍 Loaded stats: {stats}")
-                return stats
-        else:
-            print("📊 No stats file found, creating new one")
-            save_stats(default_stats)
-            return default_stats
+        stats = game_log.load()
+        print("✅ Stats loaded successfully!")
+        print(f"🔍 Loaded stats: {stats}")
+        return stats
     except Exception as e:
         print(f"⚠️ Error loading stats: {e}")
-        return default_stats
+        return game_log.stats
 
-def save_stats(stats):
+def record_game_result(game_stats, game):
     """
-    Save game statistics to JSON file
+    Record the result of a game and update statistics
+    
+    The game is appended to the game log (one line, whatever the size of the
+    history, written in the background) and packed into the replay archive,
+    the counters are updated in place and stats_engine in O(1).
     
     Parameters:
-    - stats: dict containing game statistics
+    - game_stats: dict of the counters (updated in place)
+    - game: GameState of the finished game (winner, moves, mode, difficulty)
     """
+    difficulty = game.ai_difficulty if game.game_mode == "1P" else None
+    record = game_record(game.moves, game.winner, game.game_mode, difficulty,
+                         BOARD_SIZE, WIN_LENGTH, started=game.started_at)
     try:
-        with open('stats.json', 'w') as f:
-            json.dump(stats, f, indent=4)
-        print("✅ Stats saved successfully!")
+        game_log.append(record)
     except Exception as e:
         print(f"⚠️ Error saving stats: {e}")
+    try:
+        if replay_archive is not None:
+            replay_archive.append(record)
+    except Exception as e:
+        print(f"⚠️ Error saving replay: {e}")
+    
+    print(f"📊 Game recorded: {game.winner}")
+    return game_stats
 
-def record_game_result(game_stats, winner_symbol):
+def build_stats_chart():
     """
-    Record the result of a game and update statistics
-    
-    Parameters:
-    - winner_symbol: "X", "O", or "Draw"
+    Pie chart of the statistics screen, rendered at the current window scale
     """
-    
-    if winner_symbol == "X":
-        game_stats['belgium_wins'] += 1
-    elif winner_symbol == "O":
-        game_stats['france_wins'] += 1
-    elif winner_symbol == "Draw":
-        game_stats['draws'] += 1
-    
-    game_stats['total_games'] += 1
-    game_stats['last_played'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    save_stats(game_stats)
-    print(f"📊 Game recorded: {winner_symbol}")
-    return game_stats
+    return PieChart(80, text_cache, ChartColors(border=DARK_NAVY, text=DARK_NAVY, empty=LIGHT_GRAY, note=DARK_GRAY),
+                    legend_font_size=FONT_LEGEND, note_font_size=FONT_NOTE, scale=layout.scale)
+
+# Win distribution on the statistics screen, re-rendered only when the stats change
+stats_chart = build_stats_chart()
 
-def draw_pie_chart(center_x, center_y, radius, belgium_wins, france_wins, draws):
+def stats_slices(stats):
     """
-    Draw a pie chart showing win distribution
-    
-    Parameters:
-    - center_x, center_y: Center position of the pie chart
-    - radius: Radius of the pie chart
-    - belgium_wins, france_wins, draws: Number of wins for each category
+    Slices of the statistics pie chart (draws are only listed once there are some)
     """
-    total = belgium_wins + france_wins + draws
-    
-    if total == 0:
-        # Draw empty circle if no games played
-        pygame.draw.circle(screen, LIGHT_GRAY, (center_x, center_y), radius)
-        pygame.draw.circle(screen, DARK_NAVY, (center_x, center_y), radius, 3) # Border
-        
-        # "No data" text
-        small_font = pygame.font.Font(None, 32)
-        no_data_text1 = small_font.render("No", True, DARK_GRAY)
-        no_data_text2 = small_font.render("games", True, DARK_GRAY)
-        
-        no_data_rect1 = no_data_text1.get_rect(center=(center_x, center_y - 12))
-        no_data_rect2 = no_data_text2.get_rect(center=(center_x, center_y + 12))
-        
-        screen.blit(no_data_text1, no_data_rect1)
-        screen.blit(no_data_text2, no_data_rect2)
-        return
-    
-    # Calculate percentages and angles
-    belgium_percent = belgium_wins / total
-    france_percent = france_wins / total
-    draws_percent = draws / total
-    
-    belgium_angle = belgium_percent * 360
-    france_angle = france_percent * 360
-    draws_angle = draws_percent * 360
-    
-    # Draw pie slices
-    import math
-    
-    # Belgium slice (starting at top, going clockwise)
-    start_angle = -90  # Start at top
-    if belgium_wins > 0:
-        end_angle = start_angle + belgium_angle
-        draw_pie_slice(center_x, center_y, radius, start_angle, end_angle, ACCENT_RED)
-        start_angle = end_angle
-    
-    # France slice
-    if france_wins > 0:
-        end_angle = start_angle + france_angle
-        draw_pie_slice(center_x, center_y, radius, start_angle, end_angle, PRIMARY_BLUE)
-        start_angle = end_angle
-    
-    # Draw slice
-    if draws > 0:
-        end_angle = start_angle + draws_angle
-        draw_pie_slice(center_x, center_y, radius, start_angle, end_angle, LIGHT_GRAY)
-    
-    # Draw border
-    pygame.draw.circle(screen, DARK_NAVY, (center_x, center_y), radius, 3)
+    return (
+        Slice("Belgium", stats['belgium_wins'], ACCENT_RED),
+        Slice("France", stats['france_wins'], PRIMARY_BLUE),
+        Slice("Draws", stats['draws'], LIGHT_GRAY, always_listed=False),
+    )
 
-def draw_pie_slice(center_x, center_y, radius, start_angle, end_angle, color):
+def recent_results(days=30):
     """
-    Draw a single slice of a pie chart
+    Results of the games of the last days, resets included, from the history
+    database (None with the JSON log, which does not index games by date)
     
-    Parameters:
-    - center_x, center_y: Center of the pie
-    - radius: Radius of the pie
-    - start_angle, end_angle: Angles in degrees
-    - color: RGB color tuple
+    Only the games already committed are counted: the query never waits for
+    the background writer (see recent_results_key).
     """
-    import math
-    
-    # Convert angles to radians
-    start_rad = math.radians(start_angle)
-    end_rad = math.radians(end_angle)
-    
-    # Create points for the polygon
-    points = [(center_x, center_y)]
-    
-    # Number of segments for smooth curve
-    num_segments = max(2, int(abs(end_angle - start_angle)))
-    
-    for i in range(num_segments + 1):
-        angle = start_rad + (end_rad - start_rad) * i / num_segments
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        points.append((x, y))
-    
-    # Draw filled polygon
-    if len(points) >= 3:
-        pygame.draw.polygon(screen, color, points)
+    if not isinstance(game_log, GameStore):
+        return None
+    try:
+        return game_log.results(since=date.today() - timedelta(days=days - 1))
+    except Exception as e:
+        print(f"⚠️ Error querying game history: {e}")
+        return None
 
-def draw_stats_screen(game):
+def recent_results_key():
     """
-    Draw the statistics screen with game history and pie chart
+    Changes when the games recent_results() can see do: the last game the
+    writer thread committed to the database
+    """
+    return game_log.written if isinstance(game_log, GameStore) else None
+
+def build_stats_layer(surface, stats, recent=None):
+    """
+    Draw the static part of the statistics screen: background, panel, numbers,
+    pie chart and legend
     
-    Returns:
-    - back_button_rect: pygame.Rect for the back button
-    - reset_stats_button_rect: pygame. Rect for reset stats button
+    Parameters:
+    - surface: pygame.Surface to draw on
+    - stats: dict with the game statistics shown
+    - recent: result counts of the last 30 days (None: not shown)
     """
     # Gradient background
-    draw_gradient_background()
+    draw_gradient_background(surface)
     
     # Title
-    title = font_large.render("Statistics", True, DARK_NAVY)
-    title_rect = title.get_rect(center=(WINDOW_SIZE // 2, 50))
-    screen.blit(title, title_rect)
+    title = render_text("Statistics", FONT_LARGE, DARK_NAVY)
+    title_rect = title.get_rect(center=layout.point(WINDOW_SIZE // 2, 50))
+    surface.blit(title, title_rect)
     
     # Stats panel
-    panel_rect = pygame.Rect(50, 100, 500, 400)
-    panel_surface = pygame.Surface((500, 400))
+    panel_rect = layout.rect(50, 100, 500, 400)
+    panel_surface = pygame.Surface(panel_rect.size)
     panel_surface.set_alpha(220)
     panel_surface.fill(WHITE)
-    screen.blit(panel_surface, (50, 100))
-    pygame.draw.rect(screen, DARK_NAVY, panel_rect, 3, border_radius=15)
+    surface.blit(panel_surface, panel_rect.topleft)
+    pygame.draw.rect(surface, DARK_NAVY, panel_rect, layout.size(3), border_radius=layout.size(15))
     
     # Left side: Text stats
     y_offset = 130
     
     # Belgium wins
-    belgium_text = font_small.render(f"Belgium Wins: {game_stats['belgium_wins']}", True, ACCENT_RED)
-    screen.blit(belgium_text, (80, y_offset))
+    belgium_text = render_text(f"Belgium Wins: {stats['belgium_wins']}", FONT_SMALL, ACCENT_RED)
+    surface.blit(belgium_text, layout.point(80, y_offset))
     y_offset += 50
     
     # France wins
-    france_text = font_small.render(f"France Wins: {game_stats['france_wins']}", True, PRIMARY_BLUE)
-    screen.blit(france_text, (80, y_offset))
+    france_text = render_text(f"France Wins: {stats['france_wins']}", FONT_SMALL, PRIMARY_BLUE)
+    surface.blit(france_text, layout.point(80, y_offset))
     y_offset += 50
     
     # Draws
-    draws_text = font_small.render(f"Draws: {game_stats['draws']}", True, DARK_GRAY)
-    screen. blit(draws_text, (80, y_offset))
+    draws_text = render_text(f"Draws: {stats['draws']}", FONT_SMALL, DARK_GRAY)
+    surface.blit(draws_text, layout.point(80, y_offset))
     y_offset += 50
     
     # Total games
-    total_text = font_small.render(f"Total Games: {game_stats['total_games']}", True, DARK_NAVY)
-    screen.blit(total_text, (80, y_offset))
+    total_text = render_text(f"Total Games: {stats['total_games']}", FONT_SMALL, DARK_NAVY)
+    surface.blit(total_text, layout.point(80, y_offset))
     y_offset += 50
     
     # Last played
-    if game_stats['last_played']:
-        last_played_text = font_small.render(f"Last Played:", True, DARK_GRAY)
-        screen. blit(last_played_text, (80, y_offset))
+    if stats['last_played']:
+        last_played_text = render_text(f"Last Played:", FONT_SMALL, DARK_GRAY)
+        surface.blit(last_played_text, layout.point(80, y_offset))
         y_offset += 40
         
         # Date on second line (smaller font)
-        date_font = pygame.font.Font(None, 35)
-        date_text = date_font.render(game_stats['last_played'], True, DARK_GRAY)
-        screen.blit(date_text, (80, y_offset))
-    
-    # Right side: Pie chart
-    pie_center_x = 440
-    pie_center_y = 280
-    pie_radius = 80
-    
-    draw_pie_chart(pie_center_x, pie_center_y, pie_radius, 
-    game_stats['belgium_wins'], 
-    game_stats['france_wins'], 
-    game_stats['draws'])
-    
-    # Legend for pie chart (vertical layout)
-    legend_x = 370
-    legend_y = 385
-    legend_font = pygame.font.Font(None, 28)
-    letter_spacing = 30
-    
-    # Belgium legend
-    pygame.draw.circle(screen, ACCENT_RED, (legend_x, legend_y), 8)
-    legend_text = legend_font.render("Belgium", True, DARK_NAVY)
-    screen.blit(legend_text, (legend_x + 15, legend_y - 10))
-    
-    # France legend
-    legend_y += letter_spacing
-    pygame.draw.circle(screen, PRIMARY_BLUE, (legend_x, legend_y), 8)
-    legend_text = legend_font.render("France", True, DARK_NAVY)
-    screen.blit(legend_text, (legend_x + 15, legend_y - 10))
-    
-    # Draw legend (if there are draws)
-    if game_stats['draws'] > 0:
-        legend_y += letter_spacing
-        pygame.draw.circle(screen, LIGHT_GRAY, (legend_x, legend_y), 8)
-        legend_text = legend_font.render("Draws", True, DARK_NAVY)
-        screen.blit(legend_text, (legend_x + 15, legend_y - 10))
+        date_text = render_text(stats['last_played'], FONT_DATE, DARK_GRAY)
+        surface.blit(date_text, layout.point(80, y_offset))
+        y_offset += 50
+    
+    # Last 30 days (SQLite backend only)
+    recent_games = sum(recent.values()) if recent else 0
+    if recent_games:
+        plural = "s" if recent_games > 1 else ""
+        lines = (f"Last 30 days: {recent['X'] / recent_games:.0%} won", f"({recent_games} game{plural})")
+        for row, line in enumerate(lines):
+            surface.blit(render_text(line, FONT_LEGEND, DARK_GRAY), layout.point(80, y_offset + row * 24))
+    
+    # Right side: Pie chart, with its legend below
+    stats_chart.draw(surface, layout.point(440, 280), stats_slices(stats))
+    
+    draw_stats_page_hint(surface, "Click for details")
+
+def draw_stats_page_hint(surface, text):
+    """
+    Small note at the bottom of the stats panel, telling it can be clicked
+    """
+    hint = render_text(text, FONT_LEGEND, DARK_GRAY)
+    surface.blit(hint, hint.get_rect(midbottom=layout.point(WINDOW_SIZE // 2, 492)))
+
+def opening_name(cell):
+    """
+    Name of a first move: center, corner or edge on the 3x3 board
+    """
+    if BOARD_SIZE != 3:
+        return f"cell {cell}"
+    return "center" if cell == 4 else "corner" if cell in (0, 2, 6, 8) else "edge"
+
+def build_stats_details_layer(surface, engine, total_games):
+    """
+    Draw the details page of the statistics screen: win rate against each
+    opponent, streaks, first-move advantage and results of the last days
+    
+    Parameters:
+    - surface: pygame.Surface to draw on
+    - engine: StatsEngine with the aggregates shown
+    - total_games: games of the counters, the details only cover the logged
+      ones (older stats.json and the shipped seed only have counters)
+    """
+    draw_gradient_background(surface)
+    
+    # Title
+    title = render_text("Statistics", FONT_LARGE, DARK_NAVY)
+    surface.blit(title, title.get_rect(center=layout.point(WINDOW_SIZE // 2, 50)))
+    
+    # Stats panel
+    panel_rect = layout.rect(50, 100, 500, 400)
+    panel_surface = pygame.Surface(panel_rect.size)
+    panel_surface.set_alpha(220)
+    panel_surface.fill(WHITE)
+    surface.blit(panel_surface, panel_rect.topleft)
+    pygame.draw.rect(surface, DARK_NAVY, panel_rect, layout.size(3), border_radius=layout.size(15))
+    
+    # Left: Belgium's win rate against each opponent
+    surface.blit(render_text("Belgium win rate", FONT_NOTE, DARK_NAVY), layout.point(75, 115))
+    names = {"easy": "Easy AI", "medium": "Medium AI", "hard": "Hard AI", "2P": "2 Players"}
+    rates = engine.win_rates()
+    if not rates:
+        surface.blit(render_text("No logged games yet", FONT_LEGEND, DARK_GRAY), layout.point(75, 150))
+    for row, (opponent, rate) in enumerate(rates.items()):
+        line = f"{names.get(opponent, opponent)}: {rate['rate']:.0%} of {rate['games']}"
+        surface.blit(render_text(line, FONT_LEGEND, DARK_GRAY), layout.point(75, 150 + row * 28))
+    
+    # Right: streaks
+    current, length, best = engine.streaks()
+    labels = {"X": "Belgium", "O": "France", "Draw": "Draws"}
+    surface.blit(render_text("Streaks", FONT_NOTE, DARK_NAVY), layout.point(330, 115))
+    lines = [f"Now: {labels[current]} x{length}" if current else "Now: -",
+             f"Best Belgium: {best['X']}",
+             f"Best France: {best['O']}"]
+    for row, line in enumerate(lines):
+        surface.blit(render_text(line, FONT_LEGEND, DARK_GRAY), layout.point(330, 150 + row * 28))
+    
+    # First-move advantage, per mode: against the AI the first mover is always the human
+    advantage = engine.first_move_advantage()
+    if advantage:
+        modes = {"2P": "2 players", "1P": "vs AI"}
+        parts = [f"{modes[mode]} {shares['first']:.0%}" for mode, shares in advantage.items()]
+        line = "First player wins: " + ", ".join(parts)
+        surface.blit(render_text(line, FONT_LEGEND, ACCENT_RED), layout.point(75, 268))
+        mode = max(advantage, key=lambda mode: advantage[mode]["games"])
+        cell, counts = next(iter(advantage[mode]["openings"].items()), (None, None))
+        if counts:
+            games = sum(counts.values())
+            plural = "s" if games > 1 else ""
+            line = f"Favorite {mode} opening: {opening_name(cell)} ({games} game{plural}, {counts['X'] / games:.0%} won)"
+            surface.blit(render_text(line, FONT_LEGEND, DARK_GRAY), layout.point(75, 296))
+    
+    # Results of the last 14 days, one stacked bar per day
+    histogram = engine.daily_histogram(days=14)
+    surface.blit(render_text("Last 14 days", FONT_NOTE, DARK_NAVY), layout.point(75, 330))
+    tallest = max(1, max(sum(counts.values()) for _, counts in histogram))
+    bar_width, bar_bottom, bar_height = 450 / len(histogram), 440, 70
+    for index, (day, counts) in enumerate(histogram):
+        bottom = bar_bottom
+        for result, color in (("X", ACCENT_RED), ("O", PRIMARY_BLUE), ("Draw", LIGHT_GRAY)):
+            height = bar_height * counts[result] / tallest
+            if counts[result]:
+                bar = layout.rect(75 + index * bar_width + 3, bottom - height, bar_width - 6, height)
+                pygame.draw.rect(surface, color, bar)
+                pygame.draw.rect(surface, DARK_NAVY, bar, 1)
+            bottom -= height
+    first_day = render_text(histogram[0][0][5:], FONT_LEGEND, DARK_GRAY)
+    surface.blit(first_day, layout.point(75, 444))
+    today = render_text("today", FONT_LEGEND, DARK_GRAY)
+    surface.blit(today, today.get_rect(topright=layout.point(525, 444)))
+    
+    if engine.games < total_games:
+        draw_stats_page_hint(surface, f"Logged games only ({engine.games} of {total_games}) - Click for totals")
+    else:
+        draw_stats_page_hint(surface, "Click for totals")
+
+def draw_stats_screen(game):
+    """
+    Draw the statistics screen with game history and pie chart
+    
+    Returns:
+    - back_button_rect: pygame.Rect for the back button
+    - reset_stats_button_rect: pygame. Rect for reset stats button
+    - replay_button_rect: pygame.Rect for the replay viewer button
+    """
+    # Everything but the buttons only changes when the stats do
+    if game.stats_page == "details":
+        details_key = (background_key(), stats_engine.version, game_stats['total_games'], date.today())
+        compositor.draw(screen, "stats_details", details_key,
+                        lambda surface: build_stats_details_layer(surface, stats_engine, game_stats['total_games']),
+                        opaque=True)
+    else:
+        stats_key = (background_key(), tuple(game_stats.items()), date.today(), recent_results_key())
+        compositor.draw(screen, "stats", stats_key,
+                        lambda surface: build_stats_layer(surface, game_stats, recent_results()), opaque=True)
+    game.stats_panel_rect = layout.rect(50, 100, 500, 400)  # Clicking it switches page
     
     mouse_pos = pygame.mouse.get_pos()
     
     # Back button
-    base_back = pygame.Rect(100, 520, 180, 60)
+    base_back = layout.rect(50, 520, 150, 60)
     game.back_button_rect = draw_animated_button(game, base_back, PRIMARY_BLUE, "Back", WHITE, mouse_pos, "stats.back")
     
+    # Replay viewer
+    base_replay = layout.rect(225, 520, 150, 60)
+    game.replay_button_rect = draw_animated_button(game, base_replay, PRIMARY_GREEN, "Replay", DARK_NAVY, mouse_pos, "stats.replay")
+    
     # Reset stats
-    base_reset = pygame.Rect(320, 520, 180, 60)
+    base_reset = layout.rect(400, 520, 150, 60)
     game.reset_stats_button_rect = draw_animated_button(game, base_reset, ACCENT_RED, "Reset", WHITE, mouse_pos, "stats.reset")
     
-    return game.back_button_rect, game.reset_stats_button_rect
+    return game.back_button_rect, game.reset_stats_button_rect, game.replay_button_rect
 
 def reset_stats():
     """
     Reset all statistics to zero
     """
     global game_stats
-    game_stats = {
-        'belgium_wins': 0,
-        'france_wins': 0,
-        'draws': 0,
-        'total_games': 0,
-        'last_played': None
-    }
-    save_stats(game_stats)
+    try:
+        game_stats = game_log.reset()
+    except Exception as e:
+        print(f"⚠️ Error saving stats: {e}")
     print("📊 Stats reset!")
 
+def open_replay(game, game_id):
+    """
+    Show an archived game in the replay viewer
+    
+    Parameters:
+    - game: GameState object
+    - game_id: id in the replay archive (len(replay_archive) - 1 is the last game played)
+    
+    Returns:
+    - bool: False if there is no such game
+    """
+    if replay_archive is None or BOARD_SIZE != 3 or not 0 <= game_id < len(replay_archive):
+        return False
+    try:
+        game.replay = ReplayView(replay_archive.get(game_id))
+    except (OSError, ValueError, IndexError) as e:
+        print(f"⚠️ Error reading replay {game_id}: {e}")
+        return False
+    game.game_state = "replay"
+    print(f"🎬 Replaying game {game_id}: {game.replay.record['moves']}")
+    return True
+
+def replay_caption(replay):
+    """
+    Lines shown over the replayed board: which game and who played, then when
+    it was played (the result once the last move is shown)
+    """
+    record = replay.record
+    opponent = f"{record['difficulty'].capitalize()} AI" if record['difficulty'] else "2 Players"
+    first_line = f"Game {record['id'] + 1}/{len(replay_archive)}  -  {opponent}"
+    if replay.finished:
+        return first_line, {"X": "Belgium Wins!", "O": "France Wins!", "Draw": "Draw"}[record['result']]
+    return first_line, record['time']
+
+def draw_replay_screen(game):
+    """
+    Draw the replay viewer: the board of the archived game up to the current
+    move, with the same grid and symbols as a live game
+    
+    Returns:
+    - older_rect: pygame.Rect for the previous game button
+    - back_rect: pygame.Rect for the back button
+    - newer_rect: pygame.Rect for the next game button
+    """
+    # A smaller board, so the caption and the buttons do not cover any cell
+    board_layout = layout.region(*REPLAY_BOARD_AREA)
+    compositor.draw(screen, "replay_grid", background_key(),
+                    lambda surface: build_grid_layer(surface, board_layout), opaque=True)
+    draw_symbols(game.replay, board_layout)
+    
+    for line_number, line in enumerate(replay_caption(game.replay)):
+        caption = render_text(line, FONT_LEGEND, DARK_NAVY)
+        screen.blit(caption, layout.point(15, 10 + line_number * 28))
+    
+    mouse_pos = pygame.mouse.get_pos()
+    
+    # Buttons below the board
+    base_older = layout.rect(40, 550, 150, 44)
+    game.replay_older_rect = draw_animated_button(game, base_older, LIGHT_GRAY, "Older", DARK_NAVY, mouse_pos, "replay.older")
+    base_back = layout.rect(225, 550, 150, 44)
+    game.replay_back_rect = draw_animated_button(game, base_back, PRIMARY_BLUE, "Back", WHITE, mouse_pos, "replay.back")
+    base_newer = layout.rect(410, 550, 150, 44)
+    game.replay_newer_rect = draw_animated_button(game, base_newer, LIGHT_GRAY, "Newer", DARK_NAVY, mouse_pos, "replay.newer")
+    
+    return game.replay_older_rect, game.replay_back_rect, game.replay_newer_rect
+
+def get_button_damage_rect(rect):
+    """
+    Area an animated button can cover: hover scale, ripples and glow
+    """
+    return rect.inflate(rect.width // 10 + layout.size(60), rect.height // 10 + layout.size(60))
+
+def scene_signature(game):
+    """
+    Everything that changes the look of the current screen, apart from the
+    board cells, button hover and fireworks (those are damaged individually)
+    """
+    return (
+        game.game_state,
+        game.settings_open,
+        game.game_over,
+        game.winner,
+        game.music_volume,
+        game.sfx_volume,
+        game.music_enabled,
+        game.sfx_enabled,
+        tuple(game_stats.values()) if game.game_state == "stats" else None,
+        (game.stats_page, stats_engine.version, recent_results_key()) if game.game_state == "stats" else None,
+        (game.replay.record["id"], game.replay.ply) if game.game_state == "replay" else None,
+    )
+
+def collect_damage(game, renderer, mouse_pos, last_scene):
+    """
+    Report to the renderer which regions changed since the last frame
+    
+    Parameters:
+    - game: GameState object
+    - renderer: DirtyRectRenderer
+    - mouse_pos: current mouse position
+    - last_scene: dict with the "signature" and "board" of the last drawn frame
+    """
+    signature = scene_signature(game)
+    board = (game.board.x, game.board.o)
+    
+    if signature != last_scene.get("signature"):
+        # Different screen, overlay or values: repaint everything
+        renderer.damage_all()
+        game.button_rects.clear()
+    elif board != last_scene.get("board"):
+        # Only the cells that changed since the last frame
+        changed = (board[0] ^ last_scene["board"][0]) | (board[1] ^ last_scene["board"][1])
+        while changed:
+            low = changed & -changed
+            renderer.damage(get_cell_rect(low.bit_length() - 1))
+            changed ^= low
+    last_scene["signature"] = signature
+    last_scene["board"] = board
+    
+    # Hovered buttons ripple every frame, and buttons keep animating while their scale settles
+    for button_id, rect in game.button_rects.items():
+        scale = game.button_scales.get(button_id, 1.0)
+        if rect.collidepoint(mouse_pos) or abs(scale - 1.0) > 0.003:
+            renderer.damage(get_button_damage_rect(rect))
+        elif scale != 1.0:
+            # Close enough: settle at exactly 1.0 and draw that last frame,
+            # otherwise the button would stay at its last, slightly bigger size
+            game.button_scales[button_id] = 1.0
+            renderer.damage(get_button_damage_rect(rect))
+    
+    # Live fireworks: where particles are, plus how far they can move in one frame
+    if not game.settings_open:
+        for bounds in game.fireworks.get_bounds():
+            renderer.damage(bounds)
+
+def apply_layout(game):
+    """
+    Lay the screens out again for the current window size (after a resize)
+    
+    Everything cached at a pixel size is rendered once at the new size:
+    static layers, text, symbol images, particle discs and the stats chart.
+    Nothing is scaled when drawing frames.
+    """
+    global screen, stats_chart
+    screen = pygame.display.get_surface()
+    layout.resize(screen.get_size())
+    
+    renderer.resize(screen)
+    compositor.resize(screen.get_size())
+    text_cache.clear()
+    symbol_atlas.resize(symbol_sizes())
+    game.fireworks.set_view(layout.scale, layout.offset)
+    stats_chart = build_stats_chart()
+    glow_surfaces.clear()
+    game.button_rects.clear()
+    print(f"🖥️ Window resized to {screen.get_width()}x{screen.get_height()} (scale {layout.scale:.2f})")
+
 # Load game statistics
 game_stats = load_stats()
 
@@ -1332,15 +1506,34 @@ game = GameState()
 
 # Main game loop
 running = True
+last_scene = {}  # Signature and board of the last drawn frame (see collect_damage)
 
 while running:
+    # Sleep until something happens when the last frame was idle (AI and replay moves are scheduled)
+    if game.ai_thinking:
+        deadline = game.ai_move_time
+        if game.ai_search is not None and not game.ai_search.done():
+            deadline = max(deadline, pygame.time.get_ticks() + AI_POLL_INTERVAL)
+    elif game.game_state == "replay" and not game.replay.finished:
+        deadline = game.replay.next_step
+    else:
+        deadline = None
+    events = scheduler.next_events(deadline)
+    
     game.ticks = pygame.time.get_ticks() / 1000.0  # Convert milliseconds to seconds
     mouse_pos = pygame.mouse.get_pos() # Current mouse position
     # Event handling
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
         
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            renderer.damage_all()  # Window content was lost, repaint everything
+        
+        if (event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED)
+                and pygame.display.get_surface().get_size() != layout.window_size):
+            apply_layout(game)  # Before any click is tested against the buttons
+        
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = event.pos
             
@@ -1373,7 +1566,7 @@ while running:
                 if game.settings_rects.get('music_slider'):
                     slider = game.settings_rects['music_slider']
                     # expand clickable area vertically for easier dragging
-                    expanded_slider_rect = pygame.Rect(slider.x, slider.y - 15, slider.width, slider.height + 40)
+                    expanded_slider_rect = pygame.Rect(slider.x, slider.y - layout.size(15), slider.width, slider.height + layout.size(40))
                     if expanded_slider_rect.collidepoint(mouse_pos):
                         game.dragging_music_slider = True
                         # immediately update volume on click
@@ -1384,7 +1577,7 @@ while running:
                 if game.settings_rects.get('sfx_slider'):
                     slider = game.settings_rects['sfx_slider']
                     # expand clickable area vertically for easier dragging
-                    expanded_slider_rect = pygame.Rect(slider.x, slider.y - 15, slider.width, slider.height + 40)
+                    expanded_slider_rect = pygame.Rect(slider.x, slider.y - layout.size(15), slider.width, slider.height + layout.size(40))
                     if expanded_slider_rect.collidepoint(mouse_pos):
                         game.dragging_sfx_slider = True
                         # immediately update volume on click
@@ -1429,9 +1622,9 @@ while running:
                     # Get cell index from mouse click
                     cell_index = get_cell_from_mouse(mouse_pos)
                     
-                    # Check if cell is empty
-                    if game.board[cell_index] == "":
-                        game.board[cell_index] = game.current_player
+                    # Check if cell is empty (and the click was on the board)
+                    if cell_index is not None and game.board.is_empty(cell_index):
+                        game.play_move(cell_index, game.current_player)
                         
                         # Play appropriate sound based on player
                         if game.current_player == "X":
@@ -1448,7 +1641,7 @@ while running:
                             game.game_over = True
                             game.winner = result
                             if not game.winner_recorded:
-                                game_stats = record_game_result(game_stats, game.winner)
+                                game_stats = record_game_result(game_stats, game)
                                 game.winner_recorded = True
                                 trigger_fireworks(game)
                             print(f"Game Over! Winner: {game.winner}")
@@ -1465,6 +1658,34 @@ while running:
                     play_sound(game, click_sound) # Play click sound
                     reset_stats()
                     print("Statistics has been reset")
+                
+                elif game.replay_button_rect and game.replay_button_rect.collidepoint(mouse_pos):
+                    play_sound(game, click_sound) # Play click sound
+                    # Start from the last game played
+                    if not open_replay(game, len(replay_archive) - 1 if replay_archive else -1):
+                        print("No game to replay yet")
+                
+                elif game.stats_panel_rect and game.stats_panel_rect.collidepoint(mouse_pos):
+                    play_sound(game, click_sound) # Play click sound
+                    game.stats_page = "details" if game.stats_page == "totals" else "totals"
+                    print(f"Statistics page: {game.stats_page}")
+            elif game.game_state == "replay":
+                if game.replay_back_rect and game.replay_back_rect.collidepoint(mouse_pos):
+                    play_sound(game, click_sound) # Play click sound
+                    game.game_state = "stats"
+                    game.replay = None
+                    print("Returned to stats from replay")
+                
+                elif game.replay_older_rect and game.replay_older_rect.collidepoint(mouse_pos):
+                    play_sound(game, click_sound) # Play click sound
+                    open_replay(game, game.replay.record["id"] - 1)
+                
+                elif game.replay_newer_rect and game.replay_newer_rect.collidepoint(mouse_pos):
+                    play_sound(game, click_sound) # Play click sound
+                    open_replay(game, game.replay.record["id"] + 1)
+                
+                elif get_cell_from_mouse(mouse_pos) is not None:
+                    game.replay.restart()  # Click on the board: watch it again
             elif game.game_state == "difficulty":
                 if game.easy_button and game.easy_button.collidepoint(mouse_pos):
                     play_sound(game, click_sound) # Play click sound
@@ -1481,7 +1702,7 @@ while running:
                     game.ai_difficulty = "hard"
                     game.game_state = "playing"
                     print("Hard difficulty selected")
-                elif game.difficulty_back_button and game.difficulty_back_button.collidepoint(mouse_pos):
+                elif game.difficulty_back_button_rect and game.difficulty_back_button_rect.collidepoint(mouse_pos):
                     play_sound(game, click_sound) # Play click sound
                     game.game_state = "menu"
                     print("Returned to menu from difficulty selection")
@@ -1517,13 +1738,16 @@ while running:
             game.ai_thinking = True
             game.ai_move_time = pygame.time.get_ticks() + game.ai_delay # Record the time when AI starts thinking
             print("AI is thinking...")
+            # The search (up to MCTS_TIME_LIMIT) runs during the delay, on the AI thread
+            game.ai_search = ai_executor.submit(get_ai_move, game.board.copy(), game.ai_player, game.ai_difficulty)
         
-        # Check if AI delay time has passed
-        elif pygame.time.get_ticks() >= game.ai_move_time:
-            ai_move = get_ai_move(game.board, game.ai_player, game.ai_difficulty) # Call the AI function
+        # Check if AI delay time has passed and the search is over
+        elif pygame.time.get_ticks() >= game.ai_move_time and game.ai_search.done():
+            ai_move = game.ai_search.result()
+            game.ai_search = None
             
-            if ai_move is not False and 0 <= ai_move <= 8 and game.board[ai_move] == "":
-                game.board[ai_move] = game.ai_player
+            if ai_move is not False and game.board.is_empty(ai_move):
+                game.play_move(ai_move, game.ai_player)
                 
                 # Play sound for AI move
                 play_sound(game, wine_click_sound)  # Sound for wine (O)
@@ -1537,7 +1761,7 @@ while running:
                     game.game_over = True
                     game.winner = result
                     if not game.winner_recorded:
-                        record_game_result(game_stats, game.winner)
+                        record_game_result(game_stats, game)
                         game.winner_recorded = True
                         trigger_fireworks(game)
                     print(f"Game Over! Winner: {game.winner}")
@@ -1549,38 +1773,59 @@ while running:
                 
             game.ai_thinking = False  # Reset AI thinking flag
     
-    # Drawing based on game state
-    if game.game_state == "menu":
-        game.one_player_button, game.two_players_button, game.stats_button = draw_menu(game)
-        game.settings_button_rect = draw_settings_button()
-    elif game.game_state == "stats":
-        game.back_button_rect, game.reset_stats_button_rect = draw_stats_screen(game)
-        game.settings_button_rect = draw_settings_button()
+    # Replay viewer: next move of the archived game when its time has come
+    if game.game_state == "replay" and not game.settings_open:
+        game.replay.update(pygame.time.get_ticks())
+    
+    # Work out what changed, then draw only if something did
+    collect_damage(game, renderer, mouse_pos, last_scene)
+    drawing = renderer.begin_frame()
+    if drawing:
+        # Drawing based on game state
+        if game.game_state == "menu":
+            game.one_player_button, game.two_players_button, game.stats_button = draw_menu(game)
+            game.settings_button_rect = draw_settings_button()
+        elif game.game_state == "stats":
+            game.back_button_rect, game.reset_stats_button_rect, game.replay_button_rect = draw_stats_screen(game)
+            game.settings_button_rect = draw_settings_button()
+        
+        elif game.game_state == "replay":
+            game.replay_older_rect, game.replay_back_rect, game.replay_newer_rect = draw_replay_screen(game)
+            game.settings_button_rect = draw_settings_button()
         
-    elif game.game_state == "difficulty":
-        game.easy_button, game.medium_button, game.hard_button = draw_difficulty_menu(game)
-        game.settings_button_rect = draw_settings_button()
-
-    elif game.game_state == "playing":
-        draw_grid()
-        draw_symbols(game)
-        game.settings_button_rect = draw_settings_button()
+        elif game.game_state == "difficulty":
+            game.easy_button, game.medium_button, game.hard_button = draw_difficulty_menu(game)
+            game.settings_button_rect = draw_settings_button()
+
+        elif game.game_state == "playing":
+            draw_grid()
+            draw_symbols(game)
+            game.settings_button_rect = draw_settings_button()
         
-        # Draw winner message if game is over
-        if game.game_over:
-            game.restart_button_rect, game.menu_button_rect = draw_winner_message(game)
+            # Draw winner message if game is over
+            if game.game_over:
+                game.restart_button_rect, game.menu_button_rect = draw_winner_message(game)
     
-    # Draw fireworks on top of everything (except settings)
-    if not game.settings_open:
-        update_and_draw_fireworks(game, screen)
+        # Draw fireworks on top of everything (except settings)
+        if not game.settings_open:
+            update_and_draw_fireworks(game, screen)
+        
+        # Draw settings overlay on top of everything if open
+        if game.settings_open:
+            game.settings_rects = draw_settings_menu(game)
         
-    # Draw settings overlay on top of everything if open
-    if game.settings_open:
-        game.settings_rects = draw_settings_menu(game)
+        # Update display (only the damaged regions)
+        renderer.present()
     
-    # Update display
-    pygame.display.flip()
-    clock.tick(FPS)
+    # Something moved: keep FPS. Nothing did: wait for events in next_events
+    scheduler.end_frame(busy=drawing)
 
 # Quit properly
+game_log.close()  # Writes the stats still waiting in the background writer
+writes = stats_writer.metrics()
+print(f"💾 Stats writes: {writes['writes']} in {writes['batches']} batches, "
+      f"latency {writes['latency_mean_ms']} ms mean / {writes['latency_max_ms']} ms max")
+print(f"📝 Text cache: {text_cache.hit_rate:.1%} hits ({text_cache.misses} strings rendered)")
+ai_executor.shutdown(cancel_futures=True)  # Waits for a search still running
+mcts_player.close()
 pygame.quit()
\ No newline at end of file
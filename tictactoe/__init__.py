@@ -0,0 +1,6 @@
+"""
+Game logic shared by the pygame front-end (main.py) and offline tools
+"""
+from tictactoe.board import Board, WIN_MASKS
+
+__all__ = ["Board", "WIN_MASKS"]
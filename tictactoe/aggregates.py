@@ -0,0 +1,197 @@
+"""
+Incremental statistics for the statistics screen
+
+No pygame needed. The engine keeps aggregates of the played games and
+updates them with each record of the game log, in constant time:
+
+- results against each opponent (easy / medium / hard AI, or 2 players)
+- streaks: the current run of identical results and the longest ones
+- first-move advantage in each mode: how often who moved first (X) wins,
+  and the results by the cell they opened on
+- daily histogram: results per day
+
+    engine = StatsEngine()
+    engine.apply(game_record([4, 0, 8, 2, 6], "X", "1P", "hard"))
+    engine.win_rates()["hard"]       # {'games': 1, 'X': 1, 'O': 0, 'Draw': 0, 'rate': 1.0}
+    engine.daily_histogram(days=7)   # [("2025-12-01", {'X': 0, ...}), ...]
+
+Nothing is ever recomputed from the history, except by rebuild(records),
+which replays a whole game log once (e.g. when no saved state exists yet).
+The state is a plain dict, saved with the counters snapshot (see
+history.GameLog and store.GameStore), so a restart only replays the records
+written after it. Like the counters, a reset record clears it.
+"""
+from datetime import date, timedelta
+
+STATE_VERSION = 2  # 2: openings by mode
+RESULTS = ("X", "O", "Draw")
+OPPONENTS = ("easy", "medium", "hard", "2P")
+MODES = ("2P", "1P")
+
+
+def _counts():
+    return dict.fromkeys(RESULTS, 0)
+
+
+def opponent_of(record):
+    """
+    Who O was in a game: the AI difficulty, or "2P" for 2 players games
+    """
+    return record.get("difficulty") if record.get("mode") == "1P" else "2P"
+
+
+class StatsEngine:
+    """
+    Aggregates of the game log, updated one record at a time
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Forget every game (reset record)
+        """
+        self.games = 0
+        self.by_opponent = {}  # opponent -> result counts
+        self.by_opening = {}  # mode -> str(first cell) -> result counts (str: JSON keys)
+        self.daily = {}  # "YYYY-MM-DD" -> result counts
+        self.streak_result = None  # Result of the current run of identical results
+        self.streak_length = 0
+        self.best_streaks = dict.fromkeys(RESULTS, 0)
+        self.version = 0  # Bumped at each change, to know when a view must be redrawn
+
+    def apply(self, record):
+        """
+        Update the aggregates with one log record, O(1)
+        """
+        self.version += 1
+        if record.get("type") == "reset":
+            version = self.version
+            self.clear()
+            self.version = version
+            return
+
+        result = record["result"]
+        self.games += 1
+        self.by_opponent.setdefault(opponent_of(record), _counts())[result] += 1
+        if record.get("moves"):
+            openings = self.by_opening.setdefault(record["mode"], {})
+            openings.setdefault(str(record["moves"][0]), _counts())[result] += 1
+        self.daily.setdefault(record["time"][:10], _counts())[result] += 1
+
+        if result == self.streak_result:
+            self.streak_length += 1
+        else:
+            self.streak_result = result
+            self.streak_length = 1
+        self.best_streaks[result] = max(self.best_streaks[result], self.streak_length)
+
+    def rebuild(self, records):
+        """
+        Recompute everything from the full history (oldest record first)
+        """
+        self.clear()
+        for record in records:
+            self.apply(record)
+        return self
+
+    def state(self):
+        """
+        Everything the engine knows, as a JSON-serializable dict
+        """
+        return {
+            "version": STATE_VERSION,
+            "games": self.games,
+            "by_opponent": self.by_opponent,
+            "by_opening": self.by_opening,
+            "daily": self.daily,
+            "streak": [self.streak_result, self.streak_length],
+            "best_streaks": self.best_streaks,
+        }
+
+    def load_state(self, state):
+        """
+        Restore a state saved by state()
+
+        Returns:
+        - bool: False if the state is missing or from another version (call rebuild then)
+        """
+        if not state or state.get("version") != STATE_VERSION:
+            return False
+        self.clear()
+        self.games = state["games"]
+        self.by_opponent = state["by_opponent"]
+        self.by_opening = state["by_opening"]
+        self.daily = state["daily"]
+        self.streak_result, self.streak_length = state["streak"]
+        self.best_streaks.update(state["best_streaks"])
+        return True
+
+    def win_rates(self):
+        """
+        Results against each opponent that was played, in OPPONENTS order
+
+        Returns:
+        - dict: opponent -> {"games", "X", "O", "Draw", "rate"}, rate being
+          the share of games won by X (the human in 1 player mode)
+        """
+        rates = {}
+        for opponent in OPPONENTS:
+            counts = self.by_opponent.get(opponent)
+            if counts:
+                games = sum(counts.values())
+                rates[opponent] = dict(counts, games=games, rate=counts["X"] / games)
+        return rates
+
+    def streaks(self):
+        """
+        Returns:
+        - tuple (current result, current length, best length of each result)
+        """
+        return self.streak_result, self.streak_length, dict(self.best_streaks)
+
+    def first_move_advantage(self):
+        """
+        How much starting helps, mode by mode: moves are logged X first, so
+        the first mover is X. In 1 player mode that is always the human
+        against the AI, only 2 players games compare two humans.
+
+        Returns:
+        - dict: mode -> {"games", "first", "second", "openings"}, the shares
+          of games won by who moved first and second, and first cell ->
+          result counts, most played first (modes without games left out)
+        """
+        advantage = {}
+        for mode in MODES:
+            totals = _counts()
+            for opponent, counts in self.by_opponent.items():
+                if (opponent == "2P") == (mode == "2P"):
+                    for result in RESULTS:
+                        totals[result] += counts[result]
+            games = sum(totals.values())
+            if not games:
+                continue
+            openings = sorted(((int(cell), counts) for cell, counts in self.by_opening.get(mode, {}).items()),
+                              key=lambda item: -sum(item[1].values()))
+            advantage[mode] = {
+                "games": games,
+                "first": totals["X"] / games,
+                "second": totals["O"] / games,
+                "openings": dict(openings),
+            }
+        return advantage
+
+    def daily_histogram(self, days=14, today=None):
+        """
+        Results of each of the last days, oldest first (days without games included)
+
+        Returns:
+        - list of (day "YYYY-MM-DD", result counts)
+        """
+        today = today or date.today()
+        histogram = []
+        for back in range(days - 1, -1, -1):
+            day = (today - timedelta(days=back)).isoformat()
+            histogram.append((day, dict(self.daily.get(day) or _counts())))
+        return histogram
@@ -0,0 +1,302 @@
+"""
+AI players and game-result helpers, independent of pygame
+
+Used by the game window (main.py) and by headless tools such as
+tictactoe.simulate.
+
+Difficulties:
+- easy: random moves
+- medium: 50/50 mix of the rule-based ordinateur and random moves
+- hard: perfect play on 3x3 (solution table or negamax), MCTS on bigger boards
+"""
+import random
+
+from tictactoe.board import Board
+from tictactoe import solver, solution_table
+from tictactoe.mcts import MCTSPlayer
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Set to False to silence the move-by-move commentary (errors are always printed)
+VERBOSE = True
+
+# Precomputed solution table, see load_solutions()
+solutions = None
+
+# Monte Carlo Tree Search player, see configure_mcts()
+mcts_player = MCTSPlayer()
+
+
+def log(message):
+    """
+    Print AI commentary when VERBOSE is on
+    """
+    if VERBOSE:
+        print(message)
+
+
+def load_solutions(path=solution_table.DEFAULT_PATH):
+    """
+    Load the precomputed solution table used by the Hard AI
+
+    Returns:
+    - SolutionTable, or None if the file does not exist
+    """
+    global solutions
+    solutions = solution_table.load(path)
+    return solutions
+
+
+def configure_mcts(iterations=None, time_limit=1.0, workers=0, seed=None):
+    """
+    Replace the MCTS player with one using the given search budget
+
+    Returns:
+    - MCTSPlayer: the new player
+    """
+    global mcts_player
+    mcts_player.close()
+    mcts_player = MCTSPlayer(iterations=iterations, time_limit=time_limit,
+                             workers=workers, seed=seed)
+    return mcts_player
+
+
+def check_winner(board):
+    """
+    Check if there is a winner on the board
+    
+    Parameters:
+    - board: Board object (a list of 9 elements containing "", "X", or "O" is also accepted)
+    
+    Returns:
+    - "X" if X wins
+    - "O" if O wins
+    - "Draw" if board is full and no winner
+    - None if game is still ongoing
+    """
+    if not isinstance(board, Board):
+        board = Board.from_list(board)
+    return board.winner()
+
+
+def ordinateur(board, signe):
+    """
+    AI function that determines where the computer should play
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    - signe: str, the symbol played by AI ("X" or "O")
+    
+    Returns:
+    - int: position where AI wants to play (0 to cells - 1)
+    - False: in case of error
+    
+    Strategy:
+    1. Try to win if possible
+    2. Block opponent from winning
+    3. Take center if available
+    4. Take a corner if available
+    5. Take any remaining spot
+    """
+    # Input validation
+    if not isinstance(board, Board):
+        print("Error: board must be a Board object")
+        return False
+    
+    if signe not in ["X", "O"]:
+        print("Error: signe must be 'X' or 'O'")
+        return False
+    
+    # Determine opponent's sign
+    opponent = "O" if signe == "X" else "X"
+    empty = board.empty
+    
+    # Strategy 1: Try to WIN (uses the board's per-line counters)
+    chosen = board.completing_cell(signe)
+    if chosen is not None:
+        log(f"AI: Winning move at position {chosen}")
+        return chosen
+    
+    # Strategy 2: BLOCK opponent from winning
+    chosen = board.completing_cell(opponent)
+    if chosen is not None:
+        log(f"AI: Blocking opponent at position {chosen}")
+        return chosen
+    
+    # Strategy 3: Take CENTER if available (position 4 on 3x3)
+    center = board.geometry.center
+    if empty >> center & 1:
+        log(f"AI: Taking center (position {center})")
+        return center
+    
+    # Strategy 4: Take a CORNER if available
+    corners = board.geometry.corners
+    available_corners = [pos for pos in corners if empty >> pos & 1]
+    if available_corners:
+        chosen = random.choice(available_corners)
+        log(f"AI: Taking corner at position {chosen}")
+        return chosen
+    
+    # Strategy 5: Take any REMAINING spot
+    available_positions = board.legal_moves()
+    if available_positions:
+        chosen = random.choice(available_positions)
+        log(f"AI: Taking remaining position {chosen}")
+        return chosen
+    
+    # No available positions (should not happen in normal game)
+    print("Error: No available positions on board")
+    return False
+
+
+def ordinateur_easy(board):
+    """
+    Simple AI function that chooses a random available position
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    
+    Returns:
+    - int: position where AI wants to play (0-8)
+    - False: in case of error
+    """
+    # Input validation
+    if not isinstance(board, Board):
+        print("Error: board must be a Board object")
+        return False
+    
+    # Get list of available positions
+    available_positions = board.legal_moves()
+    
+    if available_positions:
+        chosen = random.choice(available_positions)
+        log(f"AI (easy): Choosing random position {chosen}")
+        return chosen
+    
+    # No available positions (should not happen in normal game)
+    print("Error: No available positions on board")
+    return False
+
+
+def ordinateur_medium(board, signe):
+    """
+    Medium difficulty AI that mixes random and strategic moves
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    - signe: str, the symbol played by AI ("X" or "O")
+    
+    Returns:
+    - int: position where AI wants to play (0 to cells - 1)
+    - False: in case of error
+    """
+    # 50% chance to play strategically, 50% random
+    if random.random() < 0.5:
+        return ordinateur(board, signe)
+    else:
+        return ordinateur_easy(board)
+    
+def ordinateur_mcts(board, signe):
+    """
+    AI using Monte Carlo Tree Search, for boards too big to solve
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    - signe: str, the symbol played by AI ("X" or "O")
+    
+    Returns:
+    - int: position where AI wants to play (0 to cells - 1)
+    - False: in case of error
+    
+    Strength grows with MCTS_TIME_LIMIT / MCTS_ITERATIONS. The search tree
+    is kept between turns, so each move starts from the previous analysis.
+    """
+    # Input validation
+    if not isinstance(board, Board):
+        print("Error: board must be a Board object")
+        return False
+    
+    if signe not in ["X", "O"]:
+        print("Error: signe must be 'X' or 'O'")
+        return False
+    
+    chosen = mcts_player.choose(board, signe)
+    if chosen is None:
+        print("Error: No available positions on board")
+        return False
+    
+    log(f"AI: MCTS move at position {chosen} ({mcts_player.last_iterations} iterations)")
+    return chosen
+
+
+def ordinateur_minimax(board, signe):
+    """
+    Perfect-play AI using negamax search with alpha-beta pruning
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    - signe: str, the symbol played by AI ("X" or "O")
+    
+    Returns:
+    - int: position where AI wants to play (0 to cells - 1)
+    - False: in case of error
+    
+    Only the classic 3x3 board can be solved; bigger boards use
+    ordinateur_mcts instead.
+    
+    When the precomputed solution table is available the move is a single
+    table lookup. Otherwise every position is solved once and kept in the
+    solver's transposition table.
+    """
+    # Input validation
+    if not isinstance(board, Board):
+        print("Error: board must be a Board object")
+        return False
+    
+    if signe not in ["X", "O"]:
+        print("Error: signe must be 'X' or 'O'")
+        return False
+    
+    if (board.size, board.k) != (3, 3):
+        return ordinateur_mcts(board, signe)
+    
+    # Fast path: the table stores the best moves for the side to move
+    if solutions and solution_table.side_to_move(board) == signe:
+        outcome, cells = solutions.lookup(board)
+        if cells:
+            chosen = random.choice(cells)
+            log(f"AI: Best move at position {chosen} (table outcome {outcome})")
+            return chosen
+    
+    value, cells = solver.best_moves(board, signe)
+    if not cells:
+        print("Error: No available positions on board")
+        return False
+    
+    chosen = random.choice(cells)
+    log(f"AI: Best move at position {chosen} (value {value})")
+    return chosen
+
+
+def get_ai_move(board, signe, difficulty):
+    """
+    Get AI move based on selected difficulty
+    
+    Parameters:
+    - board: Board object holding the X and O bit masks
+    - signe: str, the symbol played by AI ("X" or "O")
+    - difficulty: str, "easy", "medium", or "hard"
+    
+    Returns:
+    - int: position where AI wants to play (0 to cells - 1)
+    - False: in case of error
+    """
+    if difficulty == "easy":
+        return ordinateur_easy(board)
+    elif difficulty == "medium":
+        return ordinateur_medium(board, signe)
+    elif difficulty == "hard":
+        return ordinateur_minimax(board, signe)
+    else:
+        print("Error: Unknown AI difficulty level")
+        return False
@@ -0,0 +1,194 @@
+"""
+Vectorized AI moves for large batches of 3x3 boards (requires NumPy)
+
+Boards are rows of an integer array of shape (N, 9) using the same coding as
+Board.cells: 0 = empty, 1 = X, 2 = O.
+
+    >>> moves = get_ai_moves(boards, "O", "hard")
+
+The rule-based levels apply exactly the rules of ai.ordinateur (win, block,
+center, random corner, random cell) with mask operations over the whole
+batch. "hard" reads the precomputed solution table for every row at once.
+"""
+import numpy as np
+
+from tictactoe import ai, solver
+from tictactoe.board import Board, FULL_MASK, WIN_LINES
+
+LINES = np.array(WIN_LINES, dtype=np.intp)  # (8, 3)
+CORNERS = np.array([0, 2, 6, 8], dtype=np.intp)
+CENTER = 4
+POWERS_OF_3 = 3 ** np.arange(9, dtype=np.int64)  # Base-3 position code, see solution_table
+CELL_BITS = 1 << np.arange(9, dtype=np.int64)  # Bit of each cell in a Board mask
+SYMBOL_CODES = {"X": 1, "O": 2}
+NO_MOVE = -1
+
+
+def to_array(boards):
+    """
+    Convert a list of Board objects (or lists of "", "X", "O") to an (N, 9) array
+    """
+    rows = []
+    for board in boards:
+        if not isinstance(board, Board):
+            board = Board.from_list(board)
+        rows.append(np.frombuffer(board.cells, dtype=np.uint8))
+    if not rows:
+        return np.zeros((0, 9), dtype=np.uint8)
+    return np.stack(rows)
+
+
+def _check_boards(boards):
+    boards = np.asarray(boards)
+    if boards.ndim == 3:
+        boards = boards.reshape(len(boards), -1)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError(f"boards must have shape (N, 9), got {boards.shape}")
+    if boards.size and (boards.min() < 0 or boards.max() > 2):
+        raise ValueError("board cells must be 0 (empty), 1 (X) or 2 (O)")
+    return boards
+
+
+def _random_pick(available, rng):
+    """
+    For every row pick a random column where available is True
+
+    Returns:
+    - (has_any, column) arrays
+    """
+    weights = rng.random(available.shape) + 1.0  # In [1, 2), so any available beats 0
+    weights[~available] = 0.0
+    return available.any(axis=1), weights.argmax(axis=1)
+
+
+def _completing_cells(boards, code):
+    """
+    For every row, find the free cell of the first line where code owns 2 cells
+
+    Returns:
+    - (found, cell) arrays, following the line order of WIN_LINES
+    """
+    line_values = boards[:, LINES]  # (N, 8, 3)
+    owned = (line_values == code).sum(axis=2)
+    free = (line_values == 0).sum(axis=2)
+    completable = (owned == 2) & (free == 1)  # (N, 8)
+    found = completable.any(axis=1)
+    line_cells = LINES[completable.argmax(axis=1)]  # (N, 3)
+    free_in_line = np.take_along_axis(boards, line_cells, axis=1) == 0
+    cell = line_cells[np.arange(len(boards)), free_in_line.argmax(axis=1)]
+    return found, cell
+
+
+def ordinateur_batch(boards, signe, rng=None):
+    """
+    Vectorized version of ai.ordinateur
+
+    Parameters:
+    - boards: integer array of shape (N, 9)
+    - signe: str, the symbol played by AI ("X" or "O")
+    - rng: numpy Generator for the random corner/cell choices
+
+    Returns:
+    - int array of shape (N,): chosen cell per board, NO_MOVE (-1) if full
+    """
+    boards = _check_boards(boards)
+    rng = rng if rng is not None else np.random.default_rng()
+    own = SYMBOL_CODES[signe]
+    opponent = 3 - own
+
+    moves = np.full(len(boards), NO_MOVE, dtype=np.int64)
+    pending = np.ones(len(boards), dtype=bool)
+
+    def settle(mask, cells):
+        take = pending & mask
+        moves[take] = cells[take] if np.ndim(cells) else cells
+        pending[take] = False
+
+    empty = boards == 0
+
+    # Strategy 1: Try to WIN
+    settle(*_completing_cells(boards, own))
+    # Strategy 2: BLOCK opponent from winning
+    settle(*_completing_cells(boards, opponent))
+    # Strategy 3: Take CENTER if available
+    settle(empty[:, CENTER], CENTER)
+    # Strategy 4: Take a random CORNER if available
+    has_corner, corner = _random_pick(empty[:, CORNERS], rng)
+    settle(has_corner, CORNERS[corner])
+    # Strategy 5: Take any REMAINING spot
+    settle(*_random_pick(empty, rng))
+    return moves
+
+
+def random_batch(boards, rng=None):
+    """
+    Vectorized version of ai.ordinateur_easy
+    """
+    boards = _check_boards(boards)
+    rng = rng if rng is not None else np.random.default_rng()
+    has_move, cell = _random_pick(boards == 0, rng)
+    return np.where(has_move, cell, NO_MOVE)
+
+
+def solution_batch(boards, signe, rng=None):
+    """
+    Vectorized perfect play, using the solution table loaded by ai.load_solutions()
+
+    Rows the table cannot answer (solution table missing, or signe is not
+    the side to move for that position) are solved one by one with the
+    negamax solver, like the scalar Hard AI does.
+    """
+    boards = _check_boards(boards)
+    rng = rng if rng is not None else np.random.default_rng()
+    moves = np.full(len(boards), NO_MOVE, dtype=np.int64)
+    pending = (boards == 0).any(axis=1)
+
+    if ai.solutions is not None:
+        codes = boards.astype(np.int64) @ POWERS_OF_3
+        with ai.solutions.raw_entries() as table:
+            # Indexing copies the entries: no array is left pointing into the
+            # mmap, so SolutionTable.close() still works
+            entries = np.frombuffer(table, dtype="<u2")[codes]
+        x_count = (boards == 1).sum(axis=1)
+        o_count = (boards == 2).sum(axis=1)
+        to_move = np.where(x_count == o_count, 1, np.where(x_count == o_count + 1, 2, 0))
+        usable = pending & (to_move == SYMBOL_CODES[signe]) & (entries & FULL_MASK != 0)
+        best = (entries[:, None].astype(np.int64) & CELL_BITS) != 0  # (N, 9)
+        _, cell = _random_pick(best, rng)
+        moves[usable] = cell[usable]
+        pending &= ~usable
+
+    for row in np.flatnonzero(pending):
+        x = int((boards[row] == 1) @ CELL_BITS)
+        o = int((boards[row] == 2) @ CELL_BITS)
+        _, cells = solver.best_moves(Board(x, o), signe)
+        if cells:
+            moves[row] = cells[rng.integers(len(cells))]
+    return moves
+
+
+def get_ai_moves(boards, signe, difficulty, rng=None):
+    """
+    Batch version of ai.get_ai_move for 3x3 boards
+
+    Parameters:
+    - boards: integer array of shape (N, 9), 0 = empty, 1 = X, 2 = O
+    - signe: str, the symbol played by AI ("X" or "O")
+    - difficulty: str, "easy", "medium", or "hard"
+    - rng: numpy Generator (a new one is created if omitted)
+
+    Returns:
+    - int array of shape (N,): chosen cell per board, NO_MOVE (-1) if the board is full
+    """
+    if signe not in SYMBOL_CODES:
+        raise ValueError("signe must be 'X' or 'O'")
+    rng = rng if rng is not None else np.random.default_rng()
+    if difficulty == "easy":
+        return random_batch(boards, rng)
+    if difficulty == "medium":
+        # 50% chance to play strategically, 50% random, drawn per board
+        strategic = rng.random(len(boards)) < 0.5
+        return np.where(strategic, ordinateur_batch(boards, signe, rng), random_batch(boards, rng))
+    if difficulty == "hard":
+        return solution_batch(boards, signe, rng)
+    raise ValueError(f"Unknown AI difficulty level {difficulty!r}")
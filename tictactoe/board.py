@@ -0,0 +1,341 @@
+"""
+Compact bitboard engine for N x N Tic Tac Toe with k-in-a-row
+
+The position is stored as two integers used as bit masks, one for X and one
+for O. Bit i is set when the player owns cell i, cells being numbered row by
+row (3x3 shown):
+
+0 | 1 | 2
+---------
+3 | 4 | 5
+---------
+6 | 7 | 8
+
+Win and draw detection are incremental: the board keeps, for each winning
+line and each player, how many cells of the line the player owns, plus a
+count of filled cells. A move only touches the counters of the lines through
+the cell just played, and reading the result is O(1).
+"""
+import math
+from functools import lru_cache
+
+# Classic 3x3 board, used by the solver, symmetry code and solution table
+CELL_COUNT = 9
+FULL_MASK = (1 << CELL_COUNT) - 1  # 0b111111111, every cell occupied
+
+
+class Geometry:
+    """
+    Winning lines of an N x N board with k-in-a-row, shared by all boards
+    of the same shape (see get_geometry)
+    """
+
+    def __init__(self, size, k):
+        if size < 1 or not 1 <= k <= size:
+            raise ValueError(f"Invalid board shape: size={size}, k={k}")
+        self.size = size
+        self.k = k
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+
+        # Every window of k aligned cells: rows, then columns, then both diagonals
+        lines = []
+        directions = (
+            (0, 1),   # Horizontal
+            (1, 0),   # Vertical
+            (1, 1),   # Diagonal top-left to bottom-right
+            (1, -1),  # Diagonal top-right to bottom-left
+        )
+        for d_row, d_col in directions:
+            for row in range(size):
+                for col in range(size):
+                    end_row = row + d_row * (k - 1)
+                    end_col = col + d_col * (k - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        lines.append(tuple((row + d_row * i) * size + col + d_col * i
+                                           for i in range(k)))
+        self.lines = tuple(lines)
+        self.line_masks = tuple(sum(1 << cell for cell in line) for line in self.lines)
+
+        # lines_through[cell] = indices of the lines containing cell
+        through = [[] for _ in range(self.cell_count)]
+        for index, line in enumerate(self.lines):
+            for cell in line:
+                through[cell].append(index)
+        self.lines_through = tuple(tuple(indices) for indices in through)
+
+        middle = size // 2
+        self.center = middle * size + middle
+        self.corners = tuple(sorted({0, size - 1, size * (size - 1), self.cell_count - 1}))
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size=3, k=3):
+    return Geometry(size, k)
+
+
+CLASSIC = get_geometry(3, 3)
+
+# All possible winning combinations on the 3x3 board:
+# top, middle, bottom rows, left, middle, right columns, then both diagonals
+WIN_LINES = CLASSIC.lines
+WIN_MASKS = CLASSIC.line_masks
+
+# Lookup tables indexed by a 9-bit mask (512 entries each), built once at import
+# HAS_WIN[mask] is True when the mask contains a complete line
+HAS_WIN = tuple(any(mask & win == win for win in WIN_MASKS) for mask in range(FULL_MASK + 1))
+# FREE_CELLS[occupied] lists the empty cells for an occupied mask, in index order
+FREE_CELLS = tuple(
+    tuple(cell for cell in range(CELL_COUNT) if not occupied >> cell & 1)
+    for occupied in range(FULL_MASK + 1)
+)
+# SET_CELLS[mask] lists the cells whose bit is set
+SET_CELLS = tuple(
+    tuple(cell for cell in range(CELL_COUNT) if mask >> cell & 1)
+    for mask in range(FULL_MASK + 1)
+)
+
+
+# Symbol for each value of Board.cells
+SYMBOLS = ("", "X", "O")
+
+
+def _bits(mask):
+    """
+    Return the indices of the set bits of a mask, in increasing order
+    """
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(cells)
+
+
+class Board:
+    """
+    Tic Tac Toe position stored as two bit masks (x, o)
+
+    Alongside the masks the board keeps:
+    - cells: bytearray with 0 (empty), 1 (X) or 2 (O) for every cell
+    - x_counts / o_counts: bytearray with, for every line, the number of its
+      cells owned by X / O
+    - x_lines / o_lines: number of completed lines for X / O
+    - filled: number of occupied cells
+
+    Indexing a board (board[i]) returns "X", "O" or "" like the old
+    list-of-strings board, so display code can keep reading cells directly.
+    """
+    __slots__ = ("x", "o", "geometry", "cells", "x_counts", "o_counts",
+                 "x_lines", "o_lines", "filled")
+
+    def __init__(self, x=0, o=0, size=3, k=3):
+        geometry = get_geometry(size, k)
+        self.geometry = geometry
+        self.x = 0  # Bit mask of cells owned by X
+        self.o = 0  # Bit mask of cells owned by O
+        self.cells = bytearray(geometry.cell_count)
+        self.x_counts = bytearray(len(geometry.lines))
+        self.o_counts = bytearray(len(geometry.lines))
+        self.x_lines = 0
+        self.o_lines = 0
+        self.filled = 0
+        for cell in _bits(x):
+            self.move(cell, "X")
+        for cell in _bits(o):
+            self.move(cell, "O")
+
+    @classmethod
+    def from_list(cls, cells, k=None):
+        """
+        Build a board from a list of N*N elements containing "", "X", or "O"
+
+        k defaults to N (a full row wins)
+        """
+        size = math.isqrt(len(cells))
+        if size * size != len(cells):
+            raise ValueError(f"A board needs a square number of cells, got {len(cells)}")
+        x = o = 0
+        for i, value in enumerate(cells):
+            if value == "X":
+                x |= 1 << i
+            elif value == "O":
+                o |= 1 << i
+        return cls(x, o, size, k or size)
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    @property
+    def k(self):
+        return self.geometry.k
+
+    def to_list(self):
+        """
+        Return the board as a list of N*N elements containing "", "X", or "O"
+        """
+        return [SYMBOLS[value] for value in self.cells]
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.x = self.x
+        board.o = self.o
+        board.geometry = self.geometry
+        board.cells = self.cells[:]
+        board.x_counts = self.x_counts[:]
+        board.o_counts = self.o_counts[:]
+        board.x_lines = self.x_lines
+        board.o_lines = self.o_lines
+        board.filled = self.filled
+        return board
+
+    def masks(self, signe):
+        """
+        Return (own_mask, opponent_mask) from the point of view of signe
+        """
+        if signe == "X":
+            return self.x, self.o
+        return self.o, self.x
+
+    @property
+    def occupied(self):
+        return self.x | self.o
+
+    @property
+    def empty(self):
+        return ~(self.x | self.o) & self.geometry.full_mask
+
+    def is_empty(self, cell):
+        """
+        Check if a cell is free (and inside the board)
+        """
+        return 0 <= cell < self.geometry.cell_count and not self.cells[cell]
+
+    def is_full(self):
+        return self.filled == self.geometry.cell_count
+
+    def move(self, cell, signe):
+        """
+        Place signe ("X" or "O") on an empty cell and update the line counters
+        """
+        if self.cells[cell]:
+            raise ValueError(f"Cell {cell} is already occupied")
+        k = self.geometry.k
+        if signe == "X":
+            self.cells[cell] = 1
+            self.x |= 1 << cell
+            counts = self.x_counts
+            for line in self.geometry.lines_through[cell]:
+                counts[line] += 1
+                if counts[line] == k:
+                    self.x_lines += 1
+        elif signe == "O":
+            self.cells[cell] = 2
+            self.o |= 1 << cell
+            counts = self.o_counts
+            for line in self.geometry.lines_through[cell]:
+                counts[line] += 1
+                if counts[line] == k:
+                    self.o_lines += 1
+        else:
+            raise ValueError(f"Unknown symbol {signe!r}")
+        self.filled += 1
+
+    def undo(self, cell):
+        """
+        Clear a cell, whichever player owns it
+        """
+        value = self.cells[cell]
+        if not value:
+            return
+        k = self.geometry.k
+        self.cells[cell] = 0
+        if value == 1:
+            self.x &= ~(1 << cell)
+            counts = self.x_counts
+            for line in self.geometry.lines_through[cell]:
+                if counts[line] == k:
+                    self.x_lines -= 1
+                counts[line] -= 1
+        else:
+            self.o &= ~(1 << cell)
+            counts = self.o_counts
+            for line in self.geometry.lines_through[cell]:
+                if counts[line] == k:
+                    self.o_lines -= 1
+                counts[line] -= 1
+        self.filled -= 1
+
+    def legal_moves(self):
+        """
+        Return a tuple of the empty cells, in index order
+        """
+        if self.geometry is CLASSIC:
+            return FREE_CELLS[self.x | self.o]
+        return _bits(self.empty)
+
+    def occupied_cells(self):
+        """
+        Return a tuple of the occupied cells, in index order
+        """
+        if self.geometry is CLASSIC:
+            return SET_CELLS[self.x | self.o]
+        return _bits(self.x | self.o)
+
+    def completing_cell(self, signe):
+        """
+        Find a free cell that completes a line for signe
+
+        Returns:
+        - int: the free cell of the first line (in geometry order) where signe
+          owns k - 1 cells and the opponent none
+        - None: if no line can be completed
+        """
+        own_counts, opp_counts = (
+            (self.x_counts, self.o_counts) if signe == "X" else (self.o_counts, self.x_counts)
+        )
+        target = self.geometry.k - 1
+        cells = self.cells
+        for index, count in enumerate(own_counts):
+            if count == target and not opp_counts[index]:
+                for cell in self.geometry.lines[index]:
+                    if not cells[cell]:
+                        return cell
+        return None
+
+    def winner(self):
+        """
+        Returns:
+        - "X" if X wins
+        - "O" if O wins
+        - "Draw" if board is full and no winner
+        - None if game is still ongoing
+        """
+        if self.x_lines:
+            return "X"
+        if self.o_lines:
+            return "O"
+        if self.filled == self.geometry.cell_count:
+            return "Draw"
+        return None
+
+    def __getitem__(self, cell):
+        return SYMBOLS[self.cells[cell]]
+
+    def __iter__(self):
+        return (SYMBOLS[value] for value in self.cells)
+
+    def __len__(self):
+        return self.geometry.cell_count
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.x == other.x and self.o == other.o and self.geometry is other.geometry
+
+    def __hash__(self):
+        return hash((self.x, self.o, self.geometry.size, self.geometry.k))
+
+    def __repr__(self):
+        return str(self.to_list())
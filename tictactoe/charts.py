@@ -0,0 +1,178 @@
+"""
+Pie charts with a legend, rendered once per data set
+
+Drawing a pie builds a polygon with one point per degree of every slice,
+which is too much work to repeat every frame for numbers that only change
+when a game ends. A PieChart renders the pie and its legend to a surface and
+keeps it until the data changes:
+
+    chart = PieChart(80, text_cache, colors)
+    chart.draw(screen, (440, 280), [Slice("Belgium", 12, RED), Slice("France", 7, BLUE)])
+
+Any number of slices works, so the same component can show per-difficulty
+breakdowns as well as the overall results. Sizes are given for a 600x600
+window; on a bigger one, pass its scale so the chart is rendered at full
+resolution rather than stretched.
+"""
+import math
+from collections import namedtuple
+
+import pygame
+
+# One slice of a chart. Slices with always_listed=False only get a legend
+# entry when their value is not zero.
+Slice = namedtuple("Slice", "label value color always_listed", defaults=(True,))
+
+# Colors of everything that is not a slice
+ChartColors = namedtuple("ChartColors", "border text empty note")
+
+
+def draw_pie_slice(surface, center_x, center_y, radius, start_angle, end_angle, color):
+    """
+    Draw a single slice of a pie chart
+
+    Parameters:
+    - surface: pygame.Surface to draw on
+    - center_x, center_y: Center of the pie
+    - radius: Radius of the pie
+    - start_angle, end_angle: Angles in degrees
+    - color: RGB color tuple
+    """
+    # Convert angles to radians
+    start_rad = math.radians(start_angle)
+    end_rad = math.radians(end_angle)
+
+    # Create points for the polygon
+    points = [(center_x, center_y)]
+
+    # Number of segments for smooth curve
+    num_segments = max(2, int(abs(end_angle - start_angle)))
+
+    for i in range(num_segments + 1):
+        angle = start_rad + (end_rad - start_rad) * i / num_segments
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        points.append((x, y))
+
+    # Draw filled polygon
+    if len(points) >= 3:
+        pygame.draw.polygon(surface, color, points)
+
+
+class PieChart:
+    """
+    Pie chart and legend, cached until the slices change
+    """
+
+    def __init__(self, radius, text_cache, colors, legend_offset=(-70, 105), legend_spacing=30,
+                 legend_font_size=28, note_font_size=32, scale=1.0):
+        """
+        Parameters:
+        - radius: int, radius of the pie
+        - text_cache: TextCache used for the labels
+        - colors: ChartColors (border, legend text, empty pie, "No games" note)
+        - legend_offset: (x, y) of the first legend entry, from the pie center
+        - legend_spacing: pixels between legend entries
+        - scale: window scale, every size above is multiplied by it
+        """
+        self.scale = scale
+        self.radius = self.px(radius)
+        self.text_cache = text_cache
+        self.colors = colors
+        self.legend_offset = (self.px(legend_offset[0]), self.px(legend_offset[1]))
+        self.legend_spacing = self.px(legend_spacing)
+        self.legend_font_size = self.px(legend_font_size)
+        self.note_font_size = self.px(note_font_size)
+
+        self.renders = 0  # Handy to check the chart is not redrawn every frame
+        self._key = None
+        self._surface = None
+        self._origin = (0, 0)  # Pie center, in the cached surface
+
+    def px(self, length):
+        """
+        Pixel size of a length given for an unscaled window
+        """
+        return round(length * self.scale)
+
+    def draw(self, target, center, slices):
+        """
+        Blit the chart centered on center, rendering it first if the slices changed
+        """
+        surface, origin = self.render(slices)
+        target.blit(surface, (center[0] - origin[0], center[1] - origin[1]))
+
+    def render(self, slices):
+        """
+        Return the chart surface for these slices (from the cache when possible)
+
+        Returns:
+        - tuple (surface, origin): origin is where the pie center is on the surface
+        """
+        key = tuple(Slice(*item) for item in slices)
+        if key != self._key:
+            self._surface, self._origin = self._render(key)
+            self._key = key
+            self.renders += 1
+        return self._surface, self._origin
+
+    def legend_entries(self, slices):
+        return [item for item in slices if item.always_listed or item.value > 0]
+
+    def _render(self, slices):
+        legend = self.legend_entries(slices)
+        legend_x = self.legend_offset[0]
+        legend_y = self.legend_offset[1]
+
+        # Big enough for the pie and any legend, trimmed once drawn
+        label_width = max([self.text_cache.render(item.label, self.legend_font_size, self.colors.text).get_width()
+                           for item in legend] or [0])
+        half_width = max(self.radius, abs(legend_x) + self.px(15) + label_width) + self.px(4)
+        half_height = max(self.radius, abs(legend_y) + len(legend) * self.legend_spacing) + self.px(4)
+        canvas = pygame.Surface((2 * half_width, 2 * half_height), pygame.SRCALPHA)
+        canvas.fill((0, 0, 0, 0))
+        center_x, center_y = half_width, half_height
+
+        self._draw_pie(canvas, center_x, center_y, slices)
+
+        # Legend (vertical layout)
+        x = center_x + legend_x
+        y = center_y + legend_y
+        for item in legend:
+            pygame.draw.circle(canvas, item.color, (x, y), self.px(8))
+            legend_text = self.text_cache.render(item.label, self.legend_font_size, self.colors.text)
+            canvas.blit(legend_text, (x + self.px(15), y - self.px(10)))
+            y += self.legend_spacing
+
+        bounds = canvas.get_bounding_rect()
+        surface = canvas.subsurface(bounds).copy()
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface, (center_x - bounds.x, center_y - bounds.y)
+
+    def _draw_pie(self, surface, center_x, center_y, slices):
+        radius = self.radius
+        total = sum(item.value for item in slices)
+
+        if total == 0:
+            # Draw empty circle if no games played
+            pygame.draw.circle(surface, self.colors.empty, (center_x, center_y), radius)
+            pygame.draw.circle(surface, self.colors.border, (center_x, center_y), radius, self.px(3)) # Border
+
+            # "No data" text
+            no_data_text1 = self.text_cache.render("No", self.note_font_size, self.colors.note)
+            no_data_text2 = self.text_cache.render("games", self.note_font_size, self.colors.note)
+            surface.blit(no_data_text1, no_data_text1.get_rect(center=(center_x, center_y - self.px(12))))
+            surface.blit(no_data_text2, no_data_text2.get_rect(center=(center_x, center_y + self.px(12))))
+            return
+
+        # Slices in order, starting at top and going clockwise
+        start_angle = -90
+        for item in slices:
+            if item.value > 0:
+                end_angle = start_angle + item.value / total * 360
+                draw_pie_slice(surface, center_x, center_y, radius, start_angle, end_angle, item.color)
+                start_angle = end_angle
+
+        # Draw border
+        pygame.draw.circle(surface, self.colors.border, (center_x, center_y), radius, self.px(3))
@@ -0,0 +1,97 @@
+"""
+Cached layers for the pygame screens
+
+Most of what a screen shows never changes from one frame to the next: the
+background, titles, panels and labels. Those parts are drawn once into a
+"static layer" surface and simply blitted afterwards. Each layer is stored
+with a key describing its inputs (stats values, palette, winner...), and is
+only rebuilt when the key changes:
+
+    compositor.draw(screen, "menu", key, build_menu_layer)
+
+The dynamic parts (animated buttons, sliders, symbols, fireworks) are still
+drawn every frame on top of the layers.
+"""
+import pygame
+
+
+class Compositor:
+    """
+    Static layers, built on demand and cached until their inputs change
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.layers = {}  # name -> (key, surface, offset)
+
+        # Counter, handy to check that layers are not rebuilt every frame
+        self.builds = 0
+
+    def layer(self, name, key, build, size=None, opaque=False, trim=False):
+        """
+        Return the cached layer, building it first if its key changed
+
+        Parameters:
+        - name: str, identifies the layer
+        - key: hashable, everything the layer depends on
+        - build: function drawing the layer onto the surface it receives
+        - size: tuple (width, height) of the layer (default: window size)
+        - opaque: True if the layer covers its whole area (faster to blit)
+        - trim: crop a transparent layer to its visible pixels
+
+        Returns:
+        - tuple (surface, offset): offset is where the layer's top-left
+          corner goes, relative to the position it is drawn at
+        """
+        cached = self.layers.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        size = size or self.size
+        if opaque:
+            surface = pygame.Surface(size)
+        else:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 0))
+        build(surface)
+
+        offset = (0, 0)
+        if trim and not opaque:
+            bounds = surface.get_bounding_rect()
+            surface = surface.subsurface(bounds).copy()
+            offset = bounds.topleft
+
+        # Match the display format so blits do not convert pixels every frame
+        if pygame.display.get_surface() is not None:
+            alpha = surface.get_alpha()
+            surface = surface.convert() if opaque else surface.convert_alpha()
+            if opaque and alpha is not None:
+                surface.set_alpha(alpha)
+
+        self.layers[name] = (key, surface, offset)
+        self.builds += 1
+        return surface, offset
+
+    def draw(self, target, name, key, build, pos=(0, 0), **options):
+        """
+        Blit a layer onto target, building it first if needed (options as in layer())
+        """
+        surface, offset = self.layer(name, key, build, **options)
+        target.blit(surface, (pos[0] + offset[0], pos[1] + offset[1]))
+
+    def resize(self, size):
+        """
+        Change the default layer size (the window was resized); every layer
+        is rebuilt on next use
+        """
+        self.size = size
+        self.invalidate()
+
+    def invalidate(self, name=None):
+        """
+        Drop one layer (or all of them) so it is rebuilt on next use
+        """
+        if name is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(name, None)
@@ -0,0 +1,353 @@
+"""
+Append-only log of played games, with periodic snapshots of the counters
+
+No pygame needed. Every finished game is appended to the game log as one
+JSON line, and nothing already written is ever rewritten:
+
+    {"type": "game", "time": "2025-12-05 16:30:01", "started": "2025-12-05 16:29:40",
+     "mode": "1P", "difficulty": "hard", "size": 3, "k": 3, "moves": [4, 0, 8], "result": "X"}
+    {"type": "reset", "time": "2025-12-06 10:00:00"}
+
+The counters of the statistics screen (wins, draws, total, last played) are
+derived from the log. Replaying the whole log at every start would get
+slower as the history grows, so every SNAPSHOT_INTERVAL records the counters
+are saved to stats.json together with the log size they cover
+("log_offset"). Loading reads the snapshot and replays only the records
+written after it:
+
+    log = GameLog()
+    stats = log.load()
+    log.append(game_record([4, 0, 8, 2, 6], "X", "1P", "hard"))
+
+Appending a game is one short write, whatever the size of the history. A
+crash can at worst leave a truncated last line, which is dropped the next
+time the log is loaded. Snapshots are written to a temporary file and
+renamed, so stats.json is always either the old or the new one.
+
+Given a BackgroundWriter (tictactoe.writer), the log hands its writes to a
+background thread instead, and append() returns without touching the disk.
+
+Given a StatsEngine (tictactoe.aggregates), the log feeds it every record
+like the counters, and its state is saved in the snapshot too
+("aggregates"). A snapshot without it (older stats.json) makes the engine
+rebuild once from the whole log.
+"""
+import json
+import os
+from datetime import datetime
+
+LOG_PATH = "games.jsonl"
+SNAPSHOT_PATH = "stats.json"
+SEED_PATH = os.path.join("assets", "data", "stats_seed.json")  # Shipped counters, used until stats.json exists
+SNAPSHOT_INTERVAL = 20  # Records appended between two snapshots
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def empty_stats():
+    """
+    Counters before any game
+    """
+    return {
+        'belgium_wins': 0,      # X wins
+        'france_wins': 0,       # O wins
+        'draws': 0,
+        'total_games': 0,
+        'last_played': None
+    }
+
+
+def game_record(moves, result, mode, difficulty=None, size=3, k=3, started=None, finished=None):
+    """
+    Build the log record of a finished game
+
+    Parameters:
+    - moves: list of cells in the order they were played (X first)
+    - result: "X", "O" or "Draw"
+    - mode: "1P" or "2P"
+    - difficulty: AI difficulty in 1 player mode (None in 2 players mode)
+    - size, k: board shape
+    - started, finished: datetime of the first move and of the end (default: now)
+    """
+    finished = finished or datetime.now()
+    return {
+        "type": "game",
+        "time": finished.strftime(TIME_FORMAT),
+        "started": (started or finished).strftime(TIME_FORMAT),
+        "mode": mode,
+        "difficulty": difficulty,
+        "size": size,
+        "k": k,
+        "moves": list(moves),
+        "result": result,
+    }
+
+
+def load_seed(path=SEED_PATH):
+    """
+    Counters shipped with the game (games played before the log existed)
+
+    Returns:
+    - dict: the counters, zero if the seed file is missing or unreadable
+    """
+    stats = empty_stats()
+    try:
+        with open(path, "r") as f:
+            seed = json.load(f)
+    except FileNotFoundError:
+        return stats
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Error loading stats seed: {e}")
+        return stats
+    stats.update((key, seed[key]) for key in stats if key in seed)
+    return stats
+
+
+def reset_record():
+    """
+    Log record clearing the counters (previous games stay in the log)
+    """
+    return {"type": "reset", "time": datetime.now().strftime(TIME_FORMAT)}
+
+
+def apply_record(stats, record):
+    """
+    Update the counters with one log record
+    """
+    if record.get("type") == "reset":
+        stats.clear()
+        stats.update(empty_stats())
+        return
+
+    result = record["result"]
+    if result == "X":
+        stats['belgium_wins'] += 1
+    elif result == "O":
+        stats['france_wins'] += 1
+    elif result == "Draw":
+        stats['draws'] += 1
+
+    stats['total_games'] += 1
+    stats['last_played'] = record["time"]
+
+
+def encode_record(record):
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def read_records(path, offset=0):
+    """
+    Read the records of a log file from a byte offset
+
+    A last line without its newline is a write interrupted by a crash: it is
+    not returned, and end_offset stops before it.
+
+    Returns:
+    - tuple (records, end_offset)
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], offset
+
+    records = []
+    end = data.rfind(b"\n") + 1  # Everything after the last newline is incomplete
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            print(f"⚠️ Skipping unreadable game log line: {line[:60]!r}")
+    return records, offset + end
+
+
+def append_file(path, data):
+    """
+    Append bytes to a file and fsync it. On failure the file is cut back to
+    its previous size, so a retry does not leave half a record behind.
+    """
+    with open(path, "ab") as f:
+        size = f.tell()
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except OSError:
+            try:
+                f.truncate(size)
+            except OSError:
+                pass
+            raise
+
+
+def write_atomic(path, data):
+    """
+    Replace a file's content in one step: write a temporary file, then rename it
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class GameLog:
+    """
+    Game log file plus the snapshot of the counters it produces
+    """
+
+    def __init__(self, path=LOG_PATH, snapshot_path=SNAPSHOT_PATH, snapshot_interval=SNAPSHOT_INTERVAL,
+                 writer=None, engine=None, seed_path=SEED_PATH):
+        """
+        Parameters:
+        - path: game log file
+        - snapshot_path: counters snapshot file
+        - seed_path: counters to start from when there is no snapshot yet (None: zero)
+        - snapshot_interval: records appended between two snapshots
+        - writer: BackgroundWriter doing the writes (None: write right away)
+        - engine: StatsEngine kept up to date with the log (None: counters only)
+        """
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.writer = writer
+        self.engine = engine
+        self.seed_path = seed_path
+
+        self.stats = empty_stats()
+        self.offset = 0  # Size of the log covered by self.stats
+        self.since_snapshot = 0  # Records appended after the last snapshot
+
+    def load(self):
+        """
+        Read the counters: snapshot, then the log records written after it
+
+        Returns:
+        - dict: the counters (self.stats, updated by append and reset)
+        """
+        snapshot_offset, aggregates = self._load_snapshot()
+        log_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+        if snapshot_offset > log_size:
+            # The log was replaced or cut: the snapshot is all that is left
+            print("⚠️ Game log is shorter than the stats snapshot, keeping the snapshot")
+            if self.engine is not None and not self.engine.load_state(aggregates):
+                self.engine.rebuild(read_records(self.path)[0])
+            self.offset = log_size
+            self.snapshot()
+            return self.stats
+
+        records, end = read_records(self.path, snapshot_offset)
+        for record in records:
+            apply_record(self.stats, record)
+        rebuilt = False
+        if self.engine is not None:
+            if self.engine.load_state(aggregates):
+                for record in records:
+                    self.engine.apply(record)
+            else:
+                # No saved aggregates yet: replay the whole log, once
+                self.engine.rebuild(read_records(self.path)[0])
+                rebuilt = True
+        if end < log_size:
+            # Drop the half-written last line so new records start on a line of their own
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+            print("⚠️ Dropped an incomplete record at the end of the game log")
+
+        self.offset = end
+        self.since_snapshot = len(records)
+        if rebuilt or self.since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+        return self.stats
+
+    def _load_snapshot(self):
+        """
+        Read stats.json into self.stats (the seed counters if there is none yet)
+
+        Returns:
+        - tuple (log offset the snapshot covers, saved StatsEngine state or
+          None). The offset is 0 for stats.json files written before the log
+          existed, their counters are kept as a starting point.
+        """
+        self.stats = empty_stats()
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            if self.seed_path:
+                self.stats = load_seed(self.seed_path)
+            print(f"📊 No stats file found, starting from {self.stats['total_games']} shipped games")
+            return 0, None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Error loading stats: {e}")
+            return 0, None
+
+        offset = snapshot.pop("log_offset", 0)
+        aggregates = snapshot.pop("aggregates", None)
+        self.stats.update(snapshot)
+        return offset, aggregates
+
+    def append(self, record):
+        """
+        Add a record at the end of the log and update the counters
+
+        The counters are updated first, so they stay right for this session
+        even if the write fails.
+        """
+        apply_record(self.stats, record)
+        if self.engine is not None:
+            self.engine.apply(record)
+        data = encode_record(record)
+        if self.writer is not None:
+            self.writer.append(self.path, data)
+        else:
+            append_file(self.path, data)
+        self.offset += len(data)
+
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def reset(self):
+        """
+        Clear the counters (a reset record is appended, the games stay in the log)
+
+        Returns:
+        - dict: the counters
+        """
+        self.append(reset_record())
+        self.snapshot()
+        return self.stats
+
+    def snapshot(self):
+        """
+        Save the counters and the log offset they cover to stats.json
+        """
+        snapshot = dict(self.stats, log_offset=self.offset)
+        if self.engine is not None:
+            snapshot["aggregates"] = self.engine.state()
+        data = json.dumps(snapshot, indent=4).encode("utf-8")
+        if self.writer is not None:
+            self.writer.replace(self.snapshot_path, data)
+        else:
+            write_atomic(self.snapshot_path, data)
+        self.since_snapshot = 0
+
+    def records(self):
+        """
+        Every record of the log, oldest first (pending writes are flushed first)
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        return read_records(self.path)[0]
+
+    def close(self):
+        """
+        Write everything still pending (call at exit)
+        """
+        if self.writer is not None:
+            self.writer.close()
@@ -0,0 +1,131 @@
+"""
+Resolution-independent layout for the pygame screens
+
+Every screen is designed for a 600x600 window ("design units"). A Layout
+maps design units to window pixels for the current window size: the design
+square is scaled uniformly to fit the window and centered in it, so the game
+keeps its proportions at any size or HiDPI scale.
+
+Drawing code asks the layout for pixel positions, sizes and rectangles, and
+hit-testing uses the same rectangles, so clicks always match what is drawn:
+
+    layout = Layout((600, 600), screen.get_size())
+    button = layout.rect(150, 300, 300, 70)      # pygame.Rect in window pixels
+    font_size = layout.size(50)
+    x, y = layout.to_design(mouse_pos)            # back to design units
+    board = layout.region(80, 72, 440, 440)       # whole design in a smaller square
+
+Nothing is scaled at draw time: when the window size changes, the game
+re-renders its cached surfaces (backgrounds, text, images) once at the new
+size (see apply_layout in main.py).
+"""
+import ctypes
+import math
+import sys
+
+import pygame
+
+REFERENCE_DESKTOP_HEIGHT = 1080  # Desktop height the 600x600 design was made for
+
+
+def enable_dpi_awareness():
+    """
+    Ask Windows for real pixels, instead of letting it stretch the window
+    (which looks blurry on 4K screens). Does nothing on other systems.
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)  # Windows 8.1 and later
+    except (AttributeError, OSError):
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()  # Older Windows
+        except (AttributeError, OSError):
+            pass
+
+
+def desktop_scale(step=0.25):
+    """
+    UI scale suited to the desktop resolution: 1.0 up to 1080p, 2.0 on a 4K
+    screen, rounded down to a multiple of step
+
+    Must be called after pygame.init()
+    """
+    sizes = pygame.display.get_desktop_sizes()
+    if not sizes:
+        return 1.0
+    height = sizes[0][1]
+    return max(1.0, math.floor(height / REFERENCE_DESKTOP_HEIGHT / step) * step)
+
+
+class Layout:
+    """
+    Conversion between design units and window pixels
+    """
+
+    def __init__(self, design_size, window_size=None):
+        """
+        Parameters:
+        - design_size: (width, height) the screens are designed for
+        - window_size: (width, height) of the window in pixels (default: design_size)
+        """
+        self.design_size = tuple(design_size)
+        self.resize(window_size or design_size)
+
+    def resize(self, window_size):
+        """
+        Fit the design in a window of a new size
+        """
+        width, height = max(1, window_size[0]), max(1, window_size[1])  # A minimized window can be 0x0
+        design_width, design_height = self.design_size
+        self.window_size = (width, height)
+        self.scale = min(width / design_width, height / design_height)
+        # Center the design, the margins show the background
+        self.offset = ((width - round(design_width * self.scale)) // 2,
+                       (height - round(design_height * self.scale)) // 2)
+
+    def x(self, x):
+        return self.offset[0] + round(x * self.scale)
+
+    def y(self, y):
+        return self.offset[1] + round(y * self.scale)
+
+    def point(self, x, y):
+        """
+        Window position of a design point
+        """
+        return self.x(x), self.y(y)
+
+    def size(self, length):
+        """
+        Pixel length of a design length (line width, radius, font size...), at least 1
+        """
+        return max(1, round(length * self.scale))
+
+    def rect(self, x, y, width, height):
+        """
+        Window rectangle of a design rectangle
+
+        Edges are converted rather than the size, so rectangles that touch in
+        design units (e.g. board cells) still touch in pixels.
+        """
+        left, top = self.point(x, y)
+        right, bottom = self.point(x + width, y + height)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def region(self, x, y, width, height):
+        """
+        Layout fitting the whole design into a design rectangle of this one
+        (e.g. a smaller board, with room around it for text and buttons)
+        """
+        area = self.rect(x, y, width, height)
+        region = Layout(self.design_size, area.size)
+        region.offset = (region.offset[0] + area.x, region.offset[1] + area.y)
+        return region
+
+    def to_design(self, pos):
+        """
+        Design coordinates of a window position (e.g. the mouse)
+        """
+        return ((pos[0] - self.offset[0]) / self.scale,
+                (pos[1] - self.offset[1]) / self.scale)
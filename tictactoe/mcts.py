@@ -0,0 +1,306 @@
+"""
+Monte Carlo Tree Search player for boards too big to solve (9x9, 15x15, 19x19...)
+
+Each iteration walks down the tree with UCT, adds one new node, plays the
+rest of the game at random on a copy of the board and updates the win
+counts on the way back up. The more iterations, the stronger the play.
+
+Features:
+- budget: a number of iterations, a time limit in seconds, or both
+- tree reuse: the subtree matching the new position is kept between turns
+- root parallelism: extra searches can run in a process pool, their root
+  statistics are merged with the local tree before picking the move
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tictactoe.board import Board
+
+DEFAULT_EXPLORATION = 1.41  # UCT constant, about sqrt(2)
+DEFAULT_RADIUS = 2  # Only consider empty cells this close to an existing symbol
+
+
+def other(signe):
+    return "O" if signe == "X" else "X"
+
+
+def candidate_moves(board, radius=DEFAULT_RADIUS):
+    """
+    List the moves worth searching
+
+    On big boards, cells far away from every symbol are almost never good,
+    so only empty cells within radius (rows and columns) of an occupied cell
+    are kept. Small boards (and empty ones) return every legal move.
+    """
+    legal = board.legal_moves()
+    size = board.size
+    if size <= 2 * radius + 1 or not board.filled:
+        return list(legal)
+
+    cells = board.cells
+    near = set()
+    for cell in board.occupied_cells():
+        row, col = divmod(cell, size)
+        for r in range(max(0, row - radius), min(size, row + radius + 1)):
+            for c in range(max(0, col - radius), min(size, col + radius + 1)):
+                neighbour = r * size + c
+                if not cells[neighbour]:
+                    near.add(neighbour)
+    return sorted(near)
+
+
+class Node:
+    """
+    One position of the search tree, reached by playing move as mover
+    """
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, mover, parent, untried):
+        self.move = move  # Cell played to reach this node (None for a fresh root)
+        self.mover = mover  # Symbol that played move
+        self.parent = parent
+        self.children = {}  # move -> Node
+        self.untried = untried  # Moves not expanded yet, in random order
+        self.visits = 0
+        self.wins = 0.0  # Wins for mover (draws count half)
+
+    def select(self, exploration):
+        """
+        Pick the child with the best UCT score
+        """
+        log_visits = math.log(self.visits)
+        best_score = -1.0
+        best_child = None
+        for child in self.children.values():
+            score = (child.wins / child.visits
+                     + exploration * math.sqrt(log_visits / child.visits))
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
+
+
+def playout(board, signe, rng):
+    """
+    Finish the game with random moves, signe to play first
+
+    Parameters:
+    - board: Board object, modified in place (pass a copy)
+
+    Returns:
+    - "X", "O" or "Draw"
+    """
+    result = board.winner()
+    if result:
+        return result
+    moves = list(board.legal_moves())
+    rng.shuffle(moves)
+    for cell in moves:
+        board.move(cell, signe)
+        if board.x_lines:
+            return "X"
+        if board.o_lines:
+            return "O"
+        signe = "O" if signe == "X" else "X"
+    return "Draw"
+
+
+def search(root, board, signe, iterations=None, time_limit=None,
+           exploration=DEFAULT_EXPLORATION, radius=DEFAULT_RADIUS, rng=random):
+    """
+    Grow the tree under root
+
+    Parameters:
+    - root: Node for board, with signe to move
+    - iterations: maximum number of iterations (None for no limit)
+    - time_limit: maximum time in seconds (None for no limit)
+
+    Returns:
+    - int: number of iterations run
+    """
+    if iterations is None and time_limit is None:
+        raise ValueError("MCTS needs an iteration count or a time limit")
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    count = 0
+    while iterations is None or count < iterations:
+        # Check the clock every 16 iterations to keep the loop cheap
+        if deadline is not None and count & 15 == 0 and time.perf_counter() >= deadline:
+            break
+        count += 1
+
+        node = root
+        position = board.copy()
+        player = signe
+
+        # 1. Selection: follow UCT while the node is fully expanded
+        while not node.untried and node.children:
+            node = node.select(exploration)
+            position.move(node.move, player)
+            player = other(player)
+
+        # 2. Expansion: add one child if the game is not over
+        if node.untried and position.winner() is None:
+            move = node.untried.pop()
+            position.move(move, player)
+            untried = candidate_moves(position, radius) if position.winner() is None else []
+            rng.shuffle(untried)
+            child = Node(move, player, node, untried)
+            node.children[move] = child
+            node = child
+            player = other(player)
+
+        # 3. Simulation: random playout from there
+        result = playout(position, player, rng)
+
+        # 4. Backpropagation
+        while node is not None:
+            node.visits += 1
+            if result == node.mover:
+                node.wins += 1.0
+            elif result == "Draw":
+                node.wins += 0.5
+            node = node.parent
+    return count
+
+
+def new_root(board, signe, radius=DEFAULT_RADIUS, rng=random):
+    untried = candidate_moves(board, radius)
+    rng.shuffle(untried)
+    return Node(None, other(signe), None, untried)
+
+
+def root_statistics(root):
+    """
+    Return {move: (visits, wins)} for the children of root
+    """
+    return {move: (child.visits, child.wins) for move, child in root.children.items()}
+
+
+def _search_worker(x, o, size, k, signe, iterations, time_limit, exploration, radius, seed):
+    """
+    Run an independent search in a worker process and return its root statistics
+    """
+    rng = random.Random(seed)
+    board = Board(x, o, size, k)
+    root = new_root(board, signe, radius, rng)
+    count = search(root, board, signe, iterations, time_limit, exploration, radius, rng)
+    return count, root_statistics(root)
+
+
+class MCTSPlayer:
+    """
+    Stateful MCTS player: keeps its tree between turns
+
+    Parameters:
+    - iterations: iterations per move (None for no limit)
+    - time_limit: seconds per move (None for no limit)
+    - workers: extra worker processes searching in parallel (0 = none)
+    - exploration: UCT constant
+    - radius: neighbourhood used to pick candidate moves
+    - seed: seed for the player's random generator
+    """
+
+    def __init__(self, iterations=None, time_limit=1.0, workers=0,
+                 exploration=DEFAULT_EXPLORATION, radius=DEFAULT_RADIUS, seed=None):
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.exploration = exploration
+        self.radius = radius
+        self.rng = random.Random(seed)
+        self.root = None
+        self.root_x = 0
+        self.root_o = 0
+        self.root_shape = None
+        self.last_iterations = 0  # Total iterations run for the last move
+        self._executor = None
+
+    def reset(self):
+        """
+        Forget the search tree (e.g. when a new game starts)
+        """
+        self.root = None
+
+    def _reuse_root(self, board, signe):
+        """
+        Find the node matching board among the children and grandchildren of
+        the previous root, or build a new root
+        """
+        shape = (board.size, board.k)
+        if self.root is not None and self.root_shape == shape:
+            if (self.root_x, self.root_o) == (board.x, board.o):
+                return self.root
+            for child in self.root.children.values():
+                cx, co = self._apply(self.root_x, self.root_o, child)
+                if (cx, co) == (board.x, board.o):
+                    return child
+                for grandchild in child.children.values():
+                    if self._apply(cx, co, grandchild) == (board.x, board.o):
+                        return grandchild
+        return new_root(board, signe, self.radius, self.rng)
+
+    @staticmethod
+    def _apply(x, o, node):
+        if node.mover == "X":
+            return x | 1 << node.move, o
+        return x, o | 1 << node.move
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def choose(self, board, signe):
+        """
+        Search from board and return the most visited move for signe
+
+        Returns:
+        - int: cell index, or None if there is no legal move
+        """
+        if board.winner() is not None or not board.legal_moves():
+            return None
+
+        root = self._reuse_root(board, signe)
+        if root.mover != other(signe):
+            # Same stones but the other side to move: the old tree is useless
+            root = new_root(board, signe, self.radius, self.rng)
+        root.parent = None
+        self.root = root
+        self.root_x, self.root_o = board.x, board.o
+        self.root_shape = (board.size, board.k)
+
+        futures = []
+        if self.workers > 0:
+            pool = self._pool()
+            for _ in range(self.workers):
+                futures.append(pool.submit(
+                    _search_worker, board.x, board.o, board.size, board.k, signe,
+                    self.iterations, self.time_limit, self.exploration, self.radius,
+                    self.rng.randrange(2 ** 32),
+                ))
+
+        total = search(root, board, signe, self.iterations, self.time_limit,
+                       self.exploration, self.radius, self.rng)
+
+        visits = {move: child.visits for move, child in root.children.items()}
+        for future in futures:
+            count, statistics = future.result()
+            total += count
+            for move, (move_visits, _) in statistics.items():
+                visits[move] = visits.get(move, 0) + move_visits
+        self.last_iterations = total
+
+        if not visits:
+            return self.rng.choice(board.legal_moves())
+        return max(visits, key=visits.get)
+
+    def close(self):
+        """
+        Shut down the worker pool, if any
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,73 @@
+"""
+Frame pacing for the main loop: full rate while something moves, asleep otherwise
+
+While an animation runs (hovered button, slider drag, fireworks...) the loop
+runs at the normal frame rate. Once a frame has nothing to draw, the next
+iteration blocks in pygame.event.wait until an event arrives, a deadline is
+reached (e.g. the AI's move time) or the idle timeout expires, so an idle
+window uses almost no CPU.
+
+    scheduler = FrameScheduler(60)
+    while running:
+        for event in scheduler.next_events(deadline):
+            ...
+        scheduler.end_frame(busy=renderer_drew_something)
+"""
+import pygame
+
+IDLE_TIMEOUT = 500  # Milliseconds between wake-ups when nothing happens
+
+
+class FrameScheduler:
+    """
+    Decides how long the main loop waits before its next iteration
+    """
+
+    def __init__(self, fps, idle_timeout=IDLE_TIMEOUT, clock=None):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = clock if clock is not None else pygame.time.Clock()
+        self.busy = True  # The first frame always runs
+
+        # Counters, handy to check that an idle screen really sleeps
+        self.busy_frames = 0
+        self.idle_waits = 0
+
+    def next_events(self, deadline=None):
+        """
+        Wait for the next iteration and return its events
+
+        Parameters:
+        - deadline: pygame.time.get_ticks() value at which the loop must run
+          even without events (None if nothing is scheduled)
+
+        Returns:
+        - list of pygame events
+        """
+        if self.busy:
+            return pygame.event.get()
+
+        self.idle_waits += 1
+        timeout = self.idle_timeout
+        if deadline is not None:
+            timeout = max(0, min(timeout, deadline - pygame.time.get_ticks()))
+        event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.Event(pygame.NOEVENT)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+
+    def end_frame(self, busy):
+        """
+        Finish an iteration
+
+        Parameters:
+        - busy: True if the frame drew something, so the next one is likely
+          to as well (animation running) and the loop keeps the full rate
+        """
+        self.busy = busy
+        if busy:
+            self.busy_frames += 1
+            self.clock.tick(self.fps)
+        else:
+            # Keep the clock's reference time current for when the loop wakes up
+            self.clock.tick()
@@ -0,0 +1,202 @@
+"""
+Particle system for the victory fireworks (requires NumPy)
+
+Particles are stored as a structure of arrays: one NumPy array per property
+(position, velocity, age, lifetime, size, color, group), with live particles
+packed at the start. Colors are indices in the palette of a ParticleAtlas,
+which holds a pre-rendered disc for every color and radius. A frame moves
+every particle at once and draws them all with one Surface.blits call:
+
+    particles = ParticleSystem()
+    particles.explode(300, 200, (253, 203, 110))
+    particles.update()          # gravity, air resistance, aging, dead removed
+    particles.draw(screen)
+
+Each explosion gets its own group number, so the renderer can ask for one
+bounding rectangle per explosion (get_bounds) instead of one covering them all.
+
+Particles move in design units (see tictactoe.layout): set_view gives the
+scale and offset to window pixels, used by draw and get_bounds, so the
+fireworks look the same at any window size.
+"""
+import math
+
+import numpy as np
+import pygame
+
+from tictactoe.sprites import ParticleAtlas
+
+GRAVITY = 0.18  # Added to the vertical speed every frame
+DRAG = 0.995  # Air resistance on the horizontal speed
+MAX_SIZE = 8  # Largest particle radius
+INITIAL_CAPACITY = 512
+
+
+class ParticleSystem:
+    """
+    Fixed-size arrays of particles, grown when needed and compacted in place
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, seed=None, atlas=None):
+        self.count = 0  # Live particles, stored in [0, count)
+        self.next_group = 0
+        self.rng = np.random.default_rng(seed)
+        self.atlas = atlas if atlas is not None else ParticleAtlas(MAX_SIZE)
+        self.scale = 1.0
+        self.offset = (0, 0)
+        self._allocate(capacity)
+
+    def set_view(self, scale=1.0, offset=(0, 0)):
+        """
+        Set how particle coordinates map to the screen: pixel = offset + scale * position
+
+        The atlas discs are rendered again at the new scale.
+        """
+        self.scale = scale
+        self.offset = offset
+        if self.atlas.scale != scale:
+            self.atlas.set_scale(scale)
+
+    def _allocate(self, capacity):
+        old_count = self.count
+        arrays = {
+            "x": np.zeros(capacity),
+            "y": np.zeros(capacity),
+            "velocity_x": np.zeros(capacity),
+            "velocity_y": np.zeros(capacity),
+            "age": np.zeros(capacity, dtype=np.int32),  # Frames lived
+            "lifetime": np.ones(capacity, dtype=np.int32),  # Frames the particle will live
+            "size": np.zeros(capacity, dtype=np.int32),
+            "color": np.zeros(capacity, dtype=np.int32),  # Index in the atlas palette
+            "group": np.zeros(capacity, dtype=np.int64),  # Explosion the particle belongs to
+        }
+        for name, array in arrays.items():
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def is_finished(self):
+        """
+        Check if all particles are dead
+        """
+        return self.count == 0
+
+    def clear(self):
+        self.count = 0
+
+    def explode(self, x, y, color, num_particles=None, speed=(2, 8)):
+        """
+        Create explosion particles at (x, y) around a base color
+
+        Parameters:
+        - x, y: center of the explosion
+        - color: RGB tuple, each particle gets one of its shades in the atlas
+        - num_particles: int (default: random between 30 and 60)
+        - speed: (min, max) initial speed in pixels per frame
+        """
+        rng = self.rng
+        if num_particles is None:
+            num_particles = int(rng.integers(30, 61))
+        start = self.count
+        end = start + num_particles
+        if end > self.capacity:
+            self._allocate(max(end, 2 * self.capacity))
+
+        angle = rng.uniform(0, 2 * math.pi, num_particles)  # Random angle
+        velocity = rng.uniform(speed[0], speed[1], num_particles)  # Random speed
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.velocity_x[start:end] = velocity * np.cos(angle)
+        self.velocity_y[start:end] = velocity * np.sin(angle)
+        self.age[start:end] = 0
+        self.lifetime[start:end] = rng.integers(45, 91, num_particles)
+        self.size[start:end] = rng.integers(3, MAX_SIZE + 1, num_particles)
+        self.color[start:end] = rng.choice(self.atlas.add_color(color), num_particles)
+        self.group[start:end] = self.next_group
+
+        self.next_group += 1
+        self.count = end
+
+    def update(self):
+        """
+        Move, age and remove dead particles, all in one vectorized step
+        """
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.velocity_x[:n]
+        self.y[:n] += self.velocity_y[:n]
+        self.velocity_y[:n] += GRAVITY  # Gravity effect
+        self.velocity_x[:n] *= DRAG  # Air resistance
+        self.age[:n] += 1
+
+        alive = self.age[:n] < self.lifetime[:n]
+        live_count = int(np.count_nonzero(alive))
+        if live_count < n:
+            # Pack the survivors at the start of every array, keeping their order
+            for array in (self.x, self.y, self.velocity_x, self.velocity_y,
+                          self.age, self.lifetime, self.size, self.color, self.group):
+                array[:live_count] = array[:n][alive]
+            self.count = live_count
+
+    def radii(self):
+        """
+        Current radius of every live particle (they shrink as they age)
+        """
+        n = self.count
+        life_ratio = 1 - self.age[:n] / self.lifetime[:n]
+        return np.maximum(1, (self.size[:n] * life_ratio).astype(np.int32))
+
+    def draw(self, surface):
+        """
+        Draw all particles, as discs copied from the atlas
+        """
+        n = self.count
+        if not n:
+            return
+        xs = self.x[:n] * self.scale + self.offset[0]
+        ys = self.y[:n] * self.scale + self.offset[1]
+        self.atlas.draw(surface, xs.astype(np.int32), ys.astype(np.int32), self.color[:n], self.radii())
+
+    def get_bounds(self):
+        """
+        One Rect per explosion, covering its particles now and after the next update
+
+        Returns:
+        - list of pygame.Rect (empty when there are no particles)
+        """
+        n = self.count
+        if not n:
+            return []
+        groups, index = np.unique(self.group[:n], return_inverse=True)
+        min_x = np.full(len(groups), np.inf)
+        min_y = np.full(len(groups), np.inf)
+        max_x = np.full(len(groups), -np.inf)
+        max_y = np.full(len(groups), -np.inf)
+        speed = np.zeros(len(groups))
+        np.minimum.at(min_x, index, self.x[:n])
+        np.minimum.at(min_y, index, self.y[:n])
+        np.maximum.at(max_x, index, self.x[:n])
+        np.maximum.at(max_y, index, self.y[:n])
+        np.maximum.at(speed, index, np.abs(self.velocity_x[:n]) + np.abs(self.velocity_y[:n]))
+
+        # To window pixels
+        scale = self.scale
+        min_x = min_x * scale + self.offset[0]
+        max_x = max_x * scale + self.offset[0]
+        min_y = min_y * scale + self.offset[1]
+        max_y = max_y * scale + self.offset[1]
+        largest = int(self.atlas.pixel_radii[-1])
+
+        rects = []
+        for left, top, right, bottom, fastest in zip(min_x.tolist(), min_y.tolist(),
+                                                     max_x.tolist(), max_y.tolist(), speed.tolist()):
+            # Largest particle radius, plus the farthest a particle moves in one frame
+            margin = largest + 2 + int(fastest * scale) + 1
+            rects.append(pygame.Rect(int(left) - margin, int(top) - margin,
+                                     int(right - left) + 2 * margin, int(bottom - top) + 2 * margin))
+        return rects
@@ -0,0 +1,119 @@
+"""
+Dirty-rectangle presentation for the pygame window
+
+Instead of redrawing and flipping the whole window every frame, the game
+reports the regions that changed ("damage"). Each frame the renderer:
+
+1. tells whether anything needs drawing at all (an idle screen skips the frame)
+2. sends only the damaged rectangles to the display with pygame.display.update
+
+The back buffer is still redrawn in full on frames that have damage: drawing
+with a clip rectangle shifts thick lines by a pixel where they cross the clip
+edge, and the scene is cheap to draw once the backgrounds are cached. What
+the renderer saves is every idle frame and the pixels sent to the display.
+
+A full-window repaint (damage_all) is used when the whole scene changes,
+e.g. when switching screens.
+"""
+import pygame
+
+# Above this share of the window, one flip is cheaper than many small updates
+FULL_UPDATE_RATIO = 0.6
+
+
+def merge_rects(rects):
+    """
+    Merge overlapping rectangles so each screen area is sent only once
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        changed = True
+        while changed:
+            changed = False
+            for index, other in enumerate(merged):
+                if rect.colliderect(other):
+                    rect.union_ip(merged.pop(index))
+                    changed = True
+                    break
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """
+    Collects damaged regions and presents them to the display
+    """
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.rects = []
+        self.full = True  # The first frame is always a full repaint
+
+        # Counters, handy to check that an idle screen costs nothing
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.pixels_updated = 0
+
+    @property
+    def screen_rect(self):
+        return self.surface.get_rect()
+
+    def damage(self, rect):
+        """
+        Mark a region of the window as changed
+        """
+        if self.full or rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def damage_all(self):
+        """
+        Mark the whole window as changed
+        """
+        self.full = True
+        self.rects = []
+
+    def resize(self, surface):
+        """
+        Use a new display surface (the window was resized), repainted in full
+        """
+        self.surface = surface
+        self.damage_all()
+
+    def has_damage(self):
+        return self.full or bool(self.rects)
+
+    def begin_frame(self):
+        """
+        Returns:
+        - bool: False when nothing changed and the frame can be skipped
+        """
+        if not self.has_damage():
+            self.frames_skipped += 1
+            return False
+        return True
+
+    def present(self):
+        """
+        Send the damaged regions to the display and start a new frame
+        """
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if not self.full:
+            self.rects = merge_rects(self.rects)
+            area = sum(rect.width * rect.height for rect in self.rects)
+            if area > screen_area * FULL_UPDATE_RATIO:
+                self.full = True
+
+        if self.full:
+            pygame.display.flip()
+            self.pixels_updated += screen_area
+        elif self.rects:
+            pygame.display.update(self.rects)
+            self.pixels_updated += sum(rect.width * rect.height for rect in self.rects)
+
+        self.frames_drawn += 1
+        self.full = False
+        self.rects = []
@@ -0,0 +1,301 @@
+"""
+Packed replay archive: every 3x3 game as a few bytes, looked up by id
+
+No pygame needed. A 3x3 board has 9 cells, so a move fits in 4 bits and a
+whole game (header, time, up to 9 moves) takes 10 bytes at most:
+
+    byte 0      move count (bits 0-3), result (bits 4-5: X, O, Draw),
+                player of O (bits 6-7: 2 players, easy, medium, hard AI)
+    bytes 1-4   end of the game, seconds since 1970 (uint32, little-endian)
+    bytes 5-9   moves, two per byte, first move in the low nibble
+
+Records are appended to replays.bin (after a 5-byte header), and the offset
+of each one to replays.idx (uint64, little-endian). The id of a game is its
+position in the index, so looking one up is two small reads:
+
+    archive = ReplayArchive()
+    game_id = archive.append(game_record([4, 0, 8, 2, 6], "X", "1P", "hard"))
+    archive.get(game_id)                # same dict as the game log records
+
+    games = decode_archive()            # every game as NumPy arrays
+    boards = final_boards(games["moves"])
+
+Like the game log, the archive is append-only: a crash can at worst leave a
+record at the end that the index does not know about, it is cut off the next
+time the archive is opened.
+
+Given a BackgroundWriter, the games not written yet are kept in memory (a
+few bytes each), so get() never waits for the disk.
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+
+from tictactoe.board import Board
+from tictactoe.history import append_file, TIME_FORMAT
+
+ARCHIVE_PATH = "replays.bin"
+INDEX_PATH = "replays.idx"
+MAGIC = b"TTTR\x01"  # File type and format version
+HEADER_SIZE = 5  # Bytes before the moves in each record
+OFFSET_SIZE = 8  # Bytes per index entry
+MAX_MOVES = 9
+NO_MOVE = -1
+
+RESULTS = ("X", "O", "Draw")
+PLAYERS = (None, "easy", "medium", "hard")  # Who plays O: None in 2 players mode
+
+
+def record_size(move_count):
+    return HEADER_SIZE + (move_count + 1) // 2
+
+
+def encode_game(record):
+    """
+    Pack a game record (see history.game_record) into bytes
+
+    Returns:
+    - bytes, or None for games the format cannot hold (boards other than 3x3,
+      1 player games without a known AI difficulty: player 0 means 2 players)
+    """
+    moves = record["moves"]
+    if record.get("size", 3) != 3 or record.get("k", 3) != 3 or len(moves) > MAX_MOVES:
+        return None
+    if record["mode"] == "1P":
+        if record.get("difficulty") not in PLAYERS[1:]:
+            return None
+        player = PLAYERS.index(record["difficulty"])
+    else:
+        player = 0
+    finished = int(datetime.strptime(record["time"], TIME_FORMAT).timestamp())
+
+    data = bytearray(record_size(len(moves)))
+    data[0] = len(moves) | RESULTS.index(record["result"]) << 4 | player << 6
+    data[1:5] = finished.to_bytes(4, "little")
+    for ply, cell in enumerate(moves):
+        data[HEADER_SIZE + ply // 2] |= cell << (4 * (ply % 2))
+    return bytes(data)
+
+
+def decode_game(data):
+    """
+    Unpack one record into a game record dict
+    """
+    count = data[0] & 15
+    player = PLAYERS[data[0] >> 6]
+    finished = datetime.fromtimestamp(int.from_bytes(data[1:5], "little")).strftime(TIME_FORMAT)
+    moves = [(data[HEADER_SIZE + ply // 2] >> (4 * (ply % 2))) & 15 for ply in range(count)]
+    return {
+        "type": "game",
+        "time": finished,
+        "mode": "1P" if player else "2P",
+        "difficulty": player,
+        "size": 3,
+        "k": 3,
+        "moves": moves,
+        "result": RESULTS[(data[0] >> 4) & 3],
+    }
+
+
+def replay_board(moves, ply=None):
+    """
+    Board after the first ply moves of a game (all of them by default), X first
+    """
+    board = Board()
+    for index, cell in enumerate(moves[:ply]):
+        board.move(cell, "X" if index % 2 == 0 else "O")
+    return board
+
+
+class ReplayArchive:
+    """
+    Append-only file of packed games plus the index of their offsets
+    """
+
+    def __init__(self, path=ARCHIVE_PATH, index_path=INDEX_PATH, writer=None):
+        """
+        Parameters:
+        - path: archive file
+        - index_path: index file
+        - writer: BackgroundWriter doing the writes (None: write right away)
+        """
+        self.path = path
+        self.index_path = index_path
+        self.writer = writer
+        self.count = 0  # Games appended, written or not
+        self.written = 0  # Games on disk (updated by the writer thread)
+        self.pending = {}  # Game id -> packed game, until the writer thread has written it
+        self.load()
+
+    def __str__(self):
+        return self.path
+
+    def load(self):
+        """
+        Check the files, cutting off what a crash left half-written
+
+        Returns:
+        - int: number of games in the archive
+        """
+        index_size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        archive_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if archive_size < len(MAGIC):
+            with open(self.path, "wb") as f:
+                f.write(MAGIC)
+            index_size = archive_size = 0
+            open(self.index_path, "wb").close()
+        else:
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{self.path} is not a replay archive")
+            if not os.path.exists(self.index_path):
+                open(self.index_path, "wb").close()
+
+        count = index_size // OFFSET_SIZE
+        end = len(MAGIC)
+        with open(self.path, "rb") as archive, open(self.index_path, "rb") as index:
+            while count:
+                # The last indexed record must be complete, otherwise drop it from the index
+                index.seek((count - 1) * OFFSET_SIZE)
+                offset = int.from_bytes(index.read(OFFSET_SIZE), "little")
+                archive.seek(offset)
+                head = archive.read(1)
+                if head and offset + record_size(head[0] & 15) <= archive_size:
+                    end = offset + record_size(head[0] & 15)
+                    break
+                count -= 1
+
+        if index_size != count * OFFSET_SIZE:
+            with open(self.index_path, "r+b") as f:
+                f.truncate(count * OFFSET_SIZE)
+        if archive_size > end:
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+            print("⚠️ Dropped an incomplete game at the end of the replay archive")
+
+        self.count = self.written = count
+        return count
+
+    def __len__(self):
+        return self.count
+
+    def append(self, record):
+        """
+        Add a finished game
+
+        Returns:
+        - int: id of the game, or None if it cannot be archived (see encode_game)
+        """
+        if record.get("type", "game") != "game":
+            return None
+        data = encode_game(record)
+        if data is None:
+            return None
+        if self.writer is not None:
+            self.pending[self.count] = data
+            self.writer.add(self, data)
+        else:
+            self.write_batch([data])
+        self.count += 1
+        return self.count - 1
+
+    def write_batch(self, records):
+        """
+        Write packed games: archive first, then the index pointing to them
+
+        If the index write fails, the retry appends the games again and
+        indexes the new copy: offsets always come from the file size.
+        """
+        offsets = bytearray()
+        offset = os.path.getsize(self.path)
+        for data in records:
+            offsets += offset.to_bytes(OFFSET_SIZE, "little")
+            offset += len(data)
+        append_file(self.path, b"".join(records))
+        append_file(self.index_path, bytes(offsets))
+        first = self.written
+        self.written += len(records)
+        for game_id in range(first, self.written):  # After written: get() then reads them from the files
+            self.pending.pop(game_id, None)
+
+    def get(self, game_id):
+        """
+        Game record of a game id (0 is the oldest, len(archive) - 1 the newest)
+        """
+        if not 0 <= game_id < self.count:
+            raise IndexError(f"No game {game_id} in the replay archive")
+        data = self.pending.get(game_id)  # Not written yet: served from memory
+        if data is None:
+            data = self._read(game_id)
+        record = decode_game(data)
+        record["id"] = game_id
+        return record
+
+    def _read(self, game_id):
+        """
+        Packed game of a game id, from the files
+        """
+        if game_id >= self.written:
+            raise OSError(f"Game {game_id} is not written to {self.path} yet")
+        with open(self.index_path, "rb") as index:
+            index.seek(game_id * OFFSET_SIZE)
+            entry = index.read(OFFSET_SIZE)
+        offset = int.from_bytes(entry, "little")
+        if len(entry) != OFFSET_SIZE or offset < len(MAGIC):
+            raise ValueError(f"Bad index entry for game {game_id} in {self.index_path}")
+        with open(self.path, "rb") as archive:
+            archive.seek(offset)
+            return archive.read(HEADER_SIZE + (MAX_MOVES + 1) // 2)
+
+
+def decode_archive(path=ARCHIVE_PATH, index_path=INDEX_PATH):
+    """
+    Decode every game of an archive at once
+
+    Returns:
+    - dict of NumPy arrays, one row per game id:
+      "moves" (N, 9) int8, cells in play order, NO_MOVE after the last one
+      "move_count" (N,) uint8, "result" (N,) uint8 index in RESULTS,
+      "player" (N,) uint8 index in PLAYERS, "time" (N,) uint32 seconds since 1970
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+    offsets = np.fromfile(index_path, dtype="<u8").astype(np.intp)
+    if len(data) < len(MAGIC) or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a replay archive")
+    data = np.concatenate([data, np.zeros(HEADER_SIZE, np.uint8)])  # Short last record: reads stay in bounds
+
+    head = data[offsets]
+    count = head & 15
+    times = data[offsets[:, None] + np.arange(1, HEADER_SIZE)].view("<u4").ravel()
+
+    ply = np.arange(MAX_MOVES)
+    moves = data[offsets[:, None] + HEADER_SIZE + ply // 2] >> (4 * (ply % 2)).astype(np.uint8) & 15
+    moves = np.where(ply < count[:, None], moves, NO_MOVE).astype(np.int8)
+    return {
+        "moves": moves,
+        "move_count": count,
+        "result": (head >> 4) & 3,
+        "player": head >> 6,
+        "time": times,
+    }
+
+
+def final_boards(moves, ply=None):
+    """
+    Boards of decoded games after ply moves (all of them by default)
+
+    Returns:
+    - (N, 9) uint8 array, 0 = empty, 1 = X, 2 = O (as in tictactoe.batch)
+    """
+    moves = np.asarray(moves)
+    plies = np.arange(moves.shape[1])
+    played = moves >= 0
+    if ply is not None:
+        played &= plies < ply
+    symbols = np.where(plies % 2 == 0, 1, 2).astype(np.uint8)
+
+    boards = np.zeros((len(moves), MAX_MOVES + 1), dtype=np.uint8)  # Last column takes the unplayed moves
+    columns = np.where(played, moves, MAX_MOVES)
+    boards[np.arange(len(moves))[:, None], columns] = symbols
+    return boards[:, :MAX_MOVES]
@@ -0,0 +1,130 @@
+"""
+Geometry of the liquid-ripple button outline (requires NumPy)
+
+A hovered button is drawn as a polygon whose points follow the button's
+rectangle and move in and out along the direction from the center, with the
+sum of three waves. Everything that does not depend on time is computed once
+and cached:
+
+- the base perimeter and the direction of each point from the center, per
+  rectangle size
+- the wave phases of every point, per button (seed)
+
+Each frame then only costs three sin/cos pairs for the time term, and one
+vectorized expression for all the points:
+
+    points = ripple_points(rect.center, rect.size, seed, time)
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+NUM_POINTS = 40  # More points = smoother waves
+
+# (amplitude, time speed, phase step per point, seed factor, use cos) of each wave
+WAVES = (
+    (3.0, 4.0, 0.5, 1.0, False),   # Fast chaotic ripple
+    (4.0, 2.0, 0.3, -0.5, False),  # Slower deep wave
+    (2.5, 3.0, 0.4, 0.3, True),    # Medium circular wave
+)
+
+
+@lru_cache(maxsize=64)
+def perimeter(width, height, num_points=NUM_POINTS):
+    """
+    Points around a width x height rectangle and their unit directions from
+    the center (radial, not perpendicular to the edges: corners move diagonally)
+
+    Points go clockwise from the top-left corner, evenly spread over each
+    side, and are relative to the rectangle's center (as pygame.Rect
+    computes it, so integer division for odd sizes).
+
+    Returns:
+    - tuple (offsets, normals): float arrays of shape (num_points, 2)
+    """
+    left = -(width // 2)
+    top = -(height // 2)
+    right = left + width
+    bottom = top + height
+    quarter = num_points / 4
+
+    offsets = np.empty((num_points, 2))
+    for i in range(num_points):
+        side, t = divmod(i / quarter, 1.0)
+        if side == 0:  # Top edge, left to right
+            offsets[i] = (left + width * t, top)
+        elif side == 1:  # Right edge, top to bottom
+            offsets[i] = (right, top + height * t)
+        elif side == 2:  # Bottom edge, right to left
+            offsets[i] = (right - width * t, bottom)
+        else:  # Left edge, bottom to top
+            offsets[i] = (left, bottom - height * t)
+
+    lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+    lengths[lengths == 0] = 1
+    normals = offsets / lengths[:, None]
+    offsets.flags.writeable = False
+    normals.flags.writeable = False
+    return offsets, normals
+
+
+@lru_cache(maxsize=64)
+def phase_table(seed, num_points=NUM_POINTS):
+    """
+    Sine and cosine of the time-independent phase of every wave at every point
+
+    Returns:
+    - tuple of (sin, cos) array pairs, one pair per wave in WAVES
+    """
+    index = np.arange(num_points)
+    table = []
+    for _, _, step, seed_factor, _ in WAVES:
+        phase = index * step + seed * seed_factor
+        table.append((np.sin(phase), np.cos(phase)))
+    return tuple(table)
+
+
+def ripple_offsets(seed, time, num_points=NUM_POINTS):
+    """
+    Distance each point moves along its direction from the center at a given time
+
+    Uses sin(a + b) = sin(a)cos(b) + cos(a)sin(b) and
+    cos(a + b) = cos(a)cos(b) - sin(a)sin(b), with a the time term (one value
+    per wave) and b the phase from phase_table.
+    """
+    ripple = np.zeros(num_points)
+    for (amplitude, speed, _, _, use_cos), (sin_b, cos_b) in zip(WAVES, phase_table(seed, num_points)):
+        sin_a = math.sin(time * speed)
+        cos_a = math.cos(time * speed)
+        if use_cos:
+            ripple += amplitude * (cos_a * cos_b - sin_a * sin_b)
+        else:
+            ripple += amplitude * (sin_a * cos_b + cos_a * sin_b)
+    return ripple
+
+
+def ripple_points(center, size, seed, time, amplitude=1.0, num_points=NUM_POINTS):
+    """
+    Polygon of a rippling rectangle
+
+    Parameters:
+    - center: (x, y) of the rectangle
+    - size: (width, height) of the rectangle
+    - seed: number giving each button its own pattern
+    - time: seconds, drives the animation
+    - amplitude: multiplier of the waves (the window scale, so ripples keep
+      their look on bigger windows)
+
+    Returns:
+    - tuple (points, normals): points is a (num_points, 2) array in screen
+      coordinates, normals the radial direction of every point (to expand
+      the outline, e.g. for a glow)
+    """
+    offsets, normals = perimeter(size[0], size[1], num_points)
+    ripple = ripple_offsets(seed, time, num_points)
+    if amplitude != 1.0:
+        ripple *= amplitude
+    points = offsets + normals * ripple[:, None]
+    points += center
+    return points, normals
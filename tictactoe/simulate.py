@@ -0,0 +1,121 @@
+"""
+Headless AI-vs-AI simulation, no pygame needed
+
+Plays games between two AI difficulty levels as fast as possible and reports
+games per second and the outcome distribution.
+
+Usage:
+    python -m tictactoe.simulate                      # every pairing, 1000 games each
+    python -m tictactoe.simulate -x hard -o easy -n 10000
+    python -m tictactoe.simulate --size 9 --k 4 --mcts-iterations 200
+"""
+import argparse
+import time
+
+from tictactoe import ai
+from tictactoe.board import Board
+
+
+def play_game(x_difficulty, o_difficulty, size=3, k=3):
+    """
+    Play one full game between two AI difficulty levels
+
+    Parameters:
+    - x_difficulty: difficulty of X (plays first)
+    - o_difficulty: difficulty of O
+    - size, k: board shape
+
+    Returns:
+    - tuple (result, moves): result is "X", "O" or "Draw", moves the list
+      of cells in the order they were played
+    """
+    board = Board(size=size, k=k)
+    difficulties = {"X": x_difficulty, "O": o_difficulty}
+    signe = "X"
+    moves = []
+    while board.winner() is None:
+        cell = ai.get_ai_move(board, signe, difficulties[signe])
+        if cell is False or not board.is_empty(cell):
+            raise RuntimeError(f"AI ({difficulties[signe]}) returned invalid move {cell}")
+        board.move(cell, signe)
+        moves.append(cell)
+        signe = "O" if signe == "X" else "X"
+    return board.winner(), moves
+
+
+def run_pairing(x_difficulty, o_difficulty, games, size=3, k=3):
+    """
+    Play a series of games for one pairing
+
+    Returns:
+    - tuple (counts, elapsed): counts maps "X", "O" and "Draw" to the
+      number of games, elapsed is the time taken in seconds
+    """
+    counts = {"X": 0, "O": 0, "Draw": 0}
+    start = time.perf_counter()
+    for _ in range(games):
+        result, _ = play_game(x_difficulty, o_difficulty, size, k)
+        counts[result] += 1
+    return counts, time.perf_counter() - start
+
+
+def format_report(x_difficulty, o_difficulty, counts, elapsed):
+    games = sum(counts.values())
+    rate = games / elapsed if elapsed > 0 else float("inf")
+
+    def percent(key):
+        return 100.0 * counts[key] / games if games else 0.0
+
+    return (f"X={x_difficulty:<6} O={o_difficulty:<6} "
+            f"X wins {percent('X'):5.1f}%  O wins {percent('O'):5.1f}%  "
+            f"draws {percent('Draw'):5.1f}%  "
+            f"({games} games, {rate:,.0f} games/s)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games without a display")
+    choices = ai.DIFFICULTIES + ("all",)
+    parser.add_argument("-x", "--x-difficulty", default="all", choices=choices,
+                        help="difficulty of X, who plays first (default: all)")
+    parser.add_argument("-o", "--o-difficulty", default="all", choices=choices,
+                        help="difficulty of O (default: all)")
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="games per pairing (default: 1000)")
+    parser.add_argument("--size", type=int, default=3, help="board size (default: 3)")
+    parser.add_argument("--k", type=int, default=None,
+                        help="symbols in a row needed to win (default: board size)")
+    parser.add_argument("--mcts-iterations", type=int, default=200,
+                        help="MCTS iterations per move on boards bigger than 3x3 (default: 200)")
+    parser.add_argument("--verbose", action="store_true", help="print every AI decision")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    k = args.k or args.size
+
+    ai.VERBOSE = args.verbose
+    ai.load_solutions()
+    ai.configure_mcts(iterations=args.mcts_iterations, time_limit=None)
+
+    x_levels = ai.DIFFICULTIES if args.x_difficulty == "all" else (args.x_difficulty,)
+    o_levels = ai.DIFFICULTIES if args.o_difficulty == "all" else (args.o_difficulty,)
+
+    print(f"Board {args.size}x{args.size}, {k} in a row, {args.games} games per pairing")
+    total_games = 0
+    total_time = 0.0
+    for x_difficulty in x_levels:
+        for o_difficulty in o_levels:
+            counts, elapsed = run_pairing(x_difficulty, o_difficulty, args.games, args.size, k)
+            total_games += args.games
+            total_time += elapsed
+            print(format_report(x_difficulty, o_difficulty, counts, elapsed))
+
+    ai.mcts_player.close()
+    if total_time > 0:
+        print(f"Total: {total_games} games in {total_time:.2f}s "
+              f"({total_games / total_time:,.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Precomputed solution of every 3x3 position, stored in a compact binary file
+
+File layout (little-endian):
+- 4 bytes: magic b"TTT1"
+- 3**9 entries of 2 bytes, indexed by the base-3 position code
+
+Position code: sum of 3**i * v for every cell i, with v = 0 (empty),
+1 (X) or 2 (O). The side to move is implied by the piece counts (X starts).
+
+Entry bits:
+- bits 0-8: mask of the optimal moves for the side to move
+- bits 9-10: outcome for the side to move (OUTCOME_* below), 0 when the
+  position is finished or cannot happen in a real game
+
+Build the file with:
+    python -m tictactoe.solution_table [path]
+"""
+import mmap
+import os
+import struct
+import sys
+
+from tictactoe.board import Board, CELL_COUNT, FULL_MASK, HAS_WIN, SET_CELLS
+from tictactoe import solver
+
+MAGIC = b"TTT1"
+HEADER_SIZE = len(MAGIC)
+ENTRY_SIZE = 2
+POSITION_COUNT = 3 ** CELL_COUNT  # 19683
+FILE_SIZE = HEADER_SIZE + POSITION_COUNT * ENTRY_SIZE
+
+DEFAULT_PATH = os.path.join("assets", "data", "solutions.bin")
+
+OUTCOME_NONE = 0
+OUTCOME_WIN = 1
+OUTCOME_DRAW = 2
+OUTCOME_LOSS = 3
+
+# BASE3[mask] = sum of 3**i for every bit i set in the mask, so that
+# code = BASE3[x] + 2 * BASE3[o]
+BASE3 = tuple(sum(3 ** cell for cell in SET_CELLS[mask]) for mask in range(FULL_MASK + 1))
+
+_entry = struct.Struct("<H")
+
+
+def encode(board):
+    """
+    Return the base-3 code (0 to 3**9 - 1) of a Board
+    """
+    return BASE3[board.x] + 2 * BASE3[board.o]
+
+
+def decode(code):
+    """
+    Rebuild the Board matching a base-3 code
+    """
+    x = o = 0
+    for cell in range(CELL_COUNT):
+        code, digit = divmod(code, 3)
+        if digit == 1:
+            x |= 1 << cell
+        elif digit == 2:
+            o |= 1 << cell
+    return Board(x, o)
+
+
+def side_to_move(board):
+    """
+    Return "X" or "O" from the piece counts, or None if the counts are impossible
+    """
+    x_count = len(SET_CELLS[board.x])
+    o_count = len(SET_CELLS[board.o])
+    if x_count == o_count:
+        return "X"
+    if x_count == o_count + 1:
+        return "O"
+    return None
+
+
+def solve_entry(board):
+    """
+    Compute the 16-bit table entry for one position
+    """
+    signe = side_to_move(board)
+    if signe is None or HAS_WIN[board.x] or HAS_WIN[board.o] or board.is_full():
+        return 0
+
+    value, cells = solver.best_moves(board, signe)
+    if value > 0:
+        outcome = OUTCOME_WIN
+    elif value < 0:
+        outcome = OUTCOME_LOSS
+    else:
+        outcome = OUTCOME_DRAW
+
+    moves_mask = 0
+    for cell in cells:
+        moves_mask |= 1 << cell
+    return moves_mask | outcome << 9
+
+
+def build(path=DEFAULT_PATH):
+    """
+    Solve every position and write the table to path
+
+    Returns:
+    - int: number of playable positions stored
+    """
+    entries = bytearray(POSITION_COUNT * ENTRY_SIZE)
+    playable = 0
+    for code in range(POSITION_COUNT):
+        entry = solve_entry(decode(code))
+        if entry:
+            playable += 1
+        _entry.pack_into(entries, code * ENTRY_SIZE, entry)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(entries)
+    os.replace(tmp_path, path)
+    return playable
+
+
+class SolutionTable:
+    """
+    Read-only view over a solution file, memory-mapped so loading is instant
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) != FILE_SIZE or self._buffer[:HEADER_SIZE] != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a valid solution table")
+
+    def entry(self, board):
+        """
+        Return the raw 16-bit entry for a Board
+        """
+        return _entry.unpack_from(self._buffer, HEADER_SIZE + encode(board) * ENTRY_SIZE)[0]
+
+    def lookup(self, board):
+        """
+        Return (outcome, cells) for the side to move
+
+        - outcome: OUTCOME_WIN, OUTCOME_DRAW, OUTCOME_LOSS, or OUTCOME_NONE if
+          the position is over or impossible
+        - cells: tuple of the optimal moves (empty when outcome is OUTCOME_NONE)
+        """
+        entry = self.entry(board)
+        return entry >> 9, SET_CELLS[entry & FULL_MASK]
+
+    def raw_entries(self):
+        """
+        Return a read-only memoryview over all the entries (2 bytes each,
+        little-endian), for vectorized lookups
+        """
+        return memoryview(self._buffer)[HEADER_SIZE:]
+
+    def close(self):
+        self._buffer.close()
+
+
+def load(path=DEFAULT_PATH):
+    """
+    Open a solution table, or return None if the file is missing
+    """
+    if not os.path.exists(path):
+        return None
+    return SolutionTable(path)
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    count = build(output)
+    print(f"✅ Wrote {count} solved positions to {output}")
@@ -0,0 +1,138 @@
+"""
+Perfect-play negamax search with alpha-beta pruning and a transposition table
+
+Positions are always seen from the side to move: "own" is the mask of the
+player about to play, "opp" the mask of the player who just moved. Scores are
+positive when the side to move wins, and faster wins score higher:
+
+- win with n free cells left  -> +(n + 1)
+- loss with n free cells left -> -(n + 1)
+- draw                        -> 0
+
+The transposition table lives for the whole process and is keyed on the
+symmetry-canonical position, so rotated or mirrored versions of a position
+share one entry and each is searched once.
+"""
+import random
+
+from tictactoe.board import FREE_CELLS, FULL_MASK, HAS_WIN
+from tictactoe.symmetry import canonical_key
+
+INFINITY = 100
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1  # Stored value is a lower bound (search failed high)
+UPPER = 2  # Stored value is an upper bound (search failed low)
+
+# Center first, then corners, then edges: best moves first means more cutoffs
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+ORDERED_FREE = tuple(
+    tuple(cell for cell in MOVE_ORDER if not occupied >> cell & 1)
+    for occupied in range(FULL_MASK + 1)
+)
+
+# canonical key -> (value, flag), the key packs both masks into 18 bits
+_table = {}
+
+
+def negamax(own, opp, alpha=-INFINITY, beta=INFINITY):
+    """
+    Score a position for the side to move
+
+    Parameters:
+    - own: bit mask of the player about to move
+    - opp: bit mask of the player who just moved
+    - alpha, beta: search window
+
+    Returns:
+    - int: game value for the side to move (see module docstring)
+    """
+    occupied = own | opp
+    if HAS_WIN[opp]:
+        return -(len(FREE_CELLS[occupied]) + 1)
+    if occupied == FULL_MASK:
+        return 0
+
+    key = canonical_key(own, opp)
+    entry = _table.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    alpha_orig = alpha
+    best = -INFINITY
+    for cell in ORDERED_FREE[occupied]:
+        score = -negamax(opp, own | (1 << cell), -beta, -alpha)
+        if score > best:
+            best = score
+            if best > alpha:
+                alpha = best
+                if alpha >= beta:
+                    break
+
+    if best <= alpha_orig:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _table[key] = (best, flag)
+    return best
+
+
+def score_moves(board, signe):
+    """
+    Compute the exact game value of every legal move
+
+    Parameters:
+    - board: Board object
+    - signe: str, the symbol about to play ("X" or "O")
+
+    Returns:
+    - dict: {cell: value for signe after playing that cell}
+    """
+    own, opp = board.masks(signe)
+    occupied = own | opp
+    return {cell: -negamax(opp, own | (1 << cell))
+            for cell in ORDERED_FREE[occupied]}
+
+
+def best_moves(board, signe):
+    """
+    Return (value, cells) where cells lists every move reaching the best value
+    """
+    scores = score_moves(board, signe)
+    if not scores:
+        return 0, []
+    best = max(scores.values())
+    return best, [cell for cell, value in scores.items() if value == best]
+
+
+def choose_move(board, signe, rng=random):
+    """
+    Pick a perfect-play move, at random among equally good ones
+
+    Returns:
+    - int: cell index (0-8), or None if the board is full
+    """
+    _, cells = best_moves(board, signe)
+    if not cells:
+        return None
+    return rng.choice(cells)
+
+
+def table_size():
+    return len(_table)
+
+
+def clear_table():
+    _table.clear()
+
@@ -0,0 +1,187 @@
+"""
+Pre-rendered sprites, so that frames only copy pixels
+
+- ParticleAtlas: one sheet holding a disc for every particle color and
+  radius. A whole particle system is drawn with a single Surface.blits call.
+- ImageAtlas: copies of the symbol images already scaled to every size the
+  UI uses (board cells, winner message), made once per window size instead
+  of every frame.
+"""
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+SHADES = 16  # Variations of each base color (particles are not all the same shade)
+SHADE_SPREAD = 20  # Largest change of a color channel in a shade
+TRANSPARENT_KEY = (255, 0, 255)  # Colorkey of the particle sheet, never used by a shade
+
+
+class ParticleAtlas:
+    """
+    Sheet of filled discs: one row per palette color, one column per radius
+
+    Base colors are added with add_color (at load time for the known
+    fireworks colors), each one bringing SHADES palette entries. On a scaled
+    window, set_scale renders the discs again at their size in pixels.
+
+    The sheet uses a colorkey rather than per-pixel alpha: the discs are
+    fully opaque, and colorkey blits are about twice as fast.
+    """
+
+    def __init__(self, max_radius=8, shades=SHADES, seed=0, scale=1.0):
+        self.max_radius = max_radius
+        self.shades = shades
+        self.rng = np.random.default_rng(seed)
+
+        self.palette = np.zeros((0, 3), dtype=np.uint8)
+        self.base_colors = {}  # RGB tuple -> array of its palette indices
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """
+        Render the discs for a new screen scale: a particle of radius r is
+        drawn as a disc of radius r * scale pixels
+        """
+        self.scale = scale
+        # Pixel radius of each particle radius (index 0 is unused)
+        self.pixel_radii = np.maximum(1, np.rint(np.arange(self.max_radius + 1) * scale)).astype(np.int32)
+        self.cell = 2 * int(self.pixel_radii[-1])  # A disc of radius r covers 2r x 2r pixels
+        self.areas = []  # Sprite index -> area of the sheet (see sprite_indices)
+        self.sheet = pygame.Surface((self.cell * self.max_radius, 0))
+        self._extend_sheet(0)
+
+    def add_color(self, color):
+        """
+        Make sure a base color has its shades in the atlas
+
+        Returns:
+        - int array: palette indices of the color's shades
+        """
+        color = tuple(color)
+        indices = self.base_colors.get(color)
+        if indices is not None:
+            return indices
+
+        offsets = self.rng.integers(-SHADE_SPREAD, SHADE_SPREAD + 1, (self.shades, 3))
+        shades = np.clip(np.asarray(color, dtype=np.int16) + offsets, 0, 255).astype(np.uint8)
+        shades[(shades == TRANSPARENT_KEY).all(axis=1), 2] -= 1  # Keep clear of the colorkey
+        first = len(self.palette)
+        self.palette = np.concatenate((self.palette, shades))
+        indices = np.arange(first, len(self.palette))
+        self.base_colors[color] = indices
+        self._extend_sheet(first)
+        return indices
+
+    def add_colors(self, colors):
+        for color in colors:
+            self.add_color(color)
+
+    def _extend_sheet(self, first):
+        """
+        Grow the sheet with rows for the palette entries from first onwards
+        """
+        width = self.sheet.get_width()
+        sheet = pygame.Surface((width, self.cell * len(self.palette)))
+        sheet.fill(TRANSPARENT_KEY)
+        sheet.blit(self.sheet, (0, 0))
+
+        for index in range(first, len(self.palette)):
+            color = tuple(self.palette[index].tolist())
+            top = index * self.cell
+            for column, radius in enumerate(self.pixel_radii[1:].tolist()):
+                left = column * self.cell
+                pygame.draw.circle(sheet, color, (left + radius, top + radius), radius)
+                self.areas.append(pygame.Rect(left, top, 2 * radius, 2 * radius))
+
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert()
+        sheet.set_colorkey(TRANSPARENT_KEY)
+        self.sheet = sheet
+
+    def sprite_indices(self, palette_indices, radii):
+        """
+        Index in self.areas of the disc for each (palette index, radius) pair
+        """
+        return palette_indices * self.max_radius + (radii - 1)
+
+    def draw(self, surface, xs, ys, palette_indices, radii):
+        """
+        Draw discs centered on (xs, ys), like pygame.draw.circle would
+
+        Parameters:
+        - xs, ys: int arrays, centers of the discs (in pixels)
+        - palette_indices: int array, color of each disc
+        - radii: int array, between 1 and max_radius (before scaling)
+        """
+        pixel_radii = self.pixel_radii[radii]
+        lefts = (xs - pixel_radii).tolist()
+        tops = (ys - pixel_radii).tolist()
+        sprites = self.sprite_indices(palette_indices, radii).tolist()
+        # (sheet, position, area) triples, assembled by iterators rather than Python code
+        surface.blits(zip(repeat(self.sheet), zip(lefts, tops), map(self.areas.__getitem__, sprites)),
+                      doreturn=False)
+
+
+class ImageAtlas:
+    """
+    Images pre-scaled to the sizes they are drawn at, keyed on (name, size)
+    """
+
+    def __init__(self):
+        self.sources = {}  # name -> full size Surface
+        self.builders = {}  # name -> function(size) drawing the sprite, for names without an image
+        self.images = {}  # (name, size) -> Surface
+
+    def add_source(self, name, surface):
+        """
+        Register a full size image, scaled copies are made from it
+        """
+        self.sources[name] = surface
+        self._forget(name)
+
+    def add_builder(self, name, build):
+        """
+        Register a function returning the sprite of a given size, e.g. a
+        shape drawn when the image is missing
+        """
+        self.builders[name] = build
+        self._forget(name)
+
+    def _forget(self, name):
+        for key in [key for key in self.images if key[0] == name]:
+            del self.images[key]
+
+    def names(self):
+        return set(self.sources) | set(self.builders)
+
+    def prepare(self, sizes):
+        """
+        Make every sprite at every size now (at load time)
+        """
+        for name in self.names():
+            for size in sizes:
+                self.get(name, size)
+
+    def resize(self, sizes):
+        """
+        Switch to a new set of sizes (the window was resized): copies at
+        other sizes are dropped, the new ones are made right away
+        """
+        for key in [key for key in self.images if key[1] not in sizes]:
+            del self.images[key]
+        self.prepare(sizes)
+
+    def get(self, name, size):
+        """
+        Return the image scaled to size x size (made on first use)
+        """
+        key = (name, size)
+        image = self.images.get(key)
+        if image is None:
+            if name in self.sources:
+                image = pygame.transform.scale(self.sources[name], (size, size))
+            else:
+                image = self.builders[name](size)
+            self.images[key] = image
+        return image
@@ -0,0 +1,548 @@
+"""
+SQLite game history: every game and its moves, with indexed queries
+
+No pygame needed, only the standard library (sqlite3). The database is an
+optional backend replacing games.jsonl + stats.json (HISTORY_BACKEND in
+main.py), with the same interface as GameLog (load, append, reset, records,
+close), plus queries the JSON files cannot answer:
+
+    store = GameStore()
+    store.load()
+    store.results(since=date.today() - timedelta(days=29), mode="1P", difficulty="hard")
+    # {'X': 12, 'O': 30, 'Draw': 58}
+    store.win_rate("X", since="2025-12-01", difficulty="hard")
+    store.games(mode="1P", limit=10)       # newest first, with their moves
+
+Tables:
+- games: one row per game (time, mode, difficulty, board shape, result)
+- moves: (game_id, ply, cell), the cells of each game in order
+- resets: when the statistics screen was reset (games stay in the database)
+- daily_results / totals: counts kept up to date by triggers at each insert,
+  so counting games over a date range reads one row per day instead of
+  every game, and the counters of the statistics screen are one small query
+
+Given a StatsEngine (tictactoe.aggregates), the store feeds it every record
+and saves its state in the snapshots table every SNAPSHOT_INTERVAL records,
+with the last game and reset it covers: loading replays only what came after.
+
+The database runs in WAL mode: external tools can read it while the game
+writes. Games are inserted in batches, one transaction per batch (given a
+BackgroundWriter, on its thread).
+
+Usage:
+    python -m tictactoe.store import games.jsonl
+    python -m tictactoe.store results --days 30 --mode 1P --difficulty hard
+    python -m tictactoe.store games --limit 20
+"""
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from tictactoe.history import (apply_record, empty_stats, read_records, reset_record, GameLog, LOG_PATH,
+                               SEED_PATH, SNAPSHOT_INTERVAL, SNAPSHOT_PATH)
+
+DB_PATH = "games.db"
+RESULTS = ("X", "O", "Draw")
+IMPORT_BATCH = 10000  # Records per transaction when importing a game log
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT,
+    size INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    move_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_played_at ON games (played_at);
+CREATE INDEX IF NOT EXISTS games_mode ON games (mode, played_at);
+CREATE INDEX IF NOT EXISTS games_difficulty ON games (difficulty, played_at);
+
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ply INTEGER NOT NULL,
+    cell INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS resets (
+    id INTEGER PRIMARY KEY,
+    time TEXT NOT NULL,
+    after_game INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_results (
+    day TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    result TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (day, mode, difficulty, result)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS totals (
+    result TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    last_played TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT PRIMARY KEY,
+    last_game INTEGER NOT NULL,
+    last_reset INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS games_counts AFTER INSERT ON games
+BEGIN
+    INSERT INTO daily_results (day, mode, difficulty, result, games)
+    VALUES (substr(NEW.played_at, 1, 10), NEW.mode, COALESCE(NEW.difficulty, ''), NEW.result, 1)
+    ON CONFLICT (day, mode, difficulty, result) DO UPDATE SET games = games + 1;
+    INSERT INTO totals (result, games, last_played)
+    VALUES (NEW.result, 1, NEW.played_at)
+    ON CONFLICT (result) DO UPDATE SET games = games + 1, last_played = excluded.last_played;
+END;
+"""
+
+GAME_COLUMNS = "id, played_at, started_at, mode, difficulty, size, k, result"
+
+
+def _bound(value):
+    """
+    Time bound as stored in the database ("YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS")
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _end_bound(value):
+    """
+    Last time included, as (operator, bound): a date includes the whole day,
+    so it becomes "before the start of the next day"
+    """
+    value = _bound(value)
+    if value is None or len(value) != 10:
+        return "<=", value
+    return "<", (date.fromisoformat(value) + timedelta(days=1)).isoformat()
+
+
+def _filters(since, until, mode, difficulty, time_column):
+    """
+    WHERE clause and parameters shared by the queries (until: last time or day included)
+    """
+    clauses, parameters = [], []
+    if since is not None:
+        clauses.append(f"{time_column} >= ?")
+        parameters.append(_bound(since))
+    operator, until = _end_bound(until)
+    if until is not None:
+        clauses.append(f"{time_column} {operator} ?")
+        parameters.append(until)
+    if mode is not None:
+        clauses.append("mode = ?")
+        parameters.append(mode)
+    if difficulty is not None:
+        clauses.append("difficulty = ?")
+        parameters.append(difficulty)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", parameters
+
+
+class GameStore:
+    """
+    Game history in a SQLite database, same interface as GameLog plus queries
+    """
+
+    def __init__(self, path=DB_PATH, writer=None, import_path=LOG_PATH, engine=None,
+                 snapshot_interval=SNAPSHOT_INTERVAL, snapshot_path=SNAPSHOT_PATH, seed_path=SEED_PATH):
+        """
+        Parameters:
+        - path: database file
+        - writer: BackgroundWriter doing the inserts (None: insert right away)
+        - import_path: game log imported when the database is created (None: nothing)
+        - snapshot_path, seed_path: stats.json and shipped counters of that game
+          log, the counters of the new database start from them
+        - engine: StatsEngine kept up to date with the games (None: counters only)
+        - snapshot_interval: records appended between two saves of the engine state
+        """
+        self.path = path
+        self.writer = writer
+        self.import_path = import_path
+        self.engine = engine
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_path = snapshot_path
+        self.seed_path = seed_path
+        self.stats = empty_stats()
+        self.last_game = 0  # Ids of the last game and reset appended
+        self.written = 0  # Id of the last game committed to the database (updated by the writer thread)
+        self.last_reset = 0
+        self.since_snapshot = 0  # Records appended after the last engine snapshot
+
+        # One connection per thread: the game queries on its own, the writer
+        # thread inserts on another (close() closes them all)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return self.path
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None,  # Transactions are explicit
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")  # Safe in WAL mode, one fsync per checkpoint
+            connection.execute("PRAGMA busy_timeout = 5000")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def load(self):
+        """
+        Read the counters of the statistics screen (imports the game log first
+        if the database is new, with the counters the JSON files had)
+
+        Returns:
+        - dict: the counters (self.stats, updated by append and reset)
+        """
+        connection = self._connection()
+        new = connection.execute("SELECT NOT EXISTS (SELECT 1 FROM games) "
+                                 "AND NOT EXISTS (SELECT 1 FROM resets)").fetchone()[0]
+        if new and self.import_path:
+            # stats.json (or the seed) also counts games older than the log
+            log = GameLog(self.import_path, self.snapshot_path, snapshot_interval=float("inf"),
+                          seed_path=self.seed_path)
+            log_stats = log.load()
+            imported = self.import_log(self.import_path)
+            if imported:
+                print(f"📥 Imported {imported} records from {self.import_path}")
+            self._set_totals(connection, log_stats)
+        self.stats = self.counters()
+        self.last_game, self.last_reset = connection.execute(
+            "SELECT (SELECT COALESCE(MAX(id), 0) FROM games), (SELECT COALESCE(MAX(id), 0) FROM resets)").fetchone()
+        self.written = self.last_game
+        if self.engine is not None:
+            self._load_engine(connection)
+        return self.stats
+
+    def _load_engine(self, connection):
+        """
+        Saved engine state plus the records after it, or a rebuild from every record
+        """
+        row = connection.execute("SELECT last_game, last_reset, state FROM snapshots "
+                                 "WHERE name = 'aggregates'").fetchone()
+        if row is not None and self.engine.load_state(json.loads(row[2])):
+            for record in self.records(after_game=row[0], after_reset=row[1]):
+                self.engine.apply(record)
+        else:
+            self.engine.rebuild(self.records())
+            self.snapshot()
+
+    @staticmethod
+    def _set_totals(connection, stats):
+        """
+        Replace the counters kept in the totals table
+        """
+        rows = [(result, stats[key], stats['last_played'])
+                for result, key in (("X", 'belgium_wins'), ("O", 'france_wins'), ("Draw", 'draws'))
+                if stats[key]]
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("DELETE FROM totals")
+        connection.executemany("INSERT INTO totals (result, games, last_played) VALUES (?, ?, ?)", rows)
+        connection.execute("COMMIT")
+
+    def counters(self):
+        """
+        Counters since the last reset, as in stats.json
+        """
+        stats = empty_stats()
+        rows = self._connection().execute("SELECT result, games, last_played FROM totals").fetchall()
+        for result, games, last_played in rows:
+            if result == "X":
+                stats['belgium_wins'] = games
+            elif result == "O":
+                stats['france_wins'] = games
+            elif result == "Draw":
+                stats['draws'] = games
+            stats['total_games'] += games
+            stats['last_played'] = max(stats['last_played'] or "", last_played or "") or None
+        return stats
+
+    def append(self, record):
+        """
+        Add a game or reset record and update the counters
+
+        The counters are updated first, so they stay right for this session
+        even if the insert fails.
+        """
+        apply_record(self.stats, record)
+        if self.engine is not None:
+            self.engine.apply(record)
+        if record.get("type") == "reset":
+            self.last_reset += 1
+        else:
+            self.last_game += 1
+        self._write(record)
+
+        self.since_snapshot += 1
+        if self.engine is not None and self.since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def _write(self, record):
+        if self.writer is not None:
+            self.writer.add(self, record)
+        else:
+            self.write_batch([record])
+
+    def reset(self):
+        """
+        Clear the counters (the games stay in the database)
+
+        Returns:
+        - dict: the counters
+        """
+        self.append(reset_record())
+        if self.engine is not None:
+            self.snapshot()
+        return self.stats
+
+    def snapshot(self):
+        """
+        Save the engine state, with the last game and reset it covers
+        """
+        self._write({"type": "snapshot", "last_game": self.last_game, "last_reset": self.last_reset,
+                     "state": json.dumps(self.engine.state(), separators=(",", ":"))})
+        self.since_snapshot = 0
+
+    def write_batch(self, records):
+        """
+        Insert log records (games, resets and engine snapshots) in one transaction
+
+        Raises OSError if the database cannot be written, nothing of the
+        batch is kept then (BackgroundWriter tries it again).
+        """
+        connection = self._connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")  # Takes the write lock now: ids below stay ours
+            try:
+                next_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM games").fetchone()[0]
+                games, moves = [], []
+                for record in records:
+                    if record.get("type") == "reset":
+                        next_id = self._insert(connection, games, moves, next_id)
+                        games, moves = [], []
+                        connection.execute("INSERT INTO resets (time, after_game) VALUES (?, ?)",
+                                           (record["time"], next_id - 1))
+                        connection.execute("DELETE FROM totals")
+                        continue
+                    if record.get("type") == "snapshot":
+                        connection.execute("INSERT OR REPLACE INTO snapshots (name, last_game, last_reset, state) "
+                                           "VALUES ('aggregates', ?, ?, ?)",
+                                           (record["last_game"], record["last_reset"], record["state"]))
+                        continue
+                    game_id = next_id + len(games)
+                    games.append((game_id, record["time"], record.get("started", record["time"]),
+                                  record["mode"], record.get("difficulty"), record.get("size", 3),
+                                  record.get("k", 3), record["result"], len(record.get("moves", ()))))
+                    moves.extend((game_id, ply, cell) for ply, cell in enumerate(record.get("moves", ())))
+                next_id = self._insert(connection, games, moves, next_id)
+                connection.execute("COMMIT")
+                self.written = next_id - 1
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            raise OSError(f"cannot write {self.path}: {e}") from e
+
+    @staticmethod
+    def _insert(connection, games, moves, next_id):
+        """
+        Insert gathered games and moves, returns the next free game id
+        """
+        connection.executemany("INSERT INTO games (id, played_at, started_at, mode, difficulty, size, k, "
+                               "result, move_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", games)
+        connection.executemany("INSERT INTO moves (game_id, ply, cell) VALUES (?, ?, ?)", moves)
+        return next_id + len(games)
+
+    def import_log(self, path=LOG_PATH):
+        """
+        Insert every record of a JSONL game log
+
+        Returns:
+        - int: records imported
+        """
+        records = read_records(path)[0]
+        for start in range(0, len(records), IMPORT_BATCH):
+            self.write_batch(records[start:start + IMPORT_BATCH])
+        return len(records)
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def results(self, since=None, until=None, mode=None, difficulty=None, flush=False):
+        """
+        Number of games of each result, from the daily counts
+
+        Parameters:
+        - since, until: first and last day included (date or "YYYY-MM-DD", None: no bound)
+        - mode: "1P" or "2P" (None: both)
+        - difficulty: AI difficulty (None: any, "" for 2 players games only)
+        - flush: wait for the background writer first, so games just appended
+          are counted (blocks on the disk: not from the render loop, which
+          only sees the committed games)
+
+        Returns:
+        - dict: {"X": games, "O": games, "Draw": games}
+        """
+        if flush:
+            self.flush()
+        since = _bound(since)[:10] if since is not None else None
+        until = _bound(until)[:10] if until is not None else None
+        where, parameters = _filters(since, until, mode, difficulty, "day")
+        counts = dict.fromkeys(RESULTS, 0)
+        query = f"SELECT result, SUM(games) FROM daily_results{where} GROUP BY result"
+        for result, games in self._connection().execute(query, parameters):
+            counts[result] = games
+        return counts
+
+    def win_rate(self, player="X", since=None, until=None, mode=None, difficulty=None, flush=False):
+        """
+        Share of games won by player ("X" is the human in 1 player mode)
+
+        Returns:
+        - float between 0 and 1, or None if no game matches
+        """
+        counts = self.results(since, until, mode, difficulty, flush)
+        total = sum(counts.values())
+        return counts[player] / total if total else None
+
+    def games(self, since=None, until=None, mode=None, difficulty=None, limit=100, flush=False):
+        """
+        Games matching the filters, newest first, as log records (with an "id")
+
+        since and until can be dates (whole days) or "YYYY-MM-DD HH:MM:SS" times.
+        flush: as in results().
+        """
+        if flush:
+            self.flush()
+        where, parameters = _filters(since, until, mode, difficulty, "played_at")
+        connection = self._connection()
+        rows = connection.execute(f"SELECT {GAME_COLUMNS} FROM games{where} "
+                                  f"ORDER BY played_at DESC, id DESC LIMIT ?", parameters + [limit]).fetchall()
+        return [self._record(row, self.moves(row[0])) for row in rows]
+
+    def moves(self, game_id):
+        """
+        Cells of a game in the order they were played
+        """
+        rows = self._connection().execute("SELECT cell FROM moves WHERE game_id = ? ORDER BY ply", (game_id,))
+        return [cell for (cell,) in rows]
+
+    @staticmethod
+    def _record(row, moves):
+        game_id, played_at, started_at, mode, difficulty, size, k, result = row
+        return {"type": "game", "id": game_id, "time": played_at, "started": started_at, "mode": mode,
+                "difficulty": difficulty, "size": size, "k": k, "moves": moves, "result": result}
+
+    def records(self, after_game=0, after_reset=0):
+        """
+        Every game and reset, oldest first, as log records (pending inserts are flushed first)
+
+        Parameters:
+        - after_game, after_reset: only the games and resets with a greater id
+        """
+        self.flush()
+        connection = self._connection()
+        resets = connection.execute("SELECT time, after_game FROM resets WHERE id > ? ORDER BY id",
+                                    (after_reset,)).fetchall()
+        move_rows = connection.execute("SELECT game_id, cell FROM moves WHERE game_id > ? ORDER BY game_id, ply",
+                                       (after_game,))
+        pending_move = next(move_rows, None)
+
+        records = []
+        reset_index = 0
+        for row in connection.execute(f"SELECT {GAME_COLUMNS} FROM games WHERE id > ? ORDER BY id", (after_game,)):
+            while reset_index < len(resets) and resets[reset_index][1] < row[0]:
+                records.append({"type": "reset", "time": resets[reset_index][0]})
+                reset_index += 1
+            # Moves are read in game order next to the games, not one query per game
+            moves = []
+            while pending_move is not None and pending_move[0] <= row[0]:
+                if pending_move[0] == row[0]:
+                    moves.append(pending_move[1])
+                pending_move = next(move_rows, None)
+            records.append(self._record(row, moves))
+        records.extend({"type": "reset", "time": reset_time} for reset_time, _ in resets[reset_index:])
+        return records
+
+    def close(self):
+        """
+        Write everything still pending and close the database (call at exit)
+        """
+        if self.writer is not None:
+            self.writer.close()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query the SQLite game history")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="insert the games of a JSONL game log")
+    import_parser.add_argument("log", nargs="?", default=LOG_PATH, help=f"game log (default: {LOG_PATH})")
+
+    for name, text in (("results", "count wins, losses and draws"), ("games", "list games, newest first")):
+        command = commands.add_parser(name, help=text)
+        command.add_argument("--days", type=int, default=None, help="only the last N days, today included")
+        command.add_argument("--mode", choices=("1P", "2P"), default=None)
+        command.add_argument("--difficulty", choices=("easy", "medium", "hard"), default=None)
+        if name == "games":
+            command.add_argument("--limit", type=int, default=20, help="games shown (default: 20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = GameStore(args.db, import_path=None)
+    start = time.perf_counter()
+
+    if args.command == "import":
+        count = store.import_log(args.log)
+        print(f"Imported {count} records from {args.log}")
+    else:
+        since = date.today() - timedelta(days=args.days - 1) if args.days else None
+        if args.command == "results":
+            counts = store.results(since, mode=args.mode, difficulty=args.difficulty)
+            total = sum(counts.values())
+            print(f"{total} games: X {counts['X']}, O {counts['O']}, draws {counts['Draw']}")
+            if total:
+                print(f"X win rate: {counts['X'] / total:.1%}")
+        else:
+            for game in store.games(since, mode=args.mode, difficulty=args.difficulty, limit=args.limit):
+                print(f"#{game['id']} {game['time']} {game['mode']} {game['difficulty'] or '-':6} "
+                      f"{game['result']:4} {game['moves']}")
+
+    print(f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Symmetry canonicalization of 3x3 positions (8 symmetries of the square)
+
+Every board has up to 8 equivalent versions (4 rotations, each optionally
+mirrored). The canonical representative is the version with the smallest
+key, so all equivalent boards share one cache entry.
+
+All transforms are precomputed as 512-entry mask tables, so canonicalizing
+a position costs 16 tuple lookups.
+"""
+from tictactoe.board import Board, CELL_COUNT, FULL_MASK
+
+
+def _rotate(cell):
+    """
+    Where cell goes after a 90 degree clockwise rotation
+    """
+    row, col = divmod(cell, 3)
+    return col * 3 + (2 - row)
+
+
+def _mirror(cell):
+    """
+    Where cell goes after a left-right mirror
+    """
+    row, col = divmod(cell, 3)
+    return row * 3 + (2 - col)
+
+
+def _build_permutations():
+    permutations = []
+    current = list(range(CELL_COUNT))
+    for _ in range(4):
+        permutations.append(tuple(current))
+        permutations.append(tuple(_mirror(cell) for cell in current))
+        current = [_rotate(cell) for cell in current]
+    return tuple(permutations)
+
+
+# CELL_MAP[s][cell] = where cell goes under symmetry s (s = 0 is the identity)
+CELL_MAP = _build_permutations()
+SYMMETRY_COUNT = len(CELL_MAP)
+
+# INVERSE_CELL_MAP[s][cell] = which cell lands on cell under symmetry s
+INVERSE_CELL_MAP = tuple(
+    tuple(permutation.index(cell) for cell in range(CELL_COUNT))
+    for permutation in CELL_MAP
+)
+
+# MASK_MAP[s][mask] = mask after applying symmetry s to every set bit
+MASK_MAP = tuple(
+    tuple(
+        sum(1 << permutation[cell] for cell in range(CELL_COUNT) if mask >> cell & 1)
+        for mask in range(FULL_MASK + 1)
+    )
+    for permutation in CELL_MAP
+)
+
+
+def canonical(first, second):
+    """
+    Canonicalize a pair of masks
+
+    Parameters:
+    - first, second: bit masks (X/O, or side to move/opponent)
+
+    Returns:
+    - tuple (key, symmetry): key = first | second << 9 for the canonical
+      version, and the symmetry that maps the original onto it
+    """
+    best_key = first | second << 9
+    best_symmetry = 0
+    for symmetry in range(1, SYMMETRY_COUNT):
+        table = MASK_MAP[symmetry]
+        key = table[first] | table[second] << 9
+        if key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+def canonical_key(first, second):
+    """
+    Return only the canonical key of a pair of masks
+    """
+    best_key = first | second << 9
+    for table in MASK_MAP:
+        key = table[first] | table[second] << 9
+        if key < best_key:
+            best_key = key
+    return best_key
+
+
+def canonicalize(board):
+    """
+    Return (canonical_board, symmetry) for a Board
+    """
+    key, symmetry = canonical(board.x, board.o)
+    return Board(key & FULL_MASK, key >> 9), symmetry
+
+
+def to_canonical_cell(cell, symmetry):
+    """
+    Map a cell of the original board onto the canonical board
+    """
+    return CELL_MAP[symmetry][cell]
+
+
+def from_canonical_cell(cell, symmetry):
+    """
+    Map a cell of the canonical board back onto the original board
+    """
+    return INVERSE_CELL_MAP[symmetry][cell]
@@ -0,0 +1,88 @@
+"""
+Shared fonts and a cache of rendered text surfaces
+
+Rendering text is one of the most expensive things the screens do every
+frame, and it is almost always the same strings: button labels, titles,
+percentages. TextCache keeps one pygame Font per (name, size) and the last
+rendered surfaces in an LRU cache keyed on (font name, size, text, color,
+antialias):
+
+    text_cache = TextCache()
+    label = text_cache.render("Settings", 60, (0, 0, 0))
+
+The returned surfaces are shared between callers and must not be drawn on.
+"""
+from collections import OrderedDict
+
+import pygame
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class TextCache:
+    """
+    Font instances and rendered text surfaces, with hit/miss counters
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.fonts = {}  # (name, size) -> pygame.font.Font
+        self.surfaces = OrderedDict()  # key -> Surface, least recently used first
+
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None):
+        """
+        Return the shared Font for a file name (None for the default font) and size
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, name=None):
+        """
+        Return the rendered text, from the cache when possible
+
+        Parameters:
+        - text: str to render
+        - size: int, font size
+        - color: RGB tuple of the text
+        - antialias: bool, smooth edges
+        - name: font file, None for pygame's default font
+
+        Returns:
+        - pygame.Surface (shared, do not modify it)
+        """
+        key = (name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # Evict the least recently used
+        return surface
+
+    @property
+    def hit_rate(self):
+        """
+        Share of render() calls answered from the cache (0.0 to 1.0)
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """
+        Drop the rendered surfaces (fonts are kept) and reset the counters
+        """
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,200 @@
+"""
+Multi-process tournament between AI difficulty levels
+
+Every pairing (X difficulty, O difficulty) is split into shards of games.
+Shards run on all cores with multiprocessing, and each shard seeds its own
+random generator from (seed, pairing, shard number), so a tournament gives
+the same results whatever the number of processes.
+
+Usage:
+    python -m tictactoe.tournament -n 1000000
+    python -m tictactoe.tournament -n 100000 --processes 4 --seed 7 --output results.json
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from tictactoe import ai
+from tictactoe.simulate import play_game
+
+DEFAULT_SHARD_SIZE = 5000
+
+
+def _init_worker():
+    """
+    Per-process setup: no AI commentary, solution table loaded once
+    """
+    ai.VERBOSE = False
+    ai.load_solutions()
+
+
+def play_shard(task):
+    """
+    Play one shard of games
+
+    Parameters:
+    - task: tuple (x_difficulty, o_difficulty, games, size, k, mcts_iterations, seed)
+
+    Returns:
+    - tuple (x_difficulty, o_difficulty, counts) with counts mapping
+      "X", "O" and "Draw" to a number of games
+    """
+    x_difficulty, o_difficulty, games, size, k, mcts_iterations, seed = task
+    # The AI functions use the module-level random generator
+    random.seed(seed)
+    ai.configure_mcts(iterations=mcts_iterations, time_limit=None, seed=seed)
+
+    counts = {"X": 0, "O": 0, "Draw": 0}
+    for _ in range(games):
+        result, _ = play_game(x_difficulty, o_difficulty, size, k)
+        counts[result] += 1
+    return x_difficulty, o_difficulty, counts
+
+
+def make_tasks(games, levels=ai.DIFFICULTIES, size=3, k=3, mcts_iterations=200,
+               seed=0, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Split the tournament into shards, one list entry per shard
+    """
+    tasks = []
+    for x_difficulty in levels:
+        for o_difficulty in levels:
+            remaining = games
+            shard = 0
+            while remaining > 0:
+                count = min(shard_size, remaining)
+                shard_seed = f"{seed}:{x_difficulty}:{o_difficulty}:{shard}"
+                tasks.append((x_difficulty, o_difficulty, count, size, k,
+                              mcts_iterations, shard_seed))
+                remaining -= count
+                shard += 1
+    return tasks
+
+
+def run_tournament(games, levels=ai.DIFFICULTIES, size=3, k=3, mcts_iterations=200,
+                   seed=0, processes=None, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Play games for every pairing of levels, sharded over a process pool
+
+    Returns:
+    - dict: {(x_difficulty, o_difficulty): {"X": n, "O": n, "Draw": n}}
+    """
+    matrix = {(x, o): {"X": 0, "O": 0, "Draw": 0} for x in levels for o in levels}
+    tasks = make_tasks(games, levels, size, k, mcts_iterations, seed, shard_size)
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        for x_difficulty, o_difficulty, counts in pool.imap_unordered(play_shard, tasks):
+            cell = matrix[(x_difficulty, o_difficulty)]
+            for key, value in counts.items():
+                cell[key] += value
+    return matrix
+
+
+def side_summary(matrix):
+    """
+    Aggregate the matrix per difficulty and per side
+
+    Returns:
+    - dict: {difficulty: {"X": {"win": n, "draw": n, "loss": n},
+                          "O": {"win": n, "draw": n, "loss": n}}}
+    """
+    summary = {}
+    for (x_difficulty, o_difficulty), counts in matrix.items():
+        for difficulty, side, opponent in ((x_difficulty, "X", "O"), (o_difficulty, "O", "X")):
+            record = summary.setdefault(difficulty, {}).setdefault(
+                side, {"win": 0, "draw": 0, "loss": 0})
+            record["win"] += counts[side]
+            record["draw"] += counts["Draw"]
+            record["loss"] += counts[opponent]
+    return summary
+
+
+def format_matrix(matrix, levels):
+    """
+    Render the win/draw/loss matrix as text (rows: X, columns: O)
+
+    Each cell reads "X wins / draws / O wins" in percent.
+    """
+    width = 20
+    lines = ["X \\ O".ljust(8) + "".join(level.center(width) for level in levels)]
+    for x_difficulty in levels:
+        row = x_difficulty.ljust(8)
+        for o_difficulty in levels:
+            counts = matrix[(x_difficulty, o_difficulty)]
+            games = sum(counts.values()) or 1
+            cell = "/".join(f"{100.0 * counts[key] / games:.1f}" for key in ("X", "Draw", "O"))
+            row += cell.center(width)
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def format_summary(summary):
+    lines = []
+    for difficulty, sides in summary.items():
+        for side in ("X", "O"):
+            record = sides.get(side)
+            if not record:
+                continue
+            games = sum(record.values()) or 1
+            lines.append(f"{difficulty:<6} as {side}: "
+                         f"win {100.0 * record['win'] / games:5.1f}%  "
+                         f"draw {100.0 * record['draw'] / games:5.1f}%  "
+                         f"loss {100.0 * record['loss'] / games:5.1f}%")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play a sharded AI tournament on all cores")
+    parser.add_argument("-n", "--games", type=int, default=100000,
+                        help="games per pairing (default: 100000)")
+    parser.add_argument("--levels", nargs="+", default=list(ai.DIFFICULTIES),
+                        choices=ai.DIFFICULTIES, help="difficulties taking part (default: all)")
+    parser.add_argument("--size", type=int, default=3, help="board size (default: 3)")
+    parser.add_argument("--k", type=int, default=None,
+                        help="symbols in a row needed to win (default: board size)")
+    parser.add_argument("--mcts-iterations", type=int, default=200,
+                        help="MCTS iterations per move on boards bigger than 3x3 (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (default: 0)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f"games per shard (default: {DEFAULT_SHARD_SIZE})")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    k = args.k or args.size
+    levels = tuple(args.levels)
+
+    start = time.perf_counter()
+    matrix = run_tournament(args.games, levels, args.size, k, args.mcts_iterations,
+                            args.seed, args.processes, args.shard_size)
+    elapsed = time.perf_counter() - start
+    total = args.games * len(matrix)
+
+    print(f"Board {args.size}x{args.size}, {k} in a row, seed {args.seed}")
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:,.0f} games/s)\n")
+    print("X wins / draws / O wins (%)")
+    print(format_matrix(matrix, levels))
+    print()
+    summary = side_summary(matrix)
+    print(format_summary(summary))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "games_per_pairing": args.games,
+                "size": args.size,
+                "k": k,
+                "seed": args.seed,
+                "matrix": {f"{x}-{o}": counts for (x, o), counts in matrix.items()},
+                "summary": summary,
+            }, f, indent=4)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
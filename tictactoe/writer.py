@@ -0,0 +1,283 @@
+"""
+Background file writer, so the game loop never waits on the disk
+
+No pygame needed. Writes are handed to a thread through a bounded queue and
+grouped into batches:
+
+- appends to the same file are joined into one write and one fsync
+- items for the same sink (e.g. a database) are passed to its
+  write_batch(items) method in one call, i.e. one transaction
+- whole-file replacements of the same file are coalesced, only the newest
+  content is written (with an atomic rename)
+
+A batch is written when it holds batch_size jobs, when flush_interval
+seconds have passed since its first job, or when flush() / close() is
+called. Appends and sinks are written before replacements, so a stats
+snapshot never refers to log records that are not on disk yet.
+
+    writer = BackgroundWriter()
+    writer.append("games.jsonl", b'{"type": "game", ...}\n')
+    writer.replace("stats.json", b'{...}')
+    writer.close()                  # at exit: writes what is left
+
+The queue holds up to max_pending jobs. The caller only waits if that many
+writes are stuck behind the disk, which never happens at the pace games end.
+
+A batch that fails with OSError (disk full, file locked...) is kept and
+tried again after flush_interval; any other error is a bad job, which is
+dropped so it cannot block the jobs after it. Either way flush() returns
+False until the batch is on disk, and if the thread ever stops, flush() and
+new jobs fail instead of waiting forever.
+"""
+import queue
+import threading
+import time
+from collections import deque
+
+from tictactoe.history import append_file, write_atomic
+
+FLUSH_INTERVAL = 2.0  # Seconds a job can wait before its batch is written
+BATCH_SIZE = 16  # Jobs that trigger a write right away
+MAX_PENDING = 1024  # Size of the queue
+LATENCY_SAMPLES = 1000  # Latencies kept for the metrics
+
+_FLUSH = "flush"
+_CLOSE = "close"
+_POLL = 0.5  # Seconds between two checks that the thread is still running, while waiting on it
+
+
+class _FlushRequest:
+    """
+    Waiter of flush(): set once the batch is written (ok) or has failed
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.ok = False
+
+
+class BackgroundWriter:
+    """
+    Thread writing appends and file replacements in batches, with latency metrics
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE, max_pending=MAX_PENDING):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.jobs = queue.Queue(max_pending)
+
+        # Batch being gathered by the thread
+        self._appends = {}  # path -> list of bytes
+        self._sinks = {}  # sink -> list of items for sink.write_batch
+        self._replacements = {}  # path -> bytes (newest only)
+        self._submitted = []  # perf_counter() of each job in the batch
+        self._batch_started = 0.0  # The batch is written flush_interval seconds after this
+        self._done = []  # _FlushRequest to answer once the batch is written or has failed
+
+        # Metrics
+        self.writes = 0  # Jobs written
+        self.coalesced = 0  # Replacements dropped because a newer one came
+        self.batches = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.last_error = None  # Last exception, for the flush() callers that got False
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # Seconds from submit to on disk
+        self.batch_times = deque(maxlen=LATENCY_SAMPLES)  # Seconds spent writing each batch
+
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+        self.thread.start()
+
+    def append(self, path, data):
+        """
+        Add bytes at the end of a file (fsynced once per batch)
+        """
+        self._submit(("append", path, data, time.perf_counter()))
+
+    def add(self, sink, item):
+        """
+        Queue an item for sink.write_batch(items), called on the writer thread
+        with every item of the batch
+        """
+        self._submit(("add", sink, item, time.perf_counter()))
+
+    def replace(self, path, data):
+        """
+        Replace a file's content, atomically (only the newest content of a batch is written)
+        """
+        self._submit(("replace", path, data, time.perf_counter()))
+
+    def _submit(self, job):
+        if self.closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        self._put(job)
+
+    def _put(self, job):
+        """
+        Queue a job, waiting while the queue is full, unless the thread has stopped
+        """
+        while True:
+            if not self.thread.is_alive():
+                raise RuntimeError("BackgroundWriter thread has stopped")
+            try:
+                self.jobs.put(job, timeout=_POLL)
+                return
+            except queue.Full:
+                pass
+
+    def flush(self, timeout=None):
+        """
+        Write everything submitted so far, and wait until it is on disk
+
+        Returns:
+        - bool: False if the timeout expired first, if the batch could not be
+          written (see last_error) or if the thread has stopped
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        request = _FlushRequest()
+        try:
+            self._put((_FLUSH, request))
+        except RuntimeError:
+            return False
+        while not request.event.is_set():
+            wait = _POLL if deadline is None else min(_POLL, deadline - time.perf_counter())
+            if wait <= 0 or not self.thread.is_alive():
+                return False
+            request.event.wait(wait)
+        return request.ok
+
+    def close(self, timeout=None):
+        """
+        Write what is left and stop the thread (call once, at exit)
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.jobs.put((_CLOSE,))
+        self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Nobody waits forever on a thread that is gone
+            for request in self._done:
+                request.event.set()
+            self._done = []
+
+    def _loop(self):
+        while True:
+            timeout = None
+            if self._submitted:
+                timeout = max(0.0, self._batch_started + self.flush_interval - time.perf_counter())
+            try:
+                job = self.jobs.get(timeout=timeout)
+            except queue.Empty:
+                self._write_batch()  # The oldest job has waited flush_interval
+                continue
+
+            kind = job[0]
+            if kind == _CLOSE:
+                self._write_batch()
+                return
+            if kind == _FLUSH:
+                self._done.append(job[1])
+                self._write_batch()
+                continue
+
+            _, path, data, submitted = job
+            if kind == "append":
+                self._appends.setdefault(path, []).append(data)
+            elif kind == "add":
+                self._sinks.setdefault(path, []).append(data)  # path is the sink
+            else:
+                if path in self._replacements:
+                    self.coalesced += 1
+                self._replacements[path] = data
+            if not self._submitted:
+                self._batch_started = submitted
+            self._submitted.append(submitted)
+            if len(self._submitted) >= self.batch_size:
+                self._write_batch()
+
+    def _write_batch(self):
+        """
+        Write the gathered jobs: appends and sinks first, then replacements
+        """
+        ok = True
+        if self._submitted:
+            start = time.perf_counter()
+            path = None
+            try:
+                for path, chunks in list(self._appends.items()):
+                    data = b"".join(chunks)
+                    append_file(path, data)
+                    del self._appends[path]  # Written: not retried if something after fails
+                    self.bytes_written += len(data)
+                for path, items in list(self._sinks.items()):
+                    path.write_batch(items)
+                    del self._sinks[path]
+                for path, data in list(self._replacements.items()):
+                    write_atomic(path, data)
+                    del self._replacements[path]
+                    self.bytes_written += len(data)
+            except OSError as e:
+                # Keep what is left of the batch, it is tried again after flush_interval
+                ok = False
+                self.errors += 1
+                self.last_error = e
+                self._batch_started = time.perf_counter()
+                print(f"⚠️ Error writing {path}: {e}")
+            except Exception as e:
+                # Not the disk: trying again would fail the same way, drop the jobs of that file / sink
+                ok = False
+                self.errors += 1
+                self.last_error = e
+                self._appends.pop(path, None)
+                self._sinks.pop(path, None)
+                self._replacements.pop(path, None)
+                self._batch_started = time.perf_counter()
+                print(f"⚠️ Dropped writes to {path} that cannot succeed: {e!r}")
+            if ok:
+                end = time.perf_counter()
+                self.latencies.extend(end - submitted for submitted in self._submitted)
+                self.batch_times.append(end - start)
+                self.writes += len(self._submitted)
+                self.batches += 1
+                self._submitted = []
+            elif not (self._appends or self._sinks or self._replacements):
+                self._submitted = []  # Everything left was dropped
+
+        for request in self._done:
+            request.ok = ok
+            request.event.set()
+        self._done = []
+
+    def metrics(self):
+        """
+        Write statistics, latencies in milliseconds
+
+        Returns:
+        - dict with writes, batches, coalesced, bytes, errors, pending, and
+          the mean / 95th percentile / max latency from submit to on disk,
+          and the mean / max time spent writing a batch
+        """
+        latencies = sorted(self.latencies)
+        batch_times = list(self.batch_times)
+
+        def ms(value):
+            return round(value * 1000, 2)
+
+        return {
+            "writes": self.writes,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "bytes": self.bytes_written,
+            "errors": self.errors,
+            "pending": self.jobs.qsize() + len(self._submitted),
+            "latency_mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "latency_p95_ms": ms(latencies[int(0.95 * (len(latencies) - 1))]) if latencies else 0.0,
+            "latency_max_ms": ms(latencies[-1]) if latencies else 0.0,
+            "batch_mean_ms": ms(sum(batch_times) / len(batch_times)) if batch_times else 0.0,
+            "batch_max_ms": ms(max(batch_times)) if batch_times else 0.0,
+        }